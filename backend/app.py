@@ -36,7 +36,7 @@ def create_app(config_name=None):
     # Initialize app directories
     config[config_name].init_app(app)
     
-    # Create database tables and ensure survey columns exist
+    # Create database tables and ensure added columns exist
     with app.app_context():
         db.create_all()
         
@@ -62,6 +62,16 @@ def create_app(config_name=None):
                     db.session.execute(text('ALTER TABLE users ADD COLUMN survey_completed BOOLEAN DEFAULT FALSE'))
                     db.session.commit()
                     print("✅ survey_completed column added")
+            
+            # Add outline column to saved_content if missing
+            if 'saved_content' in inspector.get_table_names():
+                columns = [col['name'] for col in inspector.get_columns('saved_content')]
+                
+                if 'outline' not in columns:
+                    print("⚠️  Adding outline column to saved_content table...")
+                    db.session.execute(text('ALTER TABLE saved_content ADD COLUMN outline JSON'))
+                    db.session.commit()
+                    print("✅ outline column added")
         except Exception as e:
             print(f"⚠️  Column migration error (may be normal on first run): {e}")
             db.session.rollback()
@@ -74,6 +84,7 @@ def create_app(config_name=None):
     from routes.user import user_bp
     from routes.survey import survey_bp
     from routes.database import db_bp
+    from routes.jobs import jobs_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(upload_bp, url_prefix='/api/upload')
@@ -82,6 +93,7 @@ def create_app(config_name=None):
     app.register_blueprint(user_bp, url_prefix='/api/user')
     app.register_blueprint(survey_bp, url_prefix='/api/survey')
     app.register_blueprint(db_bp, url_prefix='/api/db')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
     
     # Error handlers
     @app.errorhandler(404)
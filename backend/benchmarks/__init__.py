@@ -0,0 +1,4 @@
+"""
+Benchmarks for the processing pipeline
+Run from the backend directory, e.g. `python -m benchmarks.bench_pdf_parallel`
+"""
@@ -0,0 +1,52 @@
+"""
+Cost of running accessibility operations on a long text whole versus as
+chunks spread over the adaptations process pool
+
+"whole" runs the operation in this process; "chunked" splits the text on
+paragraph boundaries (OPERATION_CHUNK_SIZE) and maps it over
+ADAPTATION_WORKERS processes. The pool is warmed up before timing.
+
+Usage:
+    python -m benchmarks.bench_chunked_ops [--kb 1024] [--workers 4] [--runs 1]
+"""
+
+import argparse
+import random
+import time
+
+from config import Config
+from benchmarks.bench_text_analysis import make_document
+from services.chunked_ops import CHUNK_MERGES, chunked_operations, run_adaptation, split_text
+
+
+def best_of(runs, fn, *args):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kb', type=int, default=1024, help='document size')
+    parser.add_argument('--workers', type=int, default=Config.ADAPTATION_WORKERS)
+    parser.add_argument('--runs', type=int, default=1)
+    args = parser.parse_args()
+    
+    Config.ADAPTATION_WORKERS = args.workers
+    Config.OPERATION_CHUNKING_THRESHOLD = 0
+    text = make_document(args.kb, random.Random(11))
+    print(f"{args.kb} KB, {len(split_text(text))} chunks, {args.workers} workers")
+    
+    chunked_operations.run('key_points', text)
+    print(f"{'operation':>12}{'whole s':>10}{'chunked s':>11}")
+    for name in CHUNK_MERGES:
+        whole = best_of(args.runs, run_adaptation, name, text, {})
+        chunked = best_of(args.runs, chunked_operations.run, name, text)
+        print(f"{name:>12}{whole:>10.2f}{chunked:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
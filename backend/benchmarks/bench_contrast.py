@@ -0,0 +1,63 @@
+"""
+Cost of checking a palette's contrast one pair per call versus as one
+vectorized matrix, with and without nearest-passing-color suggestions
+
+"per pair" calls accessibility_service.adjust_color_contrast for every
+foreground/background pair, as clients of /check-contrast had to; "matrix"
+and "suggest" are color_contrast_service.check without and with suggestions.
+
+Usage:
+    python -m benchmarks.bench_contrast [--colors 20,50,100] [--runs 3]
+"""
+
+import argparse
+import random
+import time
+
+from services.accessibility_service import accessibility_service
+from services.color_contrast import color_contrast_service, _gamut_table
+
+
+def make_palette(size, rng):
+    return ['#%06X' % rng.randrange(0x1000000) for _ in range(size)]
+
+
+def per_pair(palette):
+    for foreground in palette:
+        for background in palette:
+            accessibility_service.adjust_color_contrast(foreground, background)
+
+
+def best_of(runs, fn, *args, **kwargs):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--colors', default='20,50,100', help='palette sizes to time (pairs = size squared)')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    
+    # Built once per process on first use
+    started = time.perf_counter()
+    _gamut_table()
+    print(f"gamut table: {time.perf_counter() - started:.3f} s")
+    
+    rng = random.Random(5)
+    print(f"{'pairs':>7}{'failing':>9}{'per pair s':>12}{'matrix s':>10}{'suggest s':>11}")
+    for size in (int(value) for value in args.colors.split(',')):
+        palette = make_palette(size, rng)
+        failing = color_contrast_service.check(palette, suggest=False)['summary']['failing']
+        legacy = best_of(args.runs, per_pair, palette)
+        matrix = best_of(args.runs, color_contrast_service.check, palette, suggest=False)
+        suggest = best_of(args.runs, color_contrast_service.check, palette)
+        print(f"{size * size:>7}{failing:>9}{legacy:>12.3f}{matrix:>10.3f}{suggest:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
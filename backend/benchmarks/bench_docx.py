@@ -0,0 +1,88 @@
+"""
+Single-pass DOCX extraction vs the previous docx2txt + python-docx path
+on large, table-heavy documents
+
+Usage:
+    python -m benchmarks.bench_docx [--tables 200] [--rows 40]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from services.docx_extractor import extract_docx
+from benchmarks.synthetic_docs import make_docx
+
+
+def legacy_extract_docx(file_path):
+    """The two-parse implementation extract_text_from_docx used to have"""
+    import docx2txt
+    from docx import Document
+    
+    text = docx2txt.process(file_path)
+    doc = Document(file_path)
+    
+    images = []
+    for rel in doc.part.rels.values():
+        if "image" in rel.target_ref:
+            images.append({'type': 'embedded', 'target': rel.target_ref})
+    
+    tables = []
+    for table in doc.tables:
+        table_data = []
+        for row in table.rows:
+            table_data.append([cell.text for cell in row.cells])
+        tables.append(table_data)
+    
+    return {
+        'text': text.strip(),
+        'paragraph_count': len(doc.paragraphs),
+        'tables': tables,
+        'images': images
+    }
+
+
+def _time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_docx(os.path.join(tmp, 'tables.docx'), tables=args.tables, rows=args.rows)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        
+        new_time, new = _time(lambda: extract_docx(path), args.repeat)
+        try:
+            legacy_time, legacy = _time(lambda: legacy_extract_docx(path), args.repeat)
+        except ImportError:
+            legacy_time, legacy = None, None
+    
+    print(f"document:    {args.tables} tables x {args.rows} rows ({size_mb:.1f} MB zipped)")
+    print(f"single-pass: {new_time:.2f}s")
+    
+    if legacy is None:
+        print("legacy:      skipped (docx2txt / python-docx not installed)")
+        return
+    
+    for field in ('text', 'paragraph_count', 'tables'):
+        assert new[field] == legacy[field], f'{field} differs from legacy output'
+    
+    print(f"legacy:      {legacy_time:.2f}s")
+    print(f"speedup:     {legacy_time / new_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Key point extraction time on book-length text
+
+Times sentence analysis and TF-IDF scoring separately for growing
+documents, with in-document and library IDF.
+
+Usage:
+    python -m benchmarks.bench_key_points [--kb 256,1024,4096] [--points 10]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.bench_text_analysis import make_document
+from services.key_points import key_point_extractor, LibraryIDF, tokenize_terms
+from services.text_analysis import text_analyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kb', default='256,1024,4096', help='document sizes to time')
+    parser.add_argument('--points', type=int, default=10)
+    args = parser.parse_args()
+    
+    rng = random.Random(5)
+    print(f"{'KB':>6}{'sentences':>11}{'analyze s':>11}{'score s':>9}{'library s':>11}")
+    for kilobytes in (int(value) for value in args.kb.split(',')):
+        text = make_document(kilobytes, rng)
+        
+        started = time.perf_counter()
+        analysis = text_analyzer.analyze(text)
+        analyze = time.perf_counter() - started
+        sentences = analysis.sentences
+        
+        started = time.perf_counter()
+        key_point_extractor.extract(sentences, args.points, word_counts=analysis.sentence_word_counts)
+        score = time.perf_counter() - started
+        
+        # A library in which every term of this text appears in half the documents
+        library = LibraryIDF(100, {term: 50 for term in set(tokenize_terms(text))})
+        started = time.perf_counter()
+        key_point_extractor.extract(sentences, args.points, word_counts=analysis.sentence_word_counts, idf=library)
+        library_score = time.perf_counter() - started
+        
+        print(f"{kilobytes:>6}{len(sentences):>11}{analyze:>11.3f}{score:>9.3f}{library_score:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Equation processing time for math-heavy lecture notes
+
+Compares the single-pass scanner with the render cache against the previous
+approach: four independent regex scans (so $$...$$ also matched as $...$)
+and a parse_latex call for every match. The new path also produces MathML
+and spoken text, rendering distinct equations on the math process pool
+(MATH_RENDER_WORKERS); the pool is started before timing.
+
+Usage:
+    python -m benchmarks.bench_math [--equations 100,500,2000] [--distinct 40]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from sympy.parsing.latex import parse_latex
+
+from services.accessibility_service import accessibility_service
+from services.math_renderer import math_renderer
+
+SYMBOLS = [r'x', r'y_i', r'\alpha', r'\beta^2', r'n+1', r'x^2 + y^2', r'\frac{a}{b}',
+           r'\sqrt{x}', r'e^{i\pi}', r'\sum_{i=1}^{n} i', r'\int_0^1 x dx', r'a_n = a_{n-1} + d']
+
+
+def legacy_process(text):
+    """process_math_equations before the scanner: one pass per pattern, no cache"""
+    equations = []
+    for pattern in (r'\$\$(.+?)\$\$', r'\$(.+?)\$', r'\\\[(.+?)\\\]', r'\\\((.+?)\\\)'):
+        for match in re.finditer(pattern, text):
+            try:
+                equations.append(str(parse_latex(match.group(1))))
+            except Exception:
+                equations.append(match.group(1))
+    return equations
+
+
+def make_notes(equations, distinct, rng):
+    """Prose with inline and display equations drawn from a pool of distinct ones"""
+    pool = [f"{rng.choice(SYMBOLS)} + {n}" if n >= len(SYMBOLS) else SYMBOLS[n] for n in range(distinct)]
+    parts = []
+    for n in range(equations):
+        latex = rng.choice(pool)
+        if n % 5 == 0:
+            parts.append(f"We can write the relation as\n$${latex}$$\nwhich follows. ")
+        else:
+            parts.append(f"Here ${latex}$ denotes the quantity of interest. ")
+    return ''.join(parts)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--equations', default='100,500,2000')
+    parser.add_argument('--distinct', type=int, default=40, help='distinct equations in the notes')
+    args = parser.parse_args()
+    
+    rng = random.Random(3)
+    math_renderer.render('x')  # Start the math pool
+    print(f"{'equations':>10}{'legacy s':>10}{'legacy parses':>15}{'cold s':>8}{'warm s':>8}")
+    for count in (int(value) for value in args.equations.split(',')):
+        text = make_notes(count, args.distinct, rng)
+        legacy, legacy_time = timed(legacy_process, text)
+        
+        math_renderer.clear()
+        result, cold = timed(accessibility_service.process_math_equations, text)
+        _, warm = timed(accessibility_service.process_math_equations, text)
+        assert result['equation_count'] == count
+        
+        print(f"{count:>10}{legacy_time:>10.2f}{len(legacy):>15}{cold:>8.3f}{warm:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
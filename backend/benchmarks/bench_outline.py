@@ -0,0 +1,57 @@
+"""
+Cost of building a DocumentOutline, and of serving one section from a stored
+outline instead of rescanning the document
+
+Usage:
+    python -m benchmarks.bench_outline [--kb 64,256,1024] [--runs 5]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.bench_text_analysis import make_document
+from services.outline import DocumentOutline
+
+
+def rescan_section(text, index):
+    section = DocumentOutline.scan(text).section(index)
+    return text[section['start']:section['end']]
+
+
+def stored_section(text, stored, index):
+    section = DocumentOutline.from_dict(json.loads(stored), len(text)).section(index)
+    return text[section['start']:section['end']]
+
+
+def best_of(runs, fn, *args):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kb', default='64,256,1024', help='document sizes to time')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(11)
+    print(f"{'KB':>6}{'headings':>10}{'scan s':>9}{'rescan ms':>11}{'stored ms':>11}")
+    for kilobytes in (int(value) for value in args.kb.split(',')):
+        text = make_document(kilobytes, rng)
+        outline = DocumentOutline.scan(text)
+        stored = json.dumps(outline.to_dict())
+        index = len(outline.headings) // 2
+        scan = best_of(args.runs, DocumentOutline.scan, text)
+        rescan = best_of(args.runs, rescan_section, text, index)
+        served = best_of(args.runs, stored_section, text, stored, index)
+        print(f"{kilobytes:>6}{len(outline.headings):>10}{scan:>9.3f}{rescan * 1000:>11.1f}{served * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of the text adaptations in a full transformation with and without a
+shared AnalyzedDocument
+
+"per call" lets simplify_text, extract_key_points and describe_structure each
+analyze the text themselves, as every transformation used to; "shared" builds
+the analysis once and passes it to all three.
+
+Usage:
+    python -m benchmarks.bench_text_analysis [--kb 64,256,1024] [--runs 3]
+"""
+
+import argparse
+import random
+import time
+
+from services.accessibility_service import accessibility_service
+from services.text_analysis import text_analyzer
+
+
+def make_document(kilobytes, rng):
+    """Markdown-like lecture notes: headings, paragraphs of prose and bullet lists"""
+    words = ('the students analyze each chapter carefully and subsequently discuss what '
+             'they learned regarding the material with a partner before class').split()
+    parts = []
+    size = 0
+    section = 0
+    while size < kilobytes * 1024:
+        section += 1
+        block = [f"## Section {section}", ""]
+        for _ in range(3):
+            sentences = []
+            for _ in range(rng.randint(3, 6)):
+                sentence = [rng.choice(words) for _ in range(rng.randint(8, 30))]
+                sentence[0] = sentence[0].capitalize()
+                sentences.append(' '.join(sentence) + '.')
+            block += [' '.join(sentences), ""]
+        block += [f"- point {n}" for n in range(3)] + [""]
+        chunk = '\n'.join(block) + '\n'
+        parts.append(chunk)
+        size += len(chunk)
+    return ''.join(parts)
+
+
+def run(text, shared):
+    analysis = text_analyzer.analyze(text) if shared else None
+    accessibility_service.simplify_text(text, analysis=analysis)
+    accessibility_service.extract_key_points(text, analysis=analysis)
+    accessibility_service.describe_structure(text, analysis=analysis)
+
+
+def best_of(runs, fn, *args):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kb', default='64,256,1024', help='document sizes to time')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    
+    rng = random.Random(11)
+    print(f"{'KB':>6}{'analyze s':>11}{'per call s':>12}{'shared s':>10}")
+    for kilobytes in (int(value) for value in args.kb.split(',')):
+        text = make_document(kilobytes, rng)
+        analyze = best_of(args.runs, text_analyzer.analyze, text)
+        per_call = best_of(args.runs, run, text, False)
+        shared = best_of(args.runs, run, text, True)
+        print(f"{kilobytes:>6}{analyze:>11.3f}{per_call:>12.3f}{shared:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
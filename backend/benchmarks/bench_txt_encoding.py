@@ -0,0 +1,65 @@
+"""
+Encoding detection for TXT uploads: which encoding each sample is read as,
+and how long sniffing takes
+
+Fails if a sample decodes to different text than it was written as. The
+samples include the cases a statistical detector alone got wrong: short
+cp1252 French (read as cp775), German cp1252 (read as cp1250) and UTF-16
+without a BOM (read as UTF-8, since NULs are valid UTF-8).
+
+Usage:
+    python -m benchmarks.bench_txt_encoding [--runs 5]
+"""
+
+import argparse
+import time
+
+from config import Config
+from services.txt_extractor import sniff_encoding
+
+FRENCH = 'café naïve\nline two\n'
+GERMAN = 'Die Prüfung der Straßenbäume ergab, dass größere Bäume schöner über die Brücke ragen. '
+RUSSIAN = 'Привет, как дела? Это простой русский текст для проверки кодировки.\n'
+JAPANESE = 'これは日本語のテキストです。文字コードの判定を確認します。\n'
+ENGLISH = 'Plain text with nothing but ASCII in it.\n'
+
+# (name, text, encoding it is written in)
+SAMPLES = [
+    ('ascii', ENGLISH * 20, 'ascii'),
+    ('utf-8', (FRENCH + GERMAN) * 20, 'utf-8'),
+    ('utf-8 bom', FRENCH * 20, 'utf-8-sig'),
+    ('utf-16 bom', FRENCH * 20, 'utf-16'),
+    ('short cp1252 french', FRENCH * 10, 'cp1252'),
+    ('cp1252 german', GERMAN * 200, 'cp1252'),
+    ('utf-16-le no bom', (ENGLISH + FRENCH) * 20, 'utf-16-le'),
+    ('utf-16-be no bom', (ENGLISH + FRENCH) * 20, 'utf-16-be'),
+    ('cp1251 russian', RUSSIAN * 20, 'cp1251'),
+    ('shift_jis japanese', JAPANESE * 20, 'shift_jis'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    failures = []
+    print(f"{'sample':<22}{'bytes':>8}{'detected':>12}{'sniff ms':>10}")
+    for name, text, encoding in SAMPLES:
+        sample = text.encode(encoding)[:Config.TXT_SNIFF_BYTES]
+        
+        best = float('inf')
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            detected = sniff_encoding(sample)
+            best = min(best, time.perf_counter() - started)
+        
+        if sample.decode(detected, errors='replace') != text:
+            failures.append(name)
+        print(f"{name:<22}{len(sample):>8}{detected:>12}{best * 1000:>10.2f}")
+    
+    assert not failures, f"decoded wrongly: {', '.join(failures)}"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Sequential vs concurrent URL import and site crawl against a local HTTP server
+
+The server adds a fixed latency per request to stand in for a remote
+site and records how many requests it was serving at once, so the
+per-host politeness limit can be checked alongside the timings.
+
+Usage:
+    python -m benchmarks.bench_url_crawl [--pages 30] [--latency 0.1] [--workers 8] [--host-concurrency 4]
+"""
+
+import argparse
+import functools
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from config import Config
+
+# Measure fetching, not cache hits
+Config.URL_CACHE_ENABLED = False
+
+from services.url_processor import URLProcessor
+from services.url_crawler import URLCrawler
+from benchmarks.synthetic_docs import make_site
+
+
+class _SlowHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def do_GET(self):
+        cls = _SlowHandler
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(cls.latency)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _timed(fn):
+    _SlowHandler.peak = 0
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result, _SlowHandler.peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds added to every response')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--host-concurrency', type=int, default=4)
+    parser.add_argument('--host-delay', type=float, default=0.0)
+    args = parser.parse_args()
+    
+    Config.URL_FETCH_WORKERS = args.workers
+    Config.URL_HOST_CONCURRENCY = args.host_concurrency
+    Config.URL_HOST_DELAY = args.host_delay
+    _SlowHandler.latency = args.latency
+    crawler = URLCrawler()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        make_site(tmp, args.pages)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_SlowHandler, directory=tmp))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_address[1]}'
+        urls = [f'{base}/lesson{i}.html' for i in range(1, args.pages + 1)]
+        
+        try:
+            sequential_time, sequential, _ = _timed(
+                lambda: [URLProcessor.extract_from_url(url) for url in urls]
+            )
+            batch_time, batch, batch_peak = _timed(
+                lambda: list(crawler.iter_urls(urls + urls[:5]))  # Duplicates are fetched once
+            )
+            crawl_time, crawled, crawl_peak = _timed(
+                lambda: list(crawler.crawl(f'{base}/index.html', max_depth=2, max_pages=args.pages + 10))
+            )
+        finally:
+            server.shutdown()
+    
+    batch_texts = {event['index']: event['text'] for event in batch}
+    assert len(batch) == len(urls), 'duplicate URLs were fetched more than once'
+    assert [batch_texts[i] for i in range(len(urls))] == [r['text'] for r in sequential], 'batch output differs'
+    crawled_urls = {event['url'].split('#')[0] for event in crawled if event['success']}
+    assert crawled_urls == set(urls) | {f'{base}/index.html'}, 'crawl missed or added pages'
+    assert max(batch_peak, crawl_peak) <= args.host_concurrency, 'per-host limit exceeded'
+    
+    print(f"pages:            {args.pages} (+{args.latency * 1000:.0f}ms latency each)")
+    print(f"workers:          {args.workers}, {args.host_concurrency} per host")
+    print(f"sequential:       {sequential_time:.2f}s")
+    print(f"concurrent batch: {batch_time:.2f}s (peak {batch_peak} in flight)")
+    print(f"crawl depth 2:    {crawl_time:.2f}s for {len(crawled)} pages (peak {crawl_peak} in flight)")
+    print(f"speedup:          {sequential_time / batch_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
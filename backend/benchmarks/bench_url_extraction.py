@@ -0,0 +1,118 @@
+"""
+Legacy vs single-fetch URL extraction against a local HTTP server
+
+Usage:
+    python -m benchmarks.bench_url_extraction [--repeat 20] [--markdown]
+"""
+
+import argparse
+import functools
+import os
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import requests
+import html2text
+from bs4 import BeautifulSoup  # Installed with newspaper3k; only the legacy path uses it
+from newspaper import Article
+
+from services.url_processor import URLProcessor
+from benchmarks.synthetic_docs import make_html_page
+
+
+def legacy_extract_from_url(url):
+    """URLProcessor.extract_from_url before the single-fetch rewrite"""
+    article = Article(url)
+    article.download()
+    article.parse()
+    
+    response = requests.get(url, timeout=10)
+    soup = BeautifulSoup(response.content, 'html.parser')
+    
+    images = []
+    for img in soup.find_all('img'):
+        src = img.get('src', '')
+        alt = img.get('alt', '')
+        if src:
+            images.append({'src': src, 'alt': alt, 'has_alt': bool(alt)})
+    
+    links = []
+    for link in soup.find_all('a'):
+        href = link.get('href', '')
+        text = link.get_text(strip=True)
+        if href:
+            links.append({'href': href, 'text': text})
+    
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.ignore_images = False
+    markdown_content = h.handle(response.text)
+    
+    return {'text': article.text, 'images': images, 'links': links[:50], 'markdown': markdown_content}
+
+
+class _CountingHandler(SimpleHTTPRequestHandler):
+    requests_served = 0
+    
+    def do_GET(self):
+        _CountingHandler.requests_served += 1
+        super().do_GET()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _measure(fn, url, repeat):
+    _CountingHandler.requests_served = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(repeat):
+        result = fn(url)
+    return {
+        'wall_ms': (time.perf_counter() - wall_start) * 1000 / repeat,
+        'cpu_ms': (time.process_time() - cpu_start) * 1000 / repeat,
+        'fetches': _CountingHandler.requests_served / repeat,
+        'result': result
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--markdown', action='store_true', help='also request markdown from the new path')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        make_html_page(os.path.join(tmp, 'lesson.html'))
+        server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_CountingHandler, directory=tmp))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/lesson.html'
+        
+        try:
+            # Warm imports and caches on both paths
+            legacy_extract_from_url(url)
+            URLProcessor.extract_from_url(url, include_markdown=args.markdown, use_cache=False)
+            
+            legacy = _measure(legacy_extract_from_url, url, args.repeat)
+            current = _measure(
+                lambda u: URLProcessor.extract_from_url(u, include_markdown=args.markdown, use_cache=False), url, args.repeat
+            )
+        finally:
+            server.shutdown()
+    
+    old, new = legacy['result'], current['result']
+    assert new['success'], new.get('error')
+    assert (old['text'], old['images'], old['links']) == (new['text'], new['images'], new['links']), \
+        'extraction output differs from legacy'
+    
+    print(f"{'':10}{'wall ms':>10}{'cpu ms':>10}{'fetches':>10}")
+    for name, row in (('legacy', legacy), ('current', current)):
+        print(f"{name:10}{row['wall_ms']:10.1f}{row['cpu_ms']:10.1f}{row['fetches']:10.1f}")
+    print(f"speedup:  {legacy['wall_ms'] / current['wall_ms']:.2f}x wall, "
+          f"{legacy['cpu_ms'] / current['cpu_ms']:.2f}x cpu")
+
+
+if __name__ == '__main__':
+    main()
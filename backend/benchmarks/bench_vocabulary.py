@@ -0,0 +1,105 @@
+"""
+Vocabulary simplification throughput as the lexicon grows
+
+Compares the compiled single-pass engine with the previous approach of one
+case-insensitive re.sub per lexicon entry.
+
+Usage:
+    python -m benchmarks.bench_vocabulary [--kb 256] [--sizes 18,100,1000,10000,50000] [--legacy-max 1000]
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from config import Config
+from services.vocabulary import VocabularyEngine, load_lexicon, DEFAULT_LEXICON
+
+
+def legacy_simplify(text, lexicon):
+    """_simplify_vocabulary before the compiled engine: one scan per entry"""
+    for word, replacement in lexicon.items():
+        text = re.sub(r'\b' + re.escape(word) + r'\b', replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def _cascades(lexicon):
+    """True if some replacement contains another lexicon entry"""
+    return any(
+        re.search(r'\b' + re.escape(word) + r'\b', replacement, re.IGNORECASE)
+        for replacement in set(lexicon.values())
+        for word in lexicon
+    )
+
+
+def make_lexicon(size, base, rng):
+    """The shipped lexicon padded with random pseudo-words up to size entries"""
+    lexicon = dict(list(base.items())[:size])
+    while len(lexicon) < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12)))
+        lexicon.setdefault(word, word[:3])
+    return lexicon
+
+
+def make_text(kilobytes, words, rng):
+    """Prose-like text in which about one word in ten is a lexicon entry"""
+    filler = ('the students read each chapter carefully and then discuss what they '
+              'learned with a partner before the class begins').split()
+    parts = []
+    size = 0
+    while size < kilobytes * 1024:
+        sentence = [rng.choice(words) if rng.random() < 0.1 else rng.choice(filler) for _ in range(15)]
+        sentence[0] = sentence[0].capitalize()
+        line = ' '.join(sentence) + '. '
+        parts.append(line)
+        size += len(line)
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kb', type=int, default=256, help='size of the sample text')
+    parser.add_argument('--sizes', default='18,100,1000,10000,50000')
+    parser.add_argument('--legacy-max', type=int, default=1000, help='largest lexicon to time the legacy loop on')
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    try:
+        base = load_lexicon(Config.SIMPLIFICATION_LEXICON_PATH)
+    except OSError:
+        base = dict(DEFAULT_LEXICON)
+    # Draw matches from entries every lexicon size contains, so only the lexicon size varies
+    text = make_text(args.kb, list(base)[:18], rng)
+    megabytes = len(text) / (1024 * 1024)
+    
+    print(f"text: {len(text) / 1024:.0f} KB")
+    print(f"{'entries':>8}{'compile s':>11}{'engine MB/s':>13}{'legacy MB/s':>13}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        lexicon = make_lexicon(size, base, rng)
+        
+        started = time.perf_counter()
+        engine = VocabularyEngine(lexicon)
+        compile_time = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        result = engine.simplify(text)
+        engine_rate = megabytes / (time.perf_counter() - started)
+        
+        legacy_rate = ''
+        if size <= args.legacy_max:
+            started = time.perf_counter()
+            legacy = legacy_simplify(text, lexicon)
+            legacy_rate = f"{megabytes / (time.perf_counter() - started):.2f}"
+            # The legacy loop re-scans its own output, so it also rewrites words
+            # inside replacements ("examine closely"); compare only without those
+            if not _cascades(lexicon):
+                # The engine also preserves case; compare case-insensitively
+                assert legacy.lower() == result.lower(), 'engine output differs from legacy'
+        
+        print(f"{size:>8}{compile_time:>11.3f}{engine_rate:>13.2f}{legacy_rate:>13}")
+
+
+if __name__ == '__main__':
+    main()
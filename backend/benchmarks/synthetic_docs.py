@@ -0,0 +1,215 @@
+"""
+Synthetic document generators for benchmarks
+Builds test files directly so no extra authoring libraries are required
+"""
+
+import os
+
+
+def make_pdf(path, pages, lines_per_page=45, blank_pages=()):
+    """
+    Write a minimal text PDF with the given number of pages
+    
+    Pages listed in blank_pages get an empty content stream, which is how a
+    scanned page without a text layer looks to the extractors.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    kids = []
+    
+    for page_num in range(pages):
+        if page_num in blank_pages:
+            content = b""
+        else:
+            ops = ["BT /F1 10 Tf 40 800 Td 12 TL"]
+            for line in range(lines_per_page):
+                ops.append(
+                    f"(Page {page_num + 1} line {line + 1}: the quick brown fox "
+                    f"jumps over the lazy dog {line * 7 % 13}) '"
+                )
+            ops.append("ET")
+            content = "\n".join(ops).encode('latin-1')
+        
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >> >>" % content_id
+        )
+        kids.append(len(objects))
+    
+    objects[1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % kid for kid in kids) +
+        b"] /Count %d >>" % pages
+    )
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+    
+    with open(path, 'wb') as file:
+        file.write(out)
+    return path
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_DOCX_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+_DOCX_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rIdImg1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" '
+    'Target="media/image1.png"/>'
+    '</Relationships>'
+)
+
+
+def make_docx(path, tables=50, rows=40, columns=6, paragraphs_between=5):
+    """
+    Write a table-heavy DOCX
+    
+    Every table has a header row spanning two grid columns and a
+    vertically merged first column, which is the slow case for
+    python-docx's cell-by-cell access.
+    """
+    import zipfile
+    
+    def paragraph(text):
+        return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+    
+    def cell(text, props=''):
+        return f'<w:tc><w:tcPr>{props}</w:tcPr>{paragraph(text)}</w:tc>'
+    
+    body = []
+    for table_num in range(tables):
+        for para_num in range(paragraphs_between):
+            body.append(paragraph(
+                f'Section {table_num + 1} paragraph {para_num + 1} describing the data below.'
+            ))
+        
+        grid = ''.join('<w:gridCol w:w="1200"/>' for _ in range(columns))
+        table_rows = [
+            '<w:tr>' + cell('Merged header', '<w:gridSpan w:val="2"/>') +
+            ''.join(cell(f'Header {c}') for c in range(2, columns)) + '</w:tr>'
+        ]
+        for row in range(rows):
+            merge = '<w:vMerge w:val="restart"/>' if row % 4 == 0 else '<w:vMerge/>'
+            first = cell(f'Group {row // 4}' if row % 4 == 0 else '', merge)
+            table_rows.append(
+                '<w:tr>' + first +
+                ''.join(cell(f'T{table_num} R{row} C{c}') for c in range(1, columns)) + '</w:tr>'
+            )
+        body.append(f'<w:tbl><w:tblPr/><w:tblGrid>{grid}</w:tblGrid>{"".join(table_rows)}</w:tbl>')
+    
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+    )
+    
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _DOCX_PACKAGE_RELS)
+        zf.writestr('word/document.xml', document)
+        zf.writestr('word/_rels/document.xml.rels', _DOCX_DOCUMENT_RELS)
+        zf.writestr('word/media/image1.png', b'')
+    return path
+
+
+def make_html_page(path, paragraphs=120, images=40, links=150):
+    """
+    Write an article-like HTML page with images (half without ALT) and links
+    
+    An og:image meta tag is included so newspaper3k does not download the
+    page's images to pick a top image.
+    """
+    body = []
+    for i in range(paragraphs):
+        body.append(
+            f"<p>Paragraph {i + 1} explains the lesson in plain words. Students read "
+            f"the example, try the exercise and check the answer {i * 7 % 13}.</p>"
+        )
+        if i < images:
+            alt = f' alt="Figure {i + 1}"' if i % 2 == 0 else ''
+            body.append(f'<img src="/img/figure{i + 1}.png"{alt}>')
+        if i % 3 == 0:
+            body.append('<script>var tracking = {"slot": %d};</script>' % i)
+    
+    nav = ''.join(
+        f'<li><a href="/lesson/{i}">Lesson <b>{i}</b></a></li>' if i % 10 else f'<li><a href="/icon/{i}"><img src="/i.png"></a></li>'
+        for i in range(links)
+    )
+    
+    html = (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Synthetic Lesson</title>'
+        '<meta property="og:image" content="/img/cover.png">'
+        '<style>body { font-family: sans-serif; }</style></head>'
+        f'<body><nav><ul>{nav}</ul></nav><article><h1>Synthetic Lesson</h1>{"".join(body)}</article>'
+        '<footer>Course footer</footer></body></html>'
+    )
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return path
+
+
+def make_site(directory, pages=30, links_per_page=3):
+    """
+    Write a small linked course site: index.html links to every lesson,
+    and each lesson links to the next few lessons and back to the index
+    """
+    lessons = [f'lesson{i}.html' for i in range(1, pages + 1)]
+    index_links = ''.join(f'<li><a href="{name}">Lesson {i}</a></li>' for i, name in enumerate(lessons, 1))
+    with open(os.path.join(directory, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(
+            '<html><head><title>Course</title></head><body><h1>Course</h1>'
+            f'<ul>{index_links}</ul><a href="https://elsewhere.example/">External</a>'
+            '<a href="syllabus.pdf">Syllabus</a></body></html>'
+        )
+    
+    for i, name in enumerate(lessons, 1):
+        next_links = ''.join(
+            f'<a href="lesson{j}.html#top">Next {j}</a>'
+            for j in range(i + 1, min(i + links_per_page, pages) + 1)
+        )
+        paragraphs = ''.join(
+            f'<p>Lesson {i} paragraph {p}: students practise the idea and check their work.</p>'
+            for p in range(20)
+        )
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(
+                f'<html><head><title>Lesson {i}</title></head><body><article><h1>Lesson {i}</h1>'
+                f'{paragraphs}</article><nav><a href="index.html">Index</a>{next_links}</nav></body></html>'
+            )
+    return os.path.join(directory, 'index.html')
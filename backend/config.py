@@ -24,6 +24,101 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 50 * 1024 * 1024))  # 50MB
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt', 'png', 'jpg', 'jpeg', 'gif', 'pptx'}
     
+    # Worker Pools
+    WORKER_START_METHOD = os.getenv('WORKER_START_METHOD', 'spawn')  # spawn, forkserver, fork
+    
+    # PDF Engine Selection
+    PDF_ENGINE = os.getenv('PDF_ENGINE', 'auto')  # fast (pypdf), layout (pdfplumber), auto (per page)
+    PDF_AUTO_MAX_SIMPLE_FONTS = int(os.getenv('PDF_AUTO_MAX_SIMPLE_FONTS', 3))
+    PDF_AUTO_MAX_SIMPLE_DRAWING_OPS = int(os.getenv('PDF_AUTO_MAX_SIMPLE_DRAWING_OPS', 20))
+    
+    # Parallel PDF Extraction
+    PDF_PARALLEL_WORKERS = int(os.getenv('PDF_PARALLEL_WORKERS', os.cpu_count() or 1))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 32))
+    
+    # Parallel PPTX Extraction
+    PPTX_PARALLEL_WORKERS = int(os.getenv('PPTX_PARALLEL_WORKERS', os.cpu_count() or 1))
+    PPTX_PARALLEL_MIN_SLIDES = int(os.getenv('PPTX_PARALLEL_MIN_SLIDES', 60))
+    
+    # Outbound HTTP (URL ingestion)
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 15))
+    HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 32))  # Hosts with a kept-alive pool
+    HTTP_POOL_PER_HOST = int(os.getenv('HTTP_POOL_PER_HOST', 4))  # Concurrent connections per host
+    HTTP_POOL_TIMEOUT = float(os.getenv('HTTP_POOL_TIMEOUT', 10))  # Seconds to wait for a free connection
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 2))  # Connection errors and 502/503/504
+    HTTP_MAX_RESPONSE_BYTES = int(os.getenv('HTTP_MAX_RESPONSE_BYTES', 10 * 1024 * 1024))  # 10MB
+    HTTP_USER_AGENT = os.getenv('HTTP_USER_AGENT', 'Mozilla/5.0 (compatible; SkillsetAI/1.0)')
+    
+    # Multi-URL Import and Crawling
+    URL_FETCH_WORKERS = int(os.getenv('URL_FETCH_WORKERS', 8))  # Threads shared by all imports
+    URL_HOST_CONCURRENCY = int(os.getenv('URL_HOST_CONCURRENCY', 2))  # Requests in flight per host
+    URL_HOST_DELAY = float(os.getenv('URL_HOST_DELAY', 0.25))  # Seconds between request starts per host
+    URL_BATCH_MAX_URLS = int(os.getenv('URL_BATCH_MAX_URLS', 50))
+    URL_CRAWL_MAX_DEPTH = int(os.getenv('URL_CRAWL_MAX_DEPTH', 3))
+    URL_CRAWL_MAX_PAGES = int(os.getenv('URL_CRAWL_MAX_PAGES', 100))
+    
+    # ALT Text Remediation (images on imported pages)
+    ALT_TEXT_FETCH_WORKERS = int(os.getenv('ALT_TEXT_FETCH_WORKERS', 8))  # Concurrent image downloads
+    ALT_TEXT_WORKERS = int(os.getenv('ALT_TEXT_WORKERS', 4))  # Concurrent generate_alt_text calls
+    ALT_TEXT_MAX_IMAGE_BYTES = int(os.getenv('ALT_TEXT_MAX_IMAGE_BYTES', 5 * 1024 * 1024))  # 5MB
+    ALT_TEXT_MAX_IMAGES = int(os.getenv('ALT_TEXT_MAX_IMAGES', 50))  # Per page
+    
+    # Batch Processing
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', os.cpu_count() or 1))  # Shared by all batch requests
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', os.cpu_count() or 1))  # Default per request
+    
+    # Full Transformation
+    ADAPTATION_WORKERS = int(os.getenv('ADAPTATION_WORKERS', os.cpu_count() or 1))  # Processes for text adaptations
+    ADAPTATION_IO_WORKERS = int(os.getenv('ADAPTATION_IO_WORKERS', 8))  # Threads for TTS
+    OPERATION_CHUNK_SIZE = int(os.getenv('OPERATION_CHUNK_SIZE', 64 * 1024))  # Characters per chunk of a long text
+    OPERATION_CHUNKING_THRESHOLD = int(os.getenv('OPERATION_CHUNKING_THRESHOLD', 256 * 1024))  # Shorter texts run whole
+    TRANSFORMATION_DEADLINE = float(os.getenv('TRANSFORMATION_DEADLINE', 30))  # Seconds per request
+    
+    # Math Processing
+    MATH_CACHE_SIZE = int(os.getenv('MATH_CACHE_SIZE', 4096))  # Distinct equations kept rendered per process
+    MATH_RENDER_WORKERS = int(os.getenv('MATH_RENDER_WORKERS', os.cpu_count() or 1))  # 0 renders in-process
+    MATH_RENDER_TIMEOUT = float(os.getenv('MATH_RENDER_TIMEOUT', 2.0))  # Seconds per equation
+    MATH_RENDER_MAX_BATCH = int(os.getenv('MATH_RENDER_MAX_BATCH', 200))  # Equations per lazy render request
+    
+    # Color Contrast
+    CONTRAST_MAX_PAIRS = int(os.getenv('CONTRAST_MAX_PAIRS', 40000))  # Foreground x background pairs per batch check
+    
+    # TXT Extraction
+    TXT_CHUNK_SIZE = int(os.getenv('TXT_CHUNK_SIZE', 64 * 1024))  # Characters per chunk
+    TXT_SNIFF_BYTES = int(os.getenv('TXT_SNIFF_BYTES', 64 * 1024))  # Bytes read to detect encoding
+    
+    # OCR
+    OCR_WORKERS = int(os.getenv('OCR_WORKERS', min(4, os.cpu_count() or 1)))  # 0 runs OCR in-process
+    OCR_LANGUAGE = os.getenv('OCR_LANGUAGE', 'eng')
+    OCR_RESOLUTION = int(os.getenv('OCR_RESOLUTION', 300))  # DPI for rasterized pages
+    OCR_MIN_TEXT_CHARS = int(os.getenv('OCR_MIN_TEXT_CHARS', 10))  # Below this a page is treated as scanned
+    OCR_PAGES_PER_TASK = int(os.getenv('OCR_PAGES_PER_TASK', 4))  # Consecutive scanned pages per worker task
+    
+    # Job Queue
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))  # Seconds between polls when idle
+    JOB_CLAIM_BATCH = int(os.getenv('JOB_CLAIM_BATCH', 5))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 120))  # Stale leases are recovered after this
+    JOB_HEARTBEAT_SECONDS = int(os.getenv('JOB_HEARTBEAT_SECONDS', 20))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_BASE_SECONDS = int(os.getenv('JOB_RETRY_BASE_SECONDS', 5))
+    JOB_RETRY_MAX_SECONDS = int(os.getenv('JOB_RETRY_MAX_SECONDS', 300))
+    JOB_PROGRESS_MIN_INTERVAL = float(os.getenv('JOB_PROGRESS_MIN_INTERVAL', 0.5))  # Throttle for progress events
+    
+    # Server-Sent Events
+    SSE_POLL_INTERVAL = float(os.getenv('SSE_POLL_INTERVAL', 0.5))  # Seconds between event table polls
+    SSE_KEEPALIVE_SECONDS = int(os.getenv('SSE_KEEPALIVE_SECONDS', 15))
+    
+    # Extraction Cache
+    EXTRACTION_CACHE_ENABLED = os.getenv('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 512 * 1024 * 1024))  # 512MB
+    
+    # URL Cache
+    URL_CACHE_ENABLED = os.getenv('URL_CACHE_ENABLED', 'true').lower() == 'true'
+    URL_CACHE_TTL_SECONDS = int(os.getenv('URL_CACHE_TTL_SECONDS', 3600))  # Served without revalidation
+    URL_CACHE_MAX_BYTES = int(os.getenv('URL_CACHE_MAX_BYTES', 128 * 1024 * 1024))  # 128MB
+    
     # Firebase
     FIREBASE_CREDENTIALS_PATH = os.getenv('FIREBASE_CREDENTIALS_PATH')
     FIREBASE_CONFIG = {
@@ -53,6 +148,16 @@ class Config:
     UPLOAD_DIR = os.path.join(BASE_DIR, UPLOAD_FOLDER)
     GENERATED_DIR = os.path.join(BASE_DIR, 'generated')
     TEMP_DIR = os.path.join(BASE_DIR, 'temp')
+    CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+    EXTRACTION_CACHE_DIR = os.path.join(CACHE_DIR, 'extraction')
+    URL_CACHE_DIR = os.path.join(CACHE_DIR, 'urls')
+    DATA_DIR = os.path.join(BASE_DIR, 'data')
+    KEY_POINTS_IDF_DIR = os.path.join(CACHE_DIR, 'idf')  # Per-user library term statistics
+    
+    # Text Simplification
+    SIMPLIFICATION_LEXICON_PATH = os.getenv(
+        'SIMPLIFICATION_LEXICON_PATH', os.path.join(DATA_DIR, 'simplification_lexicon.tsv')
+    )
     
     @staticmethod
     def init_app(app):
@@ -60,6 +165,9 @@ class Config:
         os.makedirs(Config.UPLOAD_DIR, exist_ok=True)
         os.makedirs(Config.GENERATED_DIR, exist_ok=True)
         os.makedirs(Config.TEMP_DIR, exist_ok=True)
+        os.makedirs(Config.EXTRACTION_CACHE_DIR, exist_ok=True)
+        os.makedirs(Config.URL_CACHE_DIR, exist_ok=True)
+        os.makedirs(Config.KEY_POINTS_IDF_DIR, exist_ok=True)
 
 
 class DevelopmentConfig(Config):
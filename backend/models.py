@@ -103,6 +103,7 @@ class SavedContent(db.Model):
     reading_level = db.Column(db.String(50))
     content_type = db.Column(db.String(50))
     accessibility_features = db.Column(JSON)  # Store enabled features
+    outline = db.Column(JSON)  # DocumentOutline of original_text (services.outline)
     
     # Timestamps
     saved_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -161,3 +162,70 @@ class UserPreferences(db.Model):
             'createdAt': self.created_at.isoformat() if self.created_at else None,
             'updatedAt': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+class Job(db.Model):
+    """Background processing job (database-backed queue, no external broker)"""
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.String(128), index=True)  # Firebase UID of the requester
+    upload_id = db.Column(db.String(128), db.ForeignKey('uploads.id'))  # Status mirrored onto the upload
+    
+    # Work
+    job_type = db.Column(db.String(50), nullable=False)  # document.process, tts.generate, image.alt_text
+    payload = db.Column(JSON)
+    result = db.Column(JSON)
+    error = db.Column(db.Text)
+    
+    # Queue state - same status values as Upload.status
+    status = db.Column(db.String(20), default='pending', index=True)  # pending, processing, completed, error
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # Retry backoff
+    locked_by = db.Column(db.String(128))  # Worker holding the lease
+    locked_at = db.Column(db.DateTime)  # Lease heartbeat; stale leases are recovered
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self, include_result=True):
+        data = {
+            'id': self.id,
+            'userId': self.user_id,
+            'uploadId': self.upload_id,
+            'jobType': self.job_type,
+            'status': self.status,
+            'attempts': self.attempts,
+            'maxAttempts': self.max_attempts,
+            'error': self.error,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+            'retryAt': self.run_after.isoformat() if self.status == 'pending' and self.attempts and self.run_after else None
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class JobEvent(db.Model):
+    """Progress and lifecycle event for a job, replayed to SSE clients by id"""
+    __tablename__ = 'job_events'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)  # Monotonic; used as the SSE event id
+    job_id = db.Column(db.String(64), db.ForeignKey('jobs.id'), nullable=False, index=True)
+    event = db.Column(db.String(20), nullable=False)  # started, progress, retry, completed, error
+    data = db.Column(JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'jobId': self.job_id,
+            'event': self.event,
+            'data': self.data,
+            'createdAt': self.created_at.isoformat() if self.created_at else None
+        }
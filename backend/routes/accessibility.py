@@ -5,9 +5,15 @@ Text simplification, TTS, dyslexia formatting, image ALT text
 
 from flask import Blueprint, request, jsonify, current_app, send_file
 from services.accessibility_service import accessibility_service
+from services.chunked_ops import chunked_operations
+from services.color_contrast import color_contrast_service, LEVELS
+from services.key_points import library_idf_store
+from services.math_renderer import math_renderer
+from services.transformation_runner import transformation_runner
 from services.tts_service import tts_service
 from services.image_accessibility_service import image_accessibility_service
 from routes.auth import token_required
+from config import Config
 import os
 import uuid
 
@@ -34,7 +40,7 @@ def simplify_text():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        result = accessibility_service.simplify_text(text, target_grade)
+        result = chunked_operations.run('simplify', text, {'simplify_grade': target_grade})
         
         return jsonify({
             'success': True,
@@ -55,17 +61,20 @@ def process_math():
     
     Request Body:
     {
-        "text": "Text containing $x^2 + y^2 = z^2$ equations"
+        "text": "Text containing $x^2 + y^2 = z^2$ equations",
+        "render": true  // false returns only the equation index (see /math/render)
     }
     """
     try:
         data = request.get_json()
         text = data.get('text')
+        # JSON booleans, or 0/"false" strings from form-style clients
+        render = str(data.get('render', True)).lower() not in ('0', 'false')
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        result = accessibility_service.process_math_equations(text)
+        result = accessibility_service.process_math_equations(text, render=render)
         
         return jsonify({
             'success': True,
@@ -78,6 +87,46 @@ def process_math():
         }), 500
 
 
+@accessibility_bp.route('/math/render', methods=['POST'])
+@token_required
+def render_math():
+    """
+    Render equations on demand (MathML, text and spoken English)
+    
+    Lets a viewer render only the equations it is about to show, using the
+    index from /process-math with "render": false.
+    
+    Request Body:
+    {
+        "equations": [{"latex": "x^2", "display": false}, ...]
+    }
+    """
+    try:
+        data = request.get_json()
+        equations = data.get('equations')
+        
+        if not equations or not isinstance(equations, list):
+            return jsonify({'error': 'equations must be a non-empty list'}), 400
+        if len(equations) > Config.MATH_RENDER_MAX_BATCH:
+            return jsonify({'error': f'At most {Config.MATH_RENDER_MAX_BATCH} equations per request'}), 400
+        if not all(isinstance(item, dict) and isinstance(item.get('latex'), str) for item in equations):
+            return jsonify({'error': 'Each equation needs a "latex" string'}), 400
+        
+        renderings = math_renderer.render_many(
+            [(item['latex'], bool(item.get('display'))) for item in equations]
+        )
+        
+        return jsonify({
+            'success': True,
+            'renderings': renderings
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @accessibility_bp.route('/dyslexia-format', methods=['POST'])
 @token_required
 def dyslexia_format():
@@ -142,6 +191,58 @@ def check_contrast():
         }), 500
 
 
+@accessibility_bp.route('/check-contrast/batch', methods=['POST'])
+@token_required
+def check_contrast_batch():
+    """
+    Check every foreground against every background and suggest the
+    nearest passing color for each failing pair
+    
+    Request Body:
+    {
+        "foregrounds": ["#333333", "#777"],
+        "backgrounds": ["#FFFFFF", "#F0F0F0"],  // Optional, defaults to foregrounds
+        "level": "AA",                          // AA, AA_large, AAA or AAA_large
+        "suggest": true,
+        "adjust": "foreground"                  // Or "background"
+    }
+    """
+    try:
+        data = request.get_json()
+        foregrounds = data.get('foregrounds')
+        backgrounds = data.get('backgrounds')
+        level = data.get('level', 'AA')
+        
+        if not foregrounds or not isinstance(foregrounds, list):
+            return jsonify({'error': 'foregrounds must be a non-empty list'}), 400
+        if backgrounds is not None and (not backgrounds or not isinstance(backgrounds, list)):
+            return jsonify({'error': 'backgrounds must be a non-empty list'}), 400
+        if len(foregrounds) * len(backgrounds or foregrounds) > Config.CONTRAST_MAX_PAIRS:
+            return jsonify({'error': f'At most {Config.CONTRAST_MAX_PAIRS} color pairs per request'}), 400
+        if level not in LEVELS:
+            return jsonify({'error': f"level must be one of {', '.join(LEVELS)}"}), 400
+        
+        result = color_contrast_service.check(
+            foregrounds,
+            backgrounds,
+            level=level,
+            suggest=bool(data.get('suggest', True)),
+            adjust=data.get('adjust', 'foreground')
+        )
+        
+        return jsonify({
+            'success': True,
+            'result': result
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @accessibility_bp.route('/extract-key-points', methods=['POST'])
 @token_required
 def extract_key_points():
@@ -151,7 +252,8 @@ def extract_key_points():
     Request Body:
     {
         "text": "Long text...",
-        "num_points": 5
+        "num_points": 5,
+        "use_library_idf": false  // Weight terms by the user's saved library
     }
     """
     try:
@@ -162,7 +264,11 @@ def extract_key_points():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        result = accessibility_service.extract_key_points(text, num_points)
+        idf = None
+        if data.get('use_library_idf'):
+            idf = library_idf_store.for_user(request.user['uid'])
+        
+        result = chunked_operations.run('key_points', text, {'num_points': num_points, 'idf': idf})
         
         return jsonify({
             'success': True,
@@ -237,23 +343,8 @@ def text_to_speech():
         output_path = os.path.join(current_app.config['GENERATED_DIR'], filename)
         
         # Generate speech
-        if provider == 'google':
-            result = tts_service.generate_speech(
-                text, output_path, provider='google',
-                language=language, voice_name=voice, speaking_rate=speaking_rate
-            )
-        elif provider == 'polly':
-            result = tts_service.generate_speech(
-                text, output_path, provider='polly',
-                voice_id=voice, language_code=language
-            )
-        elif provider == 'gtts':
-            result = tts_service.generate_speech(
-                text, output_path, provider='gtts',
-                language=language.split('-')[0]  # Extract base language
-            )
-        else:
-            result = tts_service.generate_speech(text, output_path, provider='gtts')
+        provider, options = tts_service.provider_options(provider, language, voice, speaking_rate)
+        result = tts_service.generate_speech(text, output_path, provider=provider, **options)
         
         return jsonify({
             'success': True,
@@ -410,12 +501,16 @@ def full_transformation():
     """
     Apply comprehensive accessibility transformations
     
+    Adaptations run concurrently; any still running after the deadline are
+    listed in "timed_out" and the finished ones are returned.
+    
     Request Body:
     {
         "text": "Text content...",
         "adaptations": ["simplify", "dyslexia", "tts", "key_points"],
         "tts_provider": "gtts",
-        "simplify_grade": 8
+        "simplify_grade": 8,
+        "deadline": 30  // Optional, seconds (capped at TRANSFORMATION_DEADLINE)
     }
     """
     try:
@@ -428,42 +523,34 @@ def full_transformation():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        results = {}
-        
-        # Text simplification
-        if 'simplify' in adaptations:
-            results['simplified'] = accessibility_service.simplify_text(text, simplify_grade)
-        
-        # Dyslexia formatting
-        if 'dyslexia' in adaptations:
-            results['dyslexia_formatted'] = accessibility_service.apply_dyslexia_friendly_format(text)
-        
-        # Key points extraction
-        if 'key_points' in adaptations:
-            results['key_points'] = accessibility_service.extract_key_points(text)
-        
-        # Structure description
-        if 'structure' in adaptations:
-            results['structure'] = accessibility_service.describe_structure(text)
-        
-        # Math processing
-        if 'math' in adaptations:
-            results['math_processed'] = accessibility_service.process_math_equations(text)
-        
-        # Text-to-speech
+        # Text-to-speech runs on a thread alongside the text adaptations
+        io_tasks = {}
         if 'tts' in adaptations:
             filename = f"tts_{uuid.uuid4()}.mp3"
             output_path = os.path.join(current_app.config['GENERATED_DIR'], filename)
-            tts_result = tts_service.generate_speech(text, output_path, provider=tts_provider)
-            results['tts'] = {
-                **tts_result,
-                'download_url': f'/api/accessibility/download-audio/{filename}'
-            }
+            
+            def synthesize():
+                tts_result = tts_service.generate_speech(text, output_path, provider=tts_provider)
+                return {
+                    **tts_result,
+                    'download_url': f'/api/accessibility/download-audio/{filename}'
+                }
+            
+            io_tasks['tts'] = synthesize
+        
+        results, timed_out = transformation_runner.run(
+            text,
+            adaptations,
+            options={'simplify_grade': simplify_grade},
+            io_tasks=io_tasks,
+            deadline=data.get('deadline')
+        )
         
         return jsonify({
             'success': True,
             'adaptations_applied': adaptations,
-            'results': results
+            'results': results,
+            'timed_out': timed_out
         }), 200
     except Exception as e:
         return jsonify({
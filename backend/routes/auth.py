@@ -29,6 +29,28 @@ def token_required(f):
     return decorated
 
 
+def stream_token_required(f):
+    """
+    Like token_required, but also accepts the token as a ?token= query
+    parameter, since browser EventSource clients cannot set headers
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers.get('Authorization', '').replace('Bearer ', '') or request.args.get('token', '')
+        
+        if not token:
+            return jsonify({'error': 'Token is missing'}), 401
+        
+        try:
+            decoded_token = firebase_service.verify_token(token)
+            request.user = decoded_token
+            return f(*args, **kwargs)
+        except Exception as e:
+            return jsonify({'error': 'Invalid token', 'message': str(e)}), 401
+    
+    return decorated
+
+
 @auth_bp.route('/verify', methods=['POST'])
 def verify_token():
     """
@@ -3,6 +3,7 @@ Database Routes - CRUD operations for saved content and uploads
 """
 from flask import Blueprint, request, jsonify
 from models import db, User, Upload, SavedContent, UserPreferences
+from services.outline import DocumentOutline
 from datetime import datetime
 import uuid
 
@@ -166,18 +167,20 @@ def save_content():
     data = request.json
     
     try:
+        original_text = data.get('originalText')
         content = SavedContent(
             id=data.get('id', str(uuid.uuid4())),
             user_id=data['userId'],
             upload_id=data.get('uploadId'),
             file_name=data.get('fileName'),
-            original_text=data.get('originalText'),
+            original_text=original_text,
             simplified_text=data.get('simplifiedText'),
             summary=data.get('summary'),
             key_points=data.get('keyPoints', []),
             reading_level=data.get('readingLevel'),
             content_type=data.get('contentType'),
-            accessibility_features=data.get('accessibilityFeatures', {})
+            accessibility_features=data.get('accessibilityFeatures', {}),
+            outline=DocumentOutline.scan(original_text).to_dict() if original_text else None
         )
         
         db.session.add(content)
@@ -213,6 +216,58 @@ def get_saved_content_item(content_id):
         return jsonify({'error': str(e)}), 500
 
 
+def _content_outline(content):
+    """Stored outline of content's original text, rebuilt and saved if missing or stale"""
+    text = content.original_text or ''
+    outline = DocumentOutline.from_dict(content.outline, len(text))
+    if outline is None:
+        outline = DocumentOutline.scan(text)
+        content.outline = outline.to_dict()
+        db.session.commit()
+    return outline
+
+
+@db_bp.route('/saved-content/item/<content_id>/outline', methods=['GET'])
+def get_saved_content_outline(content_id):
+    """Get the outline (headings, lists, code blocks, paragraphs with offsets) of saved content"""
+    try:
+        content = SavedContent.query.get(content_id)
+        if not content:
+            return jsonify({'error': 'Content not found'}), 404
+        
+        return jsonify(_content_outline(content).to_dict()), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@db_bp.route('/saved-content/item/<content_id>/sections/<int:index>', methods=['GET'])
+def get_saved_content_section(content_id, index):
+    """Get one section (heading index from the outline) of saved content's original text"""
+    try:
+        content = SavedContent.query.get(content_id)
+        if not content:
+            return jsonify({'error': 'Content not found'}), 404
+        
+        outline = _content_outline(content)
+        section = outline.section(index)
+        if section is None:
+            return jsonify({'error': 'Section not found'}), 404
+        
+        return jsonify({
+            'index': index,
+            'level': section['level'],
+            'title': section['title'],
+            'start': section['start'],
+            'end': section['end'],
+            'text': content.original_text[section['start']:section['end']],
+            'sectionCount': len(outline.headings)
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @db_bp.route('/saved-content/<content_id>', methods=['DELETE'])
 def delete_saved_content(content_id):
     """Delete saved content"""
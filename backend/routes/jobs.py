@@ -0,0 +1,247 @@
+"""
+Job Routes
+Queue long-running processing and follow its progress
+"""
+
+import time
+from flask import Blueprint, request, jsonify
+from config import Config
+from models import db
+from services.job_queue import job_queue
+import services.job_handlers  # noqa: F401 - registers the handlers
+from routes.auth import token_required, stream_token_required
+from routes.streaming import format_sse, sse_response
+
+# Events after which a job stream is closed
+TERMINAL_EVENTS = ('completed', 'error')
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+def _accepted(job):
+    """202 response pointing at the job status endpoint"""
+    status_url = f'/api/jobs/{job.id}'
+    response = jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': status_url,
+        'events_url': f'{status_url}/events'
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+
+@jobs_bp.route('/document', methods=['POST'])
+@token_required
+def enqueue_document():
+    """
+    Queue document extraction
+    
+    Request Body:
+    {
+        "file_path": "/path/to/file",
+        "file_type": "pdf",
+        "pdf_engine": "auto",   // optional
+        "upload_id": "abc123"   // optional, upload status is kept in sync
+    }
+    """
+    try:
+        data = request.get_json()
+        file_path = data.get('file_path')
+        file_type = data.get('file_type')
+        
+        if not file_path or not file_type:
+            return jsonify({'error': 'file_path and file_type are required'}), 400
+        
+        job = job_queue.enqueue(
+            'document.process',
+            {
+                'file_path': file_path,
+                'file_type': file_type,
+                'pdf_engine': data.get('pdf_engine')
+            },
+            user_id=request.user['uid'],
+            upload_id=data.get('upload_id')
+        )
+        return _accepted(job)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@jobs_bp.route('/tts', methods=['POST'])
+@token_required
+def enqueue_tts():
+    """
+    Queue text-to-speech generation
+    
+    Request Body:
+    {
+        "text": "Text to convert to speech",
+        "provider": "gtts",  // google, polly, gtts, pyttsx3
+        "language": "en-US",
+        "voice": "en-US-Neural2-C",
+        "speaking_rate": 1.0
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data.get('text'):
+            return jsonify({'error': 'Text is required'}), 400
+        
+        job = job_queue.enqueue(
+            'tts.generate',
+            {
+                'text': data['text'],
+                'provider': data.get('provider', 'gtts'),
+                'language': data.get('language', 'en-US'),
+                'voice': data.get('voice', 'en-US-Neural2-C'),
+                'speaking_rate': data.get('speaking_rate', 1.0)
+            },
+            user_id=request.user['uid']
+        )
+        return _accepted(job)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@jobs_bp.route('/image-alt', methods=['POST'])
+@token_required
+def enqueue_image_alt():
+    """
+    Queue ALT text generation
+    
+    Request Body:
+    {
+        "image_path": "/path/to/image.jpg"
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data.get('image_path'):
+            return jsonify({'error': 'image_path is required'}), 400
+        
+        job = job_queue.enqueue(
+            'image.alt_text',
+            {'image_path': data['image_path']},
+            user_id=request.user['uid']
+        )
+        return _accepted(job)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@token_required
+def get_job(job_id):
+    """
+    Get job status, and the result once completed
+    
+    Status is one of: pending, processing, completed, error
+    """
+    try:
+        job = job_queue.get(job_id)
+        
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job.user_id and job.user_id != request.user['uid']:
+            return jsonify({'error': 'Unauthorized access'}), 403
+        
+        return jsonify({
+            'success': True,
+            'job': job.to_dict(include_result=job.status == 'completed')
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _job_events(job_id, last_event_id):
+    """
+    Yield SSE messages for a job until it completes or fails
+    
+    New events are picked up by polling the job_events table, so the
+    stream works across processes (the job runs in worker.py). A comment
+    line is sent periodically to keep idle connections open.
+    """
+    last_keepalive = time.monotonic()
+    
+    while True:
+        events = job_queue.events_after(job_id, last_event_id)
+        # End the read transaction so the next poll sees new commits
+        db.session.rollback()
+        
+        for event in events:
+            last_event_id = event.id
+            yield format_sse(
+                {'job_id': job_id, **(event.data or {})},
+                event=event.event,
+                event_id=event.id
+            )
+            if event.event in TERMINAL_EVENTS:
+                return
+        
+        if not events:
+            job = job_queue.get(job_id)
+            db.session.rollback()
+            if job is None:
+                return
+            if job.status in TERMINAL_EVENTS:
+                # Finished before event recording, or its events were pruned
+                yield format_sse({'job_id': job_id, 'status': job.status, 'error': job.error}, event=job.status)
+                return
+        
+        if time.monotonic() - last_keepalive >= Config.SSE_KEEPALIVE_SECONDS:
+            last_keepalive = time.monotonic()
+            yield ': keep-alive\n\n'
+        
+        time.sleep(Config.SSE_POLL_INTERVAL)
+
+
+@jobs_bp.route('/<job_id>/events', methods=['GET'])
+@stream_token_required
+def stream_job_events(job_id):
+    """
+    Stream job progress as Server-Sent Events
+    
+    Events: started, progress ({stage, percent, ...}), retry, completed, error.
+    The stream closes after 'completed' or 'error'; fetch the result from
+    GET /api/jobs/<job_id>. Reconnecting clients resume after the
+    Last-Event-ID header (sent automatically by EventSource) or the
+    ?last_event_id= query parameter.
+    """
+    try:
+        job = job_queue.get(job_id)
+        
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job.user_id and job.user_id != request.user['uid']:
+            return jsonify({'error': 'Unauthorized access'}), 403
+        
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+        
+        return sse_response(_job_events(job_id, last_event_id))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
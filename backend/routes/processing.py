@@ -5,7 +5,12 @@ Document processing, text extraction, parsing
 
 from flask import Blueprint, request, jsonify, current_app
 from services.document_processor import DocumentProcessor
+from services.extraction_cache import extraction_cache
+from services.url_cache import url_cache
+from services.math_renderer import math_renderer
+from services.batch_processor import batch_processor
 from routes.auth import token_required
+from routes.streaming import ndjson_response, wants_ndjson
 import os
 
 processing_bp = Blueprint('processing', __name__)
@@ -21,7 +26,8 @@ def process_document():
     {
         "file_path": "/path/to/file",
         "file_type": "pdf",
-        "user_id": "user123"
+        "user_id": "user123",
+        "pdf_engine": "auto"  // fast, layout, auto (optional)
     }
     """
     try:
@@ -29,6 +35,7 @@ def process_document():
         file_path = data.get('file_path')
         file_type = data.get('file_type')
         user_id = data.get('user_id', request.user['uid'])
+        pdf_engine = data.get('pdf_engine')
         
         if not file_path or not file_type:
             return jsonify({'error': 'file_path and file_type are required'}), 400
@@ -37,7 +44,7 @@ def process_document():
             return jsonify({'error': 'File not found'}), 404
         
         # Process document
-        result = DocumentProcessor.process_document(file_path, file_type)
+        result = DocumentProcessor.process_document(file_path, file_type, pdf_engine=pdf_engine)
         
         # Get metadata
         metadata = DocumentProcessor.get_document_metadata(file_path)
@@ -56,6 +63,52 @@ def process_document():
         }), 500
 
 
+@processing_bp.route('/document/stream', methods=['POST'])
+@token_required
+def process_document_stream():
+    """
+    Process uploaded document, streaming results page by page as NDJSON
+    
+    Request Body:
+    {
+        "file_path": "/path/to/file",
+        "file_type": "pdf",
+        "pdf_engine": "auto"  // fast, layout, auto (optional)
+    }
+    
+    Response lines:
+    {"event": "metadata", "metadata": {...}}
+    {"event": "page", "page": 1, "text": "...", "engine": "fast", ...}   (PDF only)
+    {"event": "content", "content": {...}}                         (other types)
+    {"event": "complete", "page_count": 12, "word_count": 3400, ...}
+    """
+    try:
+        data = request.get_json()
+        file_path = data.get('file_path')
+        file_type = data.get('file_type')
+        pdf_engine = data.get('pdf_engine')
+        
+        if not file_path or not file_type:
+            return jsonify({'error': 'file_path and file_type are required'}), 400
+        
+        if not os.path.exists(file_path):
+            return jsonify({'error': 'File not found'}), 404
+        
+        def events():
+            yield {
+                'event': 'metadata',
+                'metadata': DocumentProcessor.get_document_metadata(file_path)
+            }
+            yield from DocumentProcessor.iter_document(file_path, file_type, pdf_engine)
+        
+        return ndjson_response(events())
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @processing_bp.route('/extract-text', methods=['POST'])
 @token_required
 def extract_text():
@@ -96,15 +149,20 @@ def extract_text():
 @token_required
 def batch_process():
     """
-    Process multiple documents at once
+    Process multiple documents concurrently
     
     Request Body:
     {
         "files": [
             {"file_path": "/path/to/file1.pdf", "file_type": "pdf"},
             {"file_path": "/path/to/file2.docx", "file_type": "docx"}
-        ]
+        ],
+        "max_concurrency": 4,  // optional, capped at BATCH_WORKERS
+        "pdf_engine": "auto"   // optional
     }
+    
+    With ?stream=1 (or Accept: application/x-ndjson) the response is NDJSON:
+    one 'file' line per document as it finishes, then a 'complete' line.
     """
     try:
         data = request.get_json()
@@ -113,31 +171,34 @@ def batch_process():
         if not files:
             return jsonify({'error': 'No files provided'}), 400
         
+        max_concurrency = data.get('max_concurrency')
+        pdf_engine = data.get('pdf_engine')
+        
+        if wants_ndjson():
+            return ndjson_response(batch_processor.stream(files, max_concurrency, pdf_engine))
+        
         results = []
         errors = []
         
-        for file_info in files:
-            file_path = file_info.get('file_path')
-            file_type = file_info.get('file_type')
-            
-            if not file_path or not file_type:
-                errors.append({
-                    'file': file_info,
-                    'error': 'Missing file_path or file_type'
-                })
-                continue
-            
-            try:
-                result = DocumentProcessor.process_document(file_path, file_type)
+        for event in sorted(
+            batch_processor.iter_results(files, max_concurrency, pdf_engine),
+            key=lambda event: event['index']
+        ):
+            if event['success']:
                 results.append({
-                    'file_path': file_path,
-                    'file_type': file_type,
-                    'content': result
+                    'file_path': event['file_path'],
+                    'file_type': event['file_type'],
+                    'content': event['content']
+                })
+            elif 'file' in event:
+                errors.append({
+                    'file': event['file'],
+                    'error': event['error']
                 })
-            except Exception as e:
+            else:
                 errors.append({
-                    'file_path': file_path,
-                    'error': str(e)
+                    'file_path': event['file_path'],
+                    'error': event['error']
                 })
         
         return jsonify({
@@ -152,3 +213,21 @@ def batch_process():
             'success': False,
             'error': str(e)
         }), 500
+
+
+@processing_bp.route('/cache/stats', methods=['GET'])
+@token_required
+def cache_stats():
+    """Extraction, URL and equation cache hit/miss counters and size"""
+    try:
+        return jsonify({
+            'success': True,
+            'cache': extraction_cache.stats(),
+            'url_cache': url_cache.stats(),
+            'math_cache': math_renderer.stats()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,74 @@
+"""
+Streaming Response Helpers
+Newline-delimited JSON and Server-Sent Events responses for incremental results
+"""
+
+import json
+from flask import Response, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+STREAM_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'  # Disable proxy buffering (nginx)
+}
+
+
+def wants_ndjson():
+    """True when the client asked for a streamed response (?stream=1 or Accept header)"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def ndjson_response(events):
+    """
+    Stream an iterable of dicts as NDJSON, one object per line
+    
+    Errors raised while iterating are reported as a final
+    {"event": "error"} line since the status code has already been sent.
+    """
+    def generate():
+        try:
+            for event in events:
+                yield json.dumps(event, default=str) + '\n'
+        except Exception as e:
+            yield json.dumps({'event': 'error', 'error': str(e)}) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype=NDJSON_MIMETYPE,
+        headers=STREAM_HEADERS
+    )
+
+
+def format_sse(data, event=None, event_id=None):
+    """Format one Server-Sent Event; data is JSON-encoded"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def sse_response(messages):
+    """
+    Stream an iterable of pre-formatted SSE messages (see format_sse)
+    
+    Errors raised while iterating are sent as a final 'error' event.
+    """
+    def generate():
+        try:
+            for message in messages:
+                yield message
+        except Exception as e:
+            yield format_sse({'error': str(e)}, event='error')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype=SSE_MIMETYPE,
+        headers=STREAM_HEADERS
+    )
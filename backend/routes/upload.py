@@ -6,10 +6,17 @@ Handles file upload and URL processing
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 import os
+import time
 import validators
+from config import Config
 from services.url_processor import url_processor
+from services.url_cache import url_cache
+from services.url_crawler import url_crawler
+from services.alt_text_remediation import alt_text_remediator
 from services.document_processor import DocumentProcessor
+from services.batch_processor import batch_processor
 from routes.auth import token_required
+from routes.streaming import ndjson_response, wants_ndjson
 
 upload_bp = Blueprint('upload', __name__)
 
@@ -20,6 +27,22 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
+def save_url_content(upload_dir, url, text):
+    """Save extracted URL text under a stable per-URL filename (shared by all workers and restarts)"""
+    os.makedirs(upload_dir, exist_ok=True)
+    filename = f"url_content_{url_cache.key(url)[:16]}.txt"
+    file_path = os.path.join(upload_dir, filename)
+    
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    
+    return {
+        'id': filename,
+        'filename': filename,
+        'file_path': file_path,
+    }
+
+
 @upload_bp.route('/document', methods=['POST'])
 def upload_document():
     """
@@ -89,6 +112,68 @@ def upload_document():
         }), 500
 
 
+@upload_bp.route('/document/stream', methods=['POST'])
+def upload_document_stream():
+    """
+    Upload document and stream extraction results as NDJSON
+    (no auth required for demo)
+    
+    Form Data:
+    - file: The file to upload
+    
+    Response lines:
+    {"event": "file", "file": {...}}
+    {"event": "page", "page": 1, "text": "...", "images": [...]}   (PDF only)
+    {"event": "content", "content": {...}}                         (other types)
+    {"event": "complete", "page_count": 12, "word_count": 3400, ...}
+    """
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+        
+        file = request.files['file']
+        
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({
+                'error': 'File type not allowed',
+                'allowed_types': list(current_app.config['ALLOWED_EXTENSIONS'])
+            }), 400
+        
+        filename = secure_filename(file.filename)
+        upload_dir = current_app.config['UPLOAD_DIR']
+        os.makedirs(upload_dir, exist_ok=True)
+        
+        file_path = os.path.join(upload_dir, filename)
+        file.save(file_path)
+        
+        file_size = os.path.getsize(file_path)
+        file_extension = filename.rsplit('.', 1)[1].lower()
+        
+        def events():
+            yield {
+                'event': 'file',
+                'file': {
+                    'id': filename,
+                    'filename': filename,
+                    'file_path': file_path,
+                    'file_size': file_size,
+                    'file_size_mb': round(file_size / (1024 * 1024), 2),
+                    'file_type': file_extension
+                }
+            }
+            yield from DocumentProcessor.iter_document(file_path, file_extension)
+        
+        return ndjson_response(events())
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @upload_bp.route('/file', methods=['POST'])
 @token_required
 def upload_file():
@@ -156,12 +241,15 @@ def process_url():
     
     Request Body:
     {
-        "url": "https://example.com/article"
+        "url": "https://example.com/article",
+        "include_markdown": false,  // optional
+        "generate_alt_text": false  // optional, describe images missing ALT text
     }
     """
     try:
         data = request.get_json()
         url = data.get('url')
+        include_markdown = bool(data.get('include_markdown', False))
         
         if not url:
             return jsonify({'error': 'URL is required'}), 400
@@ -171,7 +259,7 @@ def process_url():
             return jsonify({'error': 'Invalid URL format'}), 400
         
         # Extract content
-        result = url_processor.extract_from_url(url)
+        result = url_processor.extract_from_url(url, include_markdown=include_markdown)
         
         if not result.get('success'):
             return jsonify({
@@ -179,26 +267,17 @@ def process_url():
                 'error': result.get('error', 'Failed to extract content from URL')
             }), 400
         
-        # Save extracted content to file
-        upload_dir = current_app.config['UPLOAD_DIR']
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Create filename from URL
-        filename = f"url_content_{abs(hash(url))}.txt"
-        file_path = os.path.join(upload_dir, filename)
+        if data.get('generate_alt_text'):
+            alt_text_remediator.remediate_page(result)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(result['text'])
+        # Save extracted content to file
+        file_info = save_url_content(current_app.config['UPLOAD_DIR'], url, result['text'])
         
         return jsonify({
             'success': True,
             'message': 'URL content extracted successfully',
             'content': result,
-            'file': {
-                'id': filename,
-                'filename': filename,
-                'file_path': file_path,
-            }
+            'file': file_info
         }), 200
     except Exception as e:
         return jsonify({
@@ -207,15 +286,168 @@ def process_url():
         }), 500
 
 
+@upload_bp.route('/urls', methods=['POST'])
+@token_required
+def process_urls():
+    """
+    Import several URLs concurrently, e.g. a reading list
+    
+    Request Body:
+    {
+        "urls": ["https://example.com/a", "https://example.com/b"],
+        "max_concurrency": 8,       // optional, capped at URL_FETCH_WORKERS
+        "include_markdown": false,  // optional
+        "generate_alt_text": false  // optional, describe images missing ALT text
+    }
+    
+    With ?stream=1 (or Accept: application/x-ndjson) the response is NDJSON:
+    one 'url' line per URL as it finishes, then a 'complete' line.
+    """
+    try:
+        data = request.get_json()
+        urls = data.get('urls') or []
+        
+        if not urls or not isinstance(urls, list):
+            return jsonify({'error': 'urls must be a non-empty list'}), 400
+        
+        if len(urls) > Config.URL_BATCH_MAX_URLS:
+            return jsonify({'error': f'At most {Config.URL_BATCH_MAX_URLS} URLs per request'}), 400
+        
+        invalid = [url for url in urls if not isinstance(url, str) or not validators.url(url)]
+        if invalid:
+            return jsonify({'error': 'Invalid URL format', 'invalid_urls': invalid}), 400
+        
+        alt_session = alt_text_remediator.session() if data.get('generate_alt_text') else None
+        events = url_crawler.iter_urls(
+            urls,
+            include_markdown=bool(data.get('include_markdown', False)),
+            max_concurrency=data.get('max_concurrency'),
+            alt_session=alt_session
+        )
+        return _url_import_response(events, current_app.config['UPLOAD_DIR'], alt_session)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@upload_bp.route('/crawl', methods=['POST'])
+@token_required
+def crawl_site():
+    """
+    Import a site by crawling same-site links from a seed URL
+    
+    Request Body:
+    {
+        "url": "https://course.example.com/",
+        "max_depth": 1,             // link hops from the seed (capped at URL_CRAWL_MAX_DEPTH)
+        "max_pages": 20,            // capped at URL_CRAWL_MAX_PAGES
+        "max_concurrency": 8,       // optional, capped at URL_FETCH_WORKERS
+        "include_markdown": false,  // optional
+        "generate_alt_text": false  // optional, describe images missing ALT text
+    }
+    
+    Streams like /urls; each 'url' line also carries its depth and parent page.
+    """
+    try:
+        data = request.get_json()
+        url = data.get('url')
+        
+        if not url:
+            return jsonify({'error': 'URL is required'}), 400
+        
+        if not validators.url(url):
+            return jsonify({'error': 'Invalid URL format'}), 400
+        
+        try:
+            max_depth = min(max(int(data.get('max_depth', 1)), 0), Config.URL_CRAWL_MAX_DEPTH)
+            max_pages = min(max(int(data.get('max_pages', 20)), 1), Config.URL_CRAWL_MAX_PAGES)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'max_depth and max_pages must be integers'}), 400
+        
+        alt_session = alt_text_remediator.session() if data.get('generate_alt_text') else None
+        events = url_crawler.crawl(
+            url,
+            max_depth=max_depth,
+            max_pages=max_pages,
+            include_markdown=bool(data.get('include_markdown', False)),
+            max_concurrency=data.get('max_concurrency'),
+            alt_session=alt_session
+        )
+        return _url_import_response(events, current_app.config['UPLOAD_DIR'], alt_session)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _url_import_response(events, upload_dir, alt_session=None):
+    """Save each imported page and stream (or collect) the per-URL results"""
+    def saved(events):
+        for event in events:
+            if event.get('success'):
+                event['file'] = save_url_content(upload_dir, event['url'], event.get('text', ''))
+            yield event
+    
+    if wants_ndjson():
+        return ndjson_response(_with_import_summary(saved(events), alt_session))
+    
+    results = []
+    errors = []
+    for event in saved(events):
+        (results if event['success'] else errors).append(event)
+    
+    response = {
+        'success': True,
+        'message': f'{len(results)} URLs imported successfully',
+        'imported_count': len(results),
+        'error_count': len(errors),
+        'results': results,
+        'errors': errors
+    }
+    if alt_session is not None:
+        response['alt_text_remediation'] = alt_session.summary()
+    return jsonify(response), 200
+
+
+def _with_import_summary(events, alt_session=None):
+    """Pass events through, then add a 'complete' event with totals"""
+    started = time.perf_counter()
+    imported = errors = 0
+    for event in events:
+        if event['success']:
+            imported += 1
+        else:
+            errors += 1
+        yield event
+    
+    summary = {
+        'event': 'complete',
+        'imported_count': imported,
+        'error_count': errors,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    if alt_session is not None:
+        summary['alt_text_remediation'] = alt_session.summary()
+    yield summary
+
+
 @upload_bp.route('/batch', methods=['POST'])
 @token_required
 def upload_batch():
     """
-    Upload multiple files at once
+    Upload multiple files at once and extract them concurrently
     
     Form Data:
     - files[]: Multiple files
     - user_id: User ID
+    - extract: "false" to only save the files (default: true)
+    - max_concurrency: Files extracted at once (optional, capped at BATCH_WORKERS)
+    
+    With ?stream=1 (or Accept: application/x-ndjson) the response is NDJSON:
+    one 'file' line per file as its extraction finishes, then a 'complete' line.
     """
     try:
         if 'files[]' not in request.files:
@@ -223,10 +455,13 @@ def upload_batch():
         
         files = request.files.getlist('files[]')
         user_id = request.form.get('user_id', request.user['uid'])
+        extract = request.form.get('extract', 'true').lower() != 'false'
+        max_concurrency = request.form.get('max_concurrency')
         
         uploaded_files = []
         errors = []
         
+        # Saving reads the request body, so it stays on the request thread
         for file in files:
             if file.filename == '':
                 continue
@@ -261,6 +496,19 @@ def upload_batch():
                     'error': str(e)
                 })
         
+        if wants_ndjson():
+            return ndjson_response(_stream_batch_upload(
+                uploaded_files, errors, user_id, extract, max_concurrency
+            ))
+        
+        if extract:
+            for event in batch_processor.iter_results(uploaded_files, max_concurrency):
+                uploaded = uploaded_files[event['index']]
+                if event['success']:
+                    uploaded['content'] = event['content']
+                else:
+                    uploaded['extraction_error'] = event['error']
+        
         return jsonify({
             'success': True,
             'message': f'{len(uploaded_files)} files uploaded successfully',
@@ -273,3 +521,31 @@ def upload_batch():
             'success': False,
             'error': str(e)
         }), 500
+
+
+def _stream_batch_upload(uploaded_files, errors, user_id, extract, max_concurrency):
+    """NDJSON events for upload_batch: save errors first, then each file as it is extracted"""
+    error_count = len(errors)
+    for error in errors:
+        yield {'event': 'file', 'success': False, **error}
+    
+    if not extract:
+        for index, uploaded in enumerate(uploaded_files):
+            yield {'event': 'file', 'index': index, 'success': True, 'file': uploaded}
+    else:
+        for event in batch_processor.iter_results(uploaded_files, max_concurrency):
+            uploaded = uploaded_files[event['index']]
+            result = {'event': 'file', 'index': event['index'], 'success': event['success'], 'file': uploaded}
+            if event['success']:
+                result.update({'content': event['content'], 'seconds': event['seconds']})
+            else:
+                result['error'] = event['error']
+                error_count += 1
+            yield result
+    
+    yield {
+        'event': 'complete',
+        'uploaded_count': len(uploaded_files),
+        'error_count': error_count,
+        'user_id': user_id
+    }
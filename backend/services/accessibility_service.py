@@ -4,16 +4,12 @@ Text simplification, dyslexia fonts, high contrast, math processing
 """
 
 import re
-import nltk
-from textstat import flesch_reading_ease, flesch_kincaid_grade
-import sympy
-from sympy.parsing.latex import parse_latex
-
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from services.key_points import key_point_extractor
+from services.math_renderer import math_renderer, scan_equations
+from services.outline import DocumentOutline
+from services.color_contrast import color_contrast_service
+from services.text_analysis import text_analyzer, LONG_SENTENCE_WORDS
+from services.vocabulary import vocabulary_engine
 
 class AccessibilityService:
     
@@ -21,25 +17,27 @@ class AccessibilityService:
         # Simplified version without spaCy
         print("AccessibilityService initialized (basic mode - without advanced NLP)")
     
-    def simplify_text(self, text, target_grade_level=8):
+    def simplify_text(self, text, target_grade_level=8, analysis=None):
         """
         Simplify text for cognitive accessibility
         - Break long sentences
         - Replace complex words
         - Improve readability
+        
+        analysis is an AnalyzedDocument for text, built here if not supplied
         """
         try:
+            analysis = analysis or text_analyzer.analyze(text)
+            
             # Calculate current readability
-            current_grade = flesch_kincaid_grade(text)
-            current_ease = flesch_reading_ease(text)
+            current_grade = analysis.grade_level
+            current_ease = analysis.reading_ease
             
-            # Split into sentences
-            sentences = nltk.sent_tokenize(text)
             simplified_sentences = []
             
-            for sentence in sentences:
+            for sentence, word_count in zip(analysis.sentences, analysis.sentence_word_counts):
                 # Break long sentences
-                if len(sentence.split()) > 20:
+                if word_count > LONG_SENTENCE_WORDS:
                     # Split at conjunctions
                     parts = re.split(r'\s+(and|but|or|because|however|therefore)\s+', sentence, flags=re.IGNORECASE)
                     for part in parts:
@@ -51,8 +49,9 @@ class AccessibilityService:
             # Replace complex words
             simplified_text = self._simplify_vocabulary(' '.join(simplified_sentences))
             
-            new_grade = flesch_kincaid_grade(simplified_text)
-            new_ease = flesch_reading_ease(simplified_text)
+            simplified = text_analyzer.analyze(simplified_text)
+            new_grade = simplified.grade_level
+            new_ease = simplified.reading_ease
             
             return {
                 'original_text': text,
@@ -63,7 +62,11 @@ class AccessibilityService:
                     'original_ease_score': round(current_ease, 1),
                     'simplified_ease_score': round(new_ease, 1)
                 },
-                'improvement': round(current_grade - new_grade, 1)
+                'improvement': round(current_grade - new_grade, 1),
+                'counts': {
+                    'original': analysis.counts(),
+                    'simplified': simplified.counts()
+                }
             }
         except Exception as e:
             return {
@@ -73,81 +76,48 @@ class AccessibilityService:
             }
     
     def _simplify_vocabulary(self, text):
-        """Replace complex words with simpler alternatives"""
-        # Common complex -> simple word mappings
-        replacements = {
-            r'\butilize\b': 'use',
-            r'\bcommence\b': 'start',
-            r'\bterminate\b': 'end',
-            r'\bdemonstrate\b': 'show',
-            r'\bfacilitate\b': 'help',
-            r'\bimplement\b': 'do',
-            r'\bnevertheless\b': 'but',
-            r'\bfurthermore\b': 'also',
-            r'\bconsequently\b': 'so',
-            r'\badditionally\b': 'also',
-            r'\bsubsequently\b': 'then',
-            r'\bapproximately\b': 'about',
-            r'\bmanufacture\b': 'make',
-            r'\bpurchase\b': 'buy',
-            r'\bcomprehend\b': 'understand',
-            r'\battain\b': 'reach',
-            r'\bobtain\b': 'get',
-            r'\bassist\b': 'help'
-        }
-        
-        for pattern, replacement in replacements.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        
-        return text
+        """Replace complex words with simpler alternatives (see services.vocabulary)"""
+        return vocabulary_engine.simplify(text)
     
-    def process_math_equations(self, text):
+    def process_math_equations(self, text, render=True):
         """
         Process LaTeX math equations
-        - Convert to readable text
-        - Generate step-by-step explanations
+        - Convert to readable text, MathML and spoken English
+        - Index equations by position for lazy rendering
+        
+        Equations ($$...$$, $...$, \\[...\\], \\(...\\)) are found in one
+        left-to-right scan and each distinct one is rendered once (see
+        services.math_renderer). With render=False only the index is built
+        and the viewer fetches renderings on demand.
         """
         try:
-            # Find LaTeX equations (between $ or \[ \])
-            latex_patterns = [
-                r'\$\$(.+?)\$\$',  # Display math
-                r'\$(.+?)\$',       # Inline math
-                r'\\\[(.+?)\\\]',   # Display math
-                r'\\\((.+?)\\\)'    # Inline math
-            ]
+            found = list(scan_equations(text))
+            renderings = []
+            if render:
+                renderings = math_renderer.render_many([(latex, display) for latex, _, display in found])
             
             equations = []
-            for pattern in latex_patterns:
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    latex = match.group(1)
-                    try:
-                        # Parse LaTeX
-                        expr = parse_latex(latex)
-                        
-                        # Convert to text
-                        text_form = str(expr)
-                        
-                        # Simple HTML alternative (instead of MathML)
-                        html_form = f"<math>{text_form}</math>"
-                        
-                        equations.append({
-                            'latex': latex,
-                            'text': text_form,
-                            'html': html_form,
-                            'position': match.span()
-                        })
-                    except:
-                        equations.append({
-                            'latex': latex,
-                            'text': latex,
-                            'error': 'Could not parse equation'
-                        })
+            index = {}
+            for number, (latex, position, display) in enumerate(found):
+                equation = {'latex': latex}
+                if render:
+                    rendering = renderings[number]
+                    if 'error' in rendering:
+                        equation['text'] = latex
+                    equation.update(rendering)
+                equation['position'] = position
+                equation['display'] = display
+                
+                equations.append(equation)
+                index[position[0]] = number
             
             return {
                 'original_text': text,
                 'equations': equations,
-                'equation_count': len(equations)
+                'equation_count': len(equations),
+                'unique_count': len({math_renderer.key(latex, display) for latex, _, display in found}),
+                'index': index,
+                'rendered': render
             }
         except Exception as e:
             return {
@@ -202,76 +172,52 @@ class AccessibilityService:
         WCAG AA requires 4.5:1 for normal text, 3:1 for large text
         """
         try:
-            # Convert hex to RGB
-            def hex_to_rgb(hex_color):
-                hex_color = hex_color.lstrip('#')
-                return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            
-            # Calculate relative luminance
-            def luminance(rgb):
-                r, g, b = [x / 255.0 for x in rgb]
-                r = r / 12.92 if r <= 0.03928 else ((r + 0.055) / 1.055) ** 2.4
-                g = g / 12.92 if g <= 0.03928 else ((g + 0.055) / 1.055) ** 2.4
-                b = b / 12.92 if b <= 0.03928 else ((b + 0.055) / 1.055) ** 2.4
-                return 0.2126 * r + 0.7152 * g + 0.0722 * b
-            
-            # Calculate contrast ratio
-            fg_rgb = hex_to_rgb(foreground)
-            bg_rgb = hex_to_rgb(background)
-            
-            l1 = luminance(fg_rgb)
-            l2 = luminance(bg_rgb)
-            
-            lighter = max(l1, l2)
-            darker = min(l1, l2)
-            contrast_ratio = (lighter + 0.05) / (darker + 0.05)
-            
-            # Check WCAG compliance
-            wcag_aa = contrast_ratio >= 4.5
-            wcag_aa_large = contrast_ratio >= 3.0
-            wcag_aaa = contrast_ratio >= 7.0
+            result = color_contrast_service.check([foreground], [background], level='AA')
+            contrast_ratio = result['contrast_ratios'][0][0]
+            summary = result['summary']
             
-            return {
+            compliance = {
                 'foreground': foreground,
                 'background': background,
-                'contrast_ratio': round(contrast_ratio, 2),
-                'wcag_aa_compliant': wcag_aa,
-                'wcag_aa_large_compliant': wcag_aa_large,
-                'wcag_aaa_compliant': wcag_aaa,
-                'recommendation': 'Pass' if wcag_aa else 'Increase contrast'
+                'contrast_ratio': contrast_ratio,
+                'wcag_aa_compliant': bool(summary['aa']),
+                'wcag_aa_large_compliant': bool(summary['aa_large']),
+                'wcag_aaa_compliant': bool(summary['aaa']),
+                'recommendation': 'Pass' if summary['aa'] else 'Increase contrast'
             }
+            if result['failing'] and result['failing'][0].get('suggestion'):
+                compliance['suggested_foreground'] = result['failing'][0]['suggestion']['color']
+            return compliance
         except Exception as e:
             return {
                 'error': str(e)
             }
     
-    def extract_key_points(self, text, num_points=5):
-        """Extract key points from text for summary"""
+    def extract_key_points(self, text, num_points=5, analysis=None, idf=None):
+        """
+        Extract key points from text for summary
+        
+        Sentences are ranked by TF-IDF similarity to the whole text (see
+        services.key_points); idf, a LibraryIDF, weights terms by the user's
+        library instead of this text alone.
+        """
         try:
-            if not self.nlp:
-                # Simple fallback
-                sentences = nltk.sent_tokenize(text)
-                return sentences[:num_points]
-            
-            doc = self.nlp(text)
-            
-            # Extract sentences with named entities or important verbs
-            important_sentences = []
-            for sent in doc.sents:
-                score = 0
-                if sent.ents:
-                    score += len(sent.ents)
-                for token in sent:
-                    if token.pos_ in ['VERB', 'NOUN']:
-                        score += 1
-                important_sentences.append((sent.text, score))
+            analysis = analysis or text_analyzer.analyze(text)
+            sentences = analysis.sentences
             
-            # Sort by score and get top points
-            important_sentences.sort(key=lambda x: x[1], reverse=True)
-            key_points = [sent[0] for sent in important_sentences[:num_points]]
+            ranked = key_point_extractor.extract(
+                sentences,
+                num_points,
+                word_counts=analysis.sentence_word_counts,
+                idf=idf
+            )
+            key_points = [' '.join(sentences[index].split()) for index, _ in ranked]
             
             return {
                 'key_points': key_points,
+                'positions': [analysis.sentence_spans[index] for index, _ in ranked],
+                'scores': [score for _, score in ranked],
+                'idf': 'library' if idf is not None else 'document',
                 'original_length': len(text),
                 'summary_length': sum(len(p) for p in key_points)
             }
@@ -281,21 +227,22 @@ class AccessibilityService:
                 'error': str(e)
             }
     
-    def describe_structure(self, text):
-        """Analyze and describe document structure for screen readers"""
+    def describe_structure(self, text, analysis=None):
+        """
+        Analyze and describe document structure for screen readers
+        
+        The outline (headings with section offsets, lists, code blocks,
+        paragraphs) comes from analysis if given, else from a single scan.
+        """
         try:
-            # Count headings (assuming markdown-style)
-            headings = re.findall(r'^#{1,6}\s+(.+)$', text, re.MULTILINE)
-            
-            # Count lists
-            bullet_lists = len(re.findall(r'^[\*\-\+]\s+', text, re.MULTILINE))
-            numbered_lists = len(re.findall(r'^\d+\.\s+', text, re.MULTILINE))
-            
-            # Count paragraphs
-            paragraphs = len([p for p in text.split('\n\n') if p.strip()])
+            outline = analysis.outline if analysis else DocumentOutline.scan(text)
             
-            # Detect code blocks
-            code_blocks = len(re.findall(r'```.*?```', text, re.DOTALL))
+            # Markdown-style headings, list items, paragraphs and fenced code
+            headings = [heading['title'] for heading in outline.headings]
+            bullet_lists = outline.bullet_items
+            numbered_lists = outline.numbered_items
+            paragraphs = len(outline.paragraphs)
+            code_blocks = len(outline.code_blocks)
             
             return {
                 'structure': {
@@ -306,6 +253,7 @@ class AccessibilityService:
                     'numbered_lists': numbered_lists,
                     'code_blocks': code_blocks
                 },
+                'outline': outline.to_dict(),
                 'screen_reader_description': self._generate_structure_description(
                     headings, paragraphs, bullet_lists, numbered_lists, code_blocks
                 )
@@ -0,0 +1,146 @@
+"""
+ALT Text Remediation Service
+Describe images that are missing ALT text on imported web pages
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import wait
+from urllib.parse import urljoin, urlsplit
+
+from config import Config
+from services.http_client import http_client
+from services.image_accessibility_service import image_accessibility_service
+from services.worker_pools import get_thread_pool
+
+
+class RemediationSession:
+    """
+    ALT text generation for one import (a page, URL list or crawl)
+    
+    Images are downloaded on the 'alt-text-fetch' pool with a byte cap and
+    described on the bounded 'alt-text-describe' pool. Work is shared by
+    image URL and then by content hash, so a logo that appears on every
+    page, or under several URLs, is downloaded once per URL and analyzed
+    once. Sessions are thread-safe; crawler threads share one.
+    """
+    
+    def __init__(self):
+        self._by_url = {}  # absolute image URL -> Future of description
+        self._by_hash = {}  # SHA-256 of image bytes -> Future of description
+        self._lock = threading.Lock()
+        self.stats = {'flagged': 0, 'described': 0, 'failed': 0, 'skipped': 0}
+    
+    def remediate(self, page_url, images):
+        """
+        Attach 'generated_alt' to every image entry without ALT text
+        
+        Entries are the 'images' dicts from URLProcessor. Failures are
+        recorded on the entry as 'alt_error'. Returns a summary dict.
+        """
+        started = time.perf_counter()
+        flagged = [image for image in images if not image.get('has_alt')][:Config.ALT_TEXT_MAX_IMAGES]
+        
+        pending = []
+        for image in flagged:
+            image_url = urljoin(page_url, image.get('src', ''))
+            if urlsplit(image_url).scheme not in ('http', 'https'):
+                image['alt_error'] = 'Only http(s) images are analyzed'
+                self._count('skipped')
+                continue
+            pending.append((image, self._describe_url(image_url)))
+        
+        wait([future for _, future in pending])
+        
+        described = failed = 0
+        for image, future in pending:
+            try:
+                result = future.result()
+                image['generated_alt'] = result['alt_text']
+                image['alt_confidence'] = result.get('confidence')
+                described += 1
+            except Exception as e:
+                image['alt_error'] = str(e)
+                failed += 1
+        
+        self._count('flagged', len(flagged))
+        self._count('described', described)
+        self._count('failed', failed)
+        return {
+            'flagged': len(flagged),
+            'described': described,
+            'failed': failed,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+    
+    def summary(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'unique_urls': len(self._by_url),
+                'unique_images': len(self._by_hash)
+            }
+    
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+    
+    def _describe_url(self, image_url):
+        with self._lock:
+            future = self._by_url.get(image_url)
+            if future is None:
+                pool = get_thread_pool('alt-text-fetch', Config.ALT_TEXT_FETCH_WORKERS)
+                future = pool.submit(self._download_and_describe, image_url)
+                self._by_url[image_url] = future
+            return future
+    
+    def _download_and_describe(self, image_url):
+        response = http_client.fetch(image_url, max_bytes=Config.ALT_TEXT_MAX_IMAGE_BYTES)
+        if not response.ok:
+            raise ValueError(f"HTTP {response.status_code} fetching image")
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and not content_type.startswith('image/'):
+            raise ValueError(f"Not an image ({content_type})")
+        
+        data = response.content
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            future = self._by_hash.get(digest)
+            if future is None:
+                pool = get_thread_pool('alt-text-describe', Config.ALT_TEXT_WORKERS)
+                future = pool.submit(_describe_image_bytes, data, os.path.splitext(urlsplit(image_url).path)[1])
+                self._by_hash[digest] = future
+        # Waits on the describe pool only, never on this fetch pool, so it cannot deadlock
+        return future.result()
+
+
+def _describe_image_bytes(data, suffix):
+    """Run generate_alt_text on downloaded bytes (it takes a file path)"""
+    fd, path = tempfile.mkstemp(dir=Config.TEMP_DIR, suffix=suffix or '.img')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        return image_accessibility_service.generate_alt_text(path)
+    finally:
+        os.remove(path)
+
+
+class AltTextRemediator:
+    """Entry point: one RemediationSession per import"""
+    
+    @staticmethod
+    def session():
+        return RemediationSession()
+    
+    def remediate_page(self, result):
+        """Remediate a single URLProcessor result in place"""
+        session = self.session()
+        result['alt_text_remediation'] = session.remediate(result.get('url', ''), result.get('images', []))
+        return result
+
+
+# Singleton instance
+alt_text_remediator = AltTextRemediator()
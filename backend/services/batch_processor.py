@@ -0,0 +1,124 @@
+"""
+Batch Processing Service
+Extract many documents concurrently, reporting each as it finishes
+"""
+
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+from services.document_processor import DocumentProcessor
+from services.worker_pools import get_process_pool, discard_pool, iter_completed
+
+
+def _init_batch_worker():
+    """The batch already runs one file per worker; don't nest page/slide/OCR pools"""
+    Config.PDF_PARALLEL_WORKERS = 1
+    Config.PPTX_PARALLEL_WORKERS = 1
+    Config.OCR_WORKERS = 0
+
+
+def _process_file_task(file_path, file_type, pdf_engine):
+    """Extract one file in a worker process, returning (result, seconds)"""
+    started = time.perf_counter()
+    try:
+        result = DocumentProcessor.process_document(file_path, file_type, pdf_engine=pdf_engine)
+    except Exception as e:
+        # Re-raise as a plain ValueError so the parent can always unpickle it
+        raise ValueError(str(e)) from None
+    return result, round(time.perf_counter() - started, 3)
+
+
+class BatchProcessor:
+    """
+    Fan a batch of documents out over a shared process pool
+    
+    The pool (BATCH_WORKERS) bounds total concurrency across requests;
+    max_concurrency bounds how many files a single request has in flight.
+    Results are yielded as each file finishes, so a batch takes roughly
+    as long as its slowest file rather than the sum of all of them.
+    """
+    
+    def _pool(self):
+        return get_process_pool('batch', Config.BATCH_WORKERS, initializer=_init_batch_worker)
+    
+    @staticmethod
+    def concurrency(max_concurrency=None):
+        """Per-request concurrency: requested value clamped to 1..BATCH_WORKERS"""
+        try:
+            requested = int(max_concurrency or Config.BATCH_MAX_CONCURRENCY)
+        except (TypeError, ValueError):
+            requested = Config.BATCH_MAX_CONCURRENCY
+        return max(1, min(requested, Config.BATCH_WORKERS))
+    
+    def iter_results(self, files, max_concurrency=None, pdf_engine=None):
+        """
+        Process files and yield one 'file' event per file, in completion order
+        
+        files is a list of {"file_path", "file_type"} dicts. Each event has
+        the file's index in that list, 'success', and either 'content' or
+        'error'. Invalid entries are reported without being submitted.
+        """
+        valid = []
+        for index, file_info in enumerate(files):
+            if not file_info.get('file_path') or not file_info.get('file_type'):
+                yield {
+                    'event': 'file',
+                    'index': index,
+                    'file': file_info,
+                    'success': False,
+                    'error': 'Missing file_path or file_type'
+                }
+            else:
+                valid.append((index, file_info))
+        
+        if not valid:
+            return
+        
+        completed = iter_completed(
+            self._pool(),
+            _process_file_task,
+            [(info['file_path'], info['file_type'], pdf_engine) for _, info in valid],
+            self.concurrency(max_concurrency)
+        )
+        
+        for position, future in completed:
+            index, file_info = valid[position]
+            event = {
+                'event': 'file',
+                'index': index,
+                'file_path': file_info['file_path'],
+                'file_type': file_info['file_type']
+            }
+            try:
+                content, seconds = future.result()
+                event.update({'success': True, 'content': content, 'seconds': seconds})
+            except BrokenProcessPool as e:
+                discard_pool('batch')
+                event.update({'success': False, 'error': f"Worker crashed: {e}"})
+            except Exception as e:
+                event.update({'success': False, 'error': str(e)})
+            yield event
+    
+    def stream(self, files, max_concurrency=None, pdf_engine=None):
+        """iter_results followed by a 'complete' event with totals"""
+        started = time.perf_counter()
+        processed = errors = 0
+        
+        for event in self.iter_results(files, max_concurrency, pdf_engine):
+            if event['success']:
+                processed += 1
+            else:
+                errors += 1
+            yield event
+        
+        yield {
+            'event': 'complete',
+            'processed_count': processed,
+            'error_count': errors,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+
+# Singleton instance
+batch_processor = BatchProcessor()
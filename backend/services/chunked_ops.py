@@ -0,0 +1,223 @@
+"""
+Chunked Operations Service
+Accessibility operations by name, run whole or as a map-reduce over
+paragraph-aligned chunks of long texts on a process pool
+"""
+
+from bisect import bisect_right
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+from services.accessibility_service import accessibility_service
+from services.key_points import key_point_extractor
+from services.math_renderer import scan_equations
+from services.outline import DocumentOutline
+from services.text_analysis import (
+    text_analyzer, flesch_kincaid_grade, flesch_reading_ease, WORD_PATTERN
+)
+from services.worker_pools import get_process_pool, discard_pool, iter_completed
+
+# Operations that read an AnalyzedDocument of their text
+ANALYZED_ADAPTATIONS = {'simplify', 'key_points', 'structure'}
+
+
+def _init_adaptation_worker():
+    """Each adaptation already has its own worker; render equations in-process"""
+    Config.MATH_RENDER_WORKERS = 0
+
+
+def adaptation_pool():
+    """Process pool shared by whole-text adaptations and chunks (ADAPTATION_WORKERS)"""
+    return get_process_pool('adaptations', Config.ADAPTATION_WORKERS, initializer=_init_adaptation_worker)
+
+
+def run_adaptation(name, text, options, analysis=None):
+    """Apply one CPU-bound adaptation to text"""
+    if name == 'simplify':
+        return accessibility_service.simplify_text(text, options.get('simplify_grade', 8), analysis=analysis)
+    if name == 'dyslexia':
+        return accessibility_service.apply_dyslexia_friendly_format(text)
+    if name == 'key_points':
+        return accessibility_service.extract_key_points(
+            text, options.get('num_points', 5), analysis=analysis, idf=options.get('idf')
+        )
+    if name == 'structure':
+        return accessibility_service.describe_structure(text, analysis=analysis)
+    if name == 'math':
+        return accessibility_service.process_math_equations(text, render=options.get('render', True))
+    raise ValueError(f'Unknown adaptation: {name}')
+
+
+def split_text(text, chunk_size=None):
+    """
+    [(start, end)] spans covering text, each at least chunk_size long
+    (OPERATION_CHUNK_SIZE) except the last
+    
+    Cuts fall only at the start of a paragraph, never inside a code block,
+    a list or an equation, so every piece outlines and reads as it does in
+    the whole text. A paragraph longer than chunk_size stays whole.
+    """
+    chunk_size = chunk_size or Config.OPERATION_CHUNK_SIZE
+    outline = DocumentOutline.scan(text)
+    protected = sorted(
+        [(block['start'], block['end']) for block in outline.code_blocks + outline.lists] +
+        [position for _, position, _ in scan_equations(text)]
+    )
+    starts = [start for start, _ in protected]
+    # Furthest end among the spans starting at or before each one
+    reach = []
+    for _, end in protected:
+        reach.append(max(end, reach[-1]) if reach else end)
+    
+    spans = []
+    start = 0
+    for cut, _ in outline.paragraphs[1:]:
+        if cut - start < chunk_size:
+            continue
+        covering = bisect_right(starts, cut - 1) - 1
+        if covering >= 0 and reach[covering] > cut:
+            continue
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, len(text)))
+    return spans
+
+
+def chunk_task(name, chunk, options):
+    """Run one adaptation on one chunk in a worker process; returns (result, readability counts)"""
+    try:
+        analysis = text_analyzer.analyze(chunk) if name in ANALYZED_ADAPTATIONS else None
+        result = run_adaptation(name, chunk, options, analysis)
+        return result, analysis.counts() if analysis else None
+    except Exception as e:
+        # Re-raise as a plain ValueError so the parent can always unpickle it
+        raise ValueError(str(e)) from None
+
+
+def _sum_counts(counts):
+    return {key: sum(part[key] for part in counts) for key in ('words', 'sentences', 'syllables')}
+
+
+def _readability(counts):
+    """Readability metrics of a whole text from its chunks' summed counts"""
+    return {
+        'grade_level': round(flesch_kincaid_grade(counts['words'], counts['sentences'], counts['syllables']), 1),
+        'ease_score': round(flesch_reading_ease(counts['words'], counts['sentences'], counts['syllables']), 1),
+        **counts
+    }
+
+
+def _merge_simplify(text, spans, results, options):
+    original = _sum_counts([result['counts']['original'] for result in results])
+    simplified = _sum_counts([result['counts']['simplified'] for result in results])
+    original_grade = flesch_kincaid_grade(original['words'], original['sentences'], original['syllables'])
+    simplified_grade = flesch_kincaid_grade(simplified['words'], simplified['sentences'], simplified['syllables'])
+    
+    return {
+        'original_text': text,
+        'simplified_text': ' '.join(result['simplified_text'].strip() for result in results),
+        'metrics': {
+            'original_grade_level': round(original_grade, 1),
+            'simplified_grade_level': round(simplified_grade, 1),
+            'original_ease_score': _readability(original)['ease_score'],
+            'simplified_ease_score': _readability(simplified)['ease_score']
+        },
+        'improvement': round(original_grade - simplified_grade, 1),
+        'counts': {'original': original, 'simplified': simplified}
+    }
+
+
+def _merge_key_points(text, spans, results, options):
+    # Each chunk nominates its own key points; the nominees are then ranked
+    # against each other as if they were the whole text
+    nominees = []
+    for (start, _), result in zip(spans, results):
+        for point, (point_start, point_end) in zip(result['key_points'], result['positions']):
+            nominees.append((point, [start + point_start, start + point_end]))
+    
+    ranked = key_point_extractor.extract(
+        [point for point, _ in nominees],
+        options.get('num_points', 5),
+        word_counts=[len(WORD_PATTERN.findall(point)) for point, _ in nominees],
+        idf=options.get('idf')
+    )
+    key_points = [nominees[index][0] for index, _ in ranked]
+    
+    return {
+        'key_points': key_points,
+        'positions': [nominees[index][1] for index, _ in ranked],
+        'scores': [score for _, score in ranked],
+        'idf': results[0]['idf'],
+        'original_length': len(text),
+        'summary_length': sum(len(p) for p in key_points)
+    }
+
+
+# Operations that can run chunked, with how to merge their chunk results.
+# An operation opts in by adding a merge(text, spans, results, options)
+# here; results are the operation's per-chunk results, in text order.
+# Dyslexia formatting and structure are single line scans, cheaper than
+# shipping the chunks to workers, and math_renderer already spreads
+# equations over its own pool and shares one cache of renderings.
+CHUNK_MERGES = {
+    'simplify': _merge_simplify,
+    'key_points': _merge_key_points
+}
+
+
+def merge_chunks(name, text, spans, chunk_results, options):
+    """
+    One result for text from the (result, counts) pairs of its chunks
+    
+    Adds 'chunks' and, for analyzed operations, whole-text 'readability'
+    metrics. A chunk that failed makes the merged result that error.
+    """
+    results = [result for result, _ in chunk_results]
+    for index, result in enumerate(results):
+        if 'error' in result:
+            return {'error': f"Chunk {index + 1} of {len(results)}: {result['error']}"}
+    
+    merged = CHUNK_MERGES[name](text, spans, results, options)
+    merged['chunks'] = len(spans)
+    counts = [counts for _, counts in chunk_results if counts is not None]
+    if counts:
+        merged['readability'] = _readability(_sum_counts(counts))
+    return merged
+
+
+def should_chunk(name, text):
+    """Whether text is long enough (OPERATION_CHUNKING_THRESHOLD) to run name chunked"""
+    return name in CHUNK_MERGES and len(text) >= Config.OPERATION_CHUNKING_THRESHOLD
+
+
+class ChunkedOperations:
+    """
+    Run an adaptation on a text whole or, for long texts, chunked
+    
+    Chunks (see split_text) go to the shared adaptations pool at most
+    twice ADAPTATION_WORKERS at a time, so a long document keeps every
+    worker busy without flooding the pool, and are merged with offsets
+    relative to the whole text.
+    """
+    
+    def run(self, name, text, options=None):
+        """Result of adaptation name on text, as run_adaptation returns it"""
+        options = options or {}
+        spans = split_text(text) if should_chunk(name, text) else [(0, len(text))]
+        if len(spans) == 1:
+            return run_adaptation(name, text, options)
+        
+        chunk_results = [None] * len(spans)
+        tasks = ((name, text[start:end], options) for start, end in spans)
+        try:
+            for index, future in iter_completed(adaptation_pool(), chunk_task, tasks, Config.ADAPTATION_WORKERS * 2):
+                chunk_results[index] = future.result()
+        except BrokenProcessPool:
+            discard_pool('adaptations')
+            raise
+        
+        return merge_chunks(name, text, spans, chunk_results, options)
+
+
+# Singleton instance
+chunked_operations = ChunkedOperations()
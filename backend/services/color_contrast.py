@@ -0,0 +1,312 @@
+"""
+Color Contrast Service
+Vectorized WCAG contrast checking for whole palettes and nearest passing
+color suggestions in CIELAB
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Minimum contrast ratio for each WCAG conformance level
+LEVELS = {
+    'AA': 4.5,
+    'AA_large': 3.0,
+    'AAA': 7.0,
+    'AAA_large': 4.5
+}
+
+HEX_PATTERN = re.compile(r'#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})')
+
+# Linear sRGB to CIE XYZ (D65). The Y row uses the WCAG luminance
+# coefficients, so L* thresholds agree exactly with contrast ratios.
+RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126, 0.7152, 0.0722],
+    [0.0193339, 0.1191920, 0.9503041]
+])
+XYZ_TO_RGB = np.linalg.inv(RGB_TO_XYZ)
+WHITE_POINT = np.array([0.95047, 1.0, 1.08883])
+
+LAB_EPSILON = (6 / 29) ** 3
+
+# Gamut table resolution: L* rows from 0 to 100 and hue columns around the circle
+GAMUT_LIGHTNESS_STEPS = 201
+GAMUT_HUES = 180
+
+# Lightness planes searched past the passing threshold, in L*; colors far
+# from gray (saturated yellows, blues) may only fit a little further out
+PLANE_OFFSETS = (0.0, 2.5, 5.0, 10.0, 20.0)
+
+# Extra L* applied past the exact threshold when 8-bit rounding falls short
+LIGHTNESS_MARGINS = (0.0, 0.25, 0.5, 1.0, 2.0)
+
+
+def parse_colors(colors, name='color'):
+    """(N, 3) uint8 array from '#RGB' or '#RRGGBB' strings; ValueError names the first bad one"""
+    rgb = np.empty((len(colors), 3), dtype=np.uint8)
+    for i, color in enumerate(colors):
+        match = HEX_PATTERN.fullmatch(color.strip()) if isinstance(color, str) else None
+        if not match:
+            raise ValueError(f'Invalid {name} at index {i}: {color!r}')
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = ''.join(digit * 2 for digit in digits)
+        rgb[i] = tuple(bytes.fromhex(digits))
+    return rgb
+
+
+def to_hex(rgb):
+    """'#RRGGBB' strings for an (N, 3) array of 0-255 channels"""
+    return ['#%02X%02X%02X' % tuple(color) for color in np.asarray(rgb, dtype=np.uint8).tolist()]
+
+
+def _linearize(rgb):
+    channels = np.asarray(rgb, dtype=np.float64) / 255.0
+    return np.where(channels <= 0.03928, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4)
+
+
+def _delinearize(linear):
+    # Sign-preserving, so out-of-gamut values stay outside 0-1
+    magnitude = np.abs(linear)
+    return np.sign(linear) * np.where(magnitude <= 0.0031308, magnitude * 12.92, 1.055 * magnitude ** (1 / 2.4) - 0.055)
+
+
+def relative_luminance(rgb):
+    """WCAG relative luminance of each row of an (..., 3) array of 0-255 channels"""
+    return _linearize(rgb) @ RGB_TO_XYZ[1]
+
+
+def contrast_ratio(luminance_a, luminance_b):
+    """Element-wise contrast ratios of two luminance arrays"""
+    return (np.maximum(luminance_a, luminance_b) + 0.05) / (np.minimum(luminance_a, luminance_b) + 0.05)
+
+
+def contrast_matrix(foreground_luminance, background_luminance):
+    """(F, B) contrast ratios of every foreground against every background"""
+    return contrast_ratio(foreground_luminance[:, None], background_luminance[None, :])
+
+
+def _lab_f(t):
+    return np.where(t > LAB_EPSILON, np.cbrt(t), t / (3 * (6 / 29) ** 2) + 4 / 29)
+
+
+def _lab_f_inverse(f):
+    return np.where(f > 6 / 29, f ** 3, 3 * (6 / 29) ** 2 * (f - 4 / 29))
+
+
+def _lightness(luminance):
+    """CIE L* of a relative luminance"""
+    return 116 * _lab_f(luminance) - 16
+
+
+def rgb_to_lab(rgb):
+    """CIELAB (D65) of an (..., 3) array of 0-255 channels"""
+    xyz = _linearize(rgb) @ RGB_TO_XYZ.T / WHITE_POINT
+    fx, fy, fz = np.moveaxis(_lab_f(xyz), -1, 0)
+    return np.stack([116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)], axis=-1)
+
+
+def lab_to_rgb(lab):
+    """sRGB channels in 0-1 for an (..., 3) CIELAB array, unclipped, so values outside 0-1 are out of gamut"""
+    lightness, a, b = np.moveaxis(np.asarray(lab, dtype=np.float64), -1, 0)
+    fy = (lightness + 16) / 116
+    f = np.stack([fy + a / 500, fy, fy - b / 200], axis=-1)
+    xyz = _lab_f_inverse(f) * WHITE_POINT
+    return _delinearize(xyz @ XYZ_TO_RGB.T)
+
+
+@lru_cache(maxsize=1)
+def _gamut_table():
+    """(GAMUT_LIGHTNESS_STEPS, GAMUT_HUES) largest in-gamut CIELAB chroma, by bisection"""
+    lightness = np.linspace(0, 100, GAMUT_LIGHTNESS_STEPS)[:, None]
+    hues = np.linspace(0, 2 * np.pi, GAMUT_HUES, endpoint=False)
+    low = np.zeros((GAMUT_LIGHTNESS_STEPS, GAMUT_HUES))
+    high = np.full_like(low, 150.0)
+    for _ in range(16):
+        middle = (low + high) / 2
+        lab = np.stack([np.broadcast_to(lightness, middle.shape), middle * np.cos(hues), middle * np.sin(hues)], axis=-1)
+        rgb = lab_to_rgb(lab)
+        fits = np.all((rgb >= 0) & (rgb <= 1), axis=-1)
+        low = np.where(fits, middle, low)
+        high = np.where(fits, high, middle)
+    return low
+
+
+def _max_chroma(lightness):
+    """(K, GAMUT_HUES) in-gamut chroma limits at each L*, from the more restrictive neighbouring table row"""
+    table = _gamut_table()
+    position = np.clip(lightness, 0, 100) / 100 * (GAMUT_LIGHTNESS_STEPS - 1)
+    below = np.floor(position).astype(int)
+    above = np.minimum(below + 1, GAMUT_LIGHTNESS_STEPS - 1)
+    return np.minimum(table[below], table[above])
+
+
+def _nearest_on_planes(lab, threshold, sign):
+    """
+    Closest in-gamut CIELAB point to each row of lab with L* at or past
+    threshold (beyond it in the direction of sign), searched over the
+    PLANE_OFFSETS planes
+    
+    Each plane offers the point with the color's own hue (chroma capped to
+    the gamut) and, when that cap applies, the gamut boundary at every hue.
+    An uncapped point is the exact nearest, so later planes are only
+    searched for rows they could still improve.
+    """
+    hues = np.linspace(0, 2 * np.pi, GAMUT_HUES, endpoint=False)
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    hue_column = np.rint(np.arctan2(lab[:, 2], lab[:, 1]) / (2 * np.pi) * GAMUT_HUES).astype(int) % GAMUT_HUES
+    best = np.zeros_like(lab)
+    best_distance = np.full(len(lab), np.inf)
+    active = np.arange(len(lab))
+    
+    for offset in PLANE_OFFSETS:
+        lightness = np.clip(threshold[active] + sign * offset, 0, 100)
+        lightness_distance = (lightness - lab[active, 0]) ** 2
+        improvable = lightness_distance < best_distance[active]
+        active, lightness, lightness_distance = active[improvable], lightness[improvable], lightness_distance[improvable]
+        if not len(active):
+            break
+        
+        limits = _max_chroma(lightness)
+        rows = np.arange(len(active))
+        
+        # Own hue: unchanged a*, b* when they fit, else scaled toward gray
+        neighbours = limits[rows[:, None], (hue_column[active, None] + (-1, 0, 1)) % GAMUT_HUES].min(axis=1)
+        scale = np.minimum(1.0, neighbours / np.maximum(chroma[active], 1e-9))
+        ab = lab[active, 1:] * scale[:, None]
+        ab_distance = np.sum((ab - lab[active, 1:]) ** 2, axis=-1)
+        
+        # Gamut boundary at every hue, for rows whose own hue was capped
+        capped = np.flatnonzero(scale < 1)
+        if len(capped):
+            boundary_a = limits[capped] * np.cos(hues)
+            boundary_b = limits[capped] * np.sin(hues)
+            boundary_distance = (boundary_a - lab[active[capped], 1:2]) ** 2 + (boundary_b - lab[active[capped], 2:3]) ** 2
+            nearest = boundary_distance.argmin(axis=1)
+            nearest_distance = boundary_distance[np.arange(len(capped)), nearest]
+            closer = nearest_distance < ab_distance[capped]
+            replace = capped[closer]
+            ab[replace, 0] = boundary_a[closer, nearest[closer]]
+            ab[replace, 1] = boundary_b[closer, nearest[closer]]
+            ab_distance[replace] = nearest_distance[closer]
+        
+        distance = lightness_distance + ab_distance
+        closer = distance < best_distance[active]
+        best[active[closer]] = np.column_stack([lightness, ab])[closer]
+        best_distance[active[closer]] = distance[closer]
+    
+    return best
+
+
+def nearest_passing(colors, references, min_ratio):
+    """
+    Closest color to each of colors that reaches min_ratio against the
+    matching reference color
+    
+    colors and references are (K, 3) arrays of 0-255 channels. Contrast
+    depends only on luminance, so every passing color is lighter or darker
+    than a threshold L*. Both sides are searched for the nearest (CIE76)
+    in-gamut color, which is rounded to 8 bits and checked; the closer
+    passing side wins.
+    
+    Returns (rgb (K, 3) uint8, found (K,) bool, delta_e (K,)); found is
+    False where no sRGB color reaches min_ratio.
+    """
+    lab = rgb_to_lab(colors)
+    reference_luminance = relative_luminance(references)
+    best = np.zeros((len(lab), 3), dtype=np.uint8)
+    best_distance = np.full(len(lab), np.inf)
+    
+    lighter = min_ratio * (reference_luminance + 0.05) - 0.05
+    darker = (reference_luminance + 0.05) / min_ratio - 0.05
+    for target, sign in ((lighter, 1.0), (darker, -1.0)):
+        pending = np.flatnonzero((target >= 0) & (target <= 1))
+        threshold = _lightness(np.clip(target, 0, 1))
+        
+        for margin in LIGHTNESS_MARGINS:
+            if not len(pending):
+                break
+            
+            candidates = _nearest_on_planes(lab[pending], threshold[pending] + sign * margin, sign)
+            chosen = np.rint(np.clip(lab_to_rgb(candidates), 0, 1) * 255).astype(np.uint8)
+            passed = contrast_ratio(relative_luminance(chosen), reference_luminance[pending]) >= min_ratio
+            
+            found = pending[passed]
+            distance = np.linalg.norm(rgb_to_lab(chosen[passed]) - lab[found], axis=-1)
+            closer = distance < best_distance[found]
+            best[found[closer]] = chosen[passed][closer]
+            best_distance[found[closer]] = distance[closer]
+            pending = pending[~passed]
+    
+    found = np.isfinite(best_distance)
+    return best, found, np.where(found, best_distance, 0.0)
+
+
+class ColorContrastService:
+    """WCAG contrast of color palettes, with suggested fixes for failing pairs"""
+    
+    def check(self, foregrounds, backgrounds=None, level='AA', suggest=True, adjust='foreground'):
+        """
+        Contrast of every foreground against every background
+        
+        backgrounds defaults to foregrounds (a palette against itself).
+        level picks the ratio a pair must reach (see LEVELS). With suggest,
+        each failing pair gets the nearest passing replacement for its
+        foreground (or its background, when adjust is 'background').
+        Raises ValueError for unknown levels or malformed colors.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+        if adjust not in ('foreground', 'background'):
+            raise ValueError("adjust must be 'foreground' or 'background'")
+        if backgrounds is None:
+            backgrounds = foregrounds
+        
+        foreground_rgb = parse_colors(foregrounds, 'foreground')
+        background_rgb = parse_colors(backgrounds, 'background')
+        ratios = contrast_matrix(relative_luminance(foreground_rgb), relative_luminance(background_rgb))
+        min_ratio = LEVELS[level]
+        passing = ratios >= min_ratio
+        
+        failing_fg, failing_bg = np.nonzero(~passing)
+        failing = {
+            'foreground_index': failing_fg.tolist(),
+            'background_index': failing_bg.tolist(),
+            'contrast_ratio': np.round(ratios[failing_fg, failing_bg], 2).tolist()
+        }
+        
+        if suggest and len(failing_fg):
+            if adjust == 'foreground':
+                colors, references = foreground_rgb[failing_fg], background_rgb[failing_bg]
+            else:
+                colors, references = background_rgb[failing_bg], foreground_rgb[failing_fg]
+            rgb, found, delta_e = nearest_passing(colors, references, min_ratio)
+            suggested_ratio = contrast_ratio(relative_luminance(rgb), relative_luminance(references))
+            failing['suggestion'] = [
+                {'color': color, 'contrast_ratio': round(ratio, 2), 'delta_e': round(distance, 2)} if ok else None
+                for color, ratio, distance, ok in zip(
+                    to_hex(rgb), suggested_ratio.tolist(), delta_e.tolist(), found.tolist()
+                )
+            ]
+        
+        return {
+            'foregrounds': to_hex(foreground_rgb),
+            'backgrounds': to_hex(background_rgb),
+            'level': level,
+            'min_ratio': min_ratio,
+            'adjust': adjust,
+            'contrast_ratios': np.round(ratios, 2).tolist(),
+            'failing': [dict(zip(failing, values)) for values in zip(*failing.values())],
+            'summary': {
+                'pairs': int(ratios.size),
+                'passing': int(passing.sum()),
+                'failing': int(ratios.size - passing.sum()),
+                **{name.lower(): int((ratios >= ratio).sum()) for name, ratio in LEVELS.items()}
+            }
+        }
+
+
+# Singleton instance
+color_contrast_service = ColorContrastService()
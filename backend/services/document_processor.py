@@ -3,114 +3,184 @@ Document Processing Service
 Handles PDF, DOCX, and other document parsing
 """
 
-import PyPDF2
-import docx2txt
-import pdfplumber
-from docx import Document
 import os
+import math
 import tempfile
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image
+from config import Config
+from services.worker_pools import get_process_pool, discard_pool
+from services.progress import report_progress
+from services.extraction_cache import extraction_cache
+from services.ocr_service import ocr_service
+from services.docx_extractor import extract_docx
+from services.pptx_extractor import extract_pptx, iter_slides
+from services.txt_extractor import TextFileReader, extract_txt
+from services.pdf_engines import PDFPageExtractor, PDF_ENGINES, count_pdf_pages
+
+# Bump whenever extraction output changes so cached results are invalidated
+EXTRACTOR_VERSION = 5
+
+
+def _extract_pdf_page_range(file_path, start, stop, engine):
+    """Process pool task: extract pages [start, stop) of a PDF"""
+    return list(DocumentProcessor.iter_pdf_pages(file_path, start, stop, engine))
+
+
+def _resolve_pdf_engine(engine):
+    """Validate a requested PDF engine, defaulting to Config.PDF_ENGINE"""
+    engine = engine or Config.PDF_ENGINE
+    if engine not in PDF_ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}. Use one of {', '.join(PDF_ENGINES)}")
+    return engine
 
-# pytesseract is optional for OCR
-try:
-    import pytesseract
-    PYTESSERACT_AVAILABLE = True
-except ImportError:
-    PYTESSERACT_AVAILABLE = False
-    print("Warning: pytesseract not available. OCR features will be disabled.")
 
 class DocumentProcessor:
     
     @staticmethod
-    def extract_text_from_pdf(file_path):
-        """Extract text from PDF using PyPDF2 and pdfplumber"""
-        text = ""
-        images = []
+    def iter_pdf_pages(file_path, start=0, stop=None, engine=None):
+        """
+        Yield extracted PDF content one page at a time
+        - Each page's parsed layout is released before the next one is read,
+          so memory stays flat regardless of page count
+        - engine is 'fast' (pypdf), 'layout' (pdfplumber) or 'auto'
+          (chosen per page); a page that fails falls back to the other
+          engine on its own
+        - start/stop select a zero-based page range (stop is exclusive)
+        """
+        with PDFPageExtractor(file_path, _resolve_pdf_engine(engine)) as extractor:
+            end = extractor.page_count if stop is None else min(stop, extractor.page_count)
+            for index in range(start, end):
+                yield extractor.extract(index)
+    
+    @staticmethod
+    def iter_pdf_pages_parallel(file_path, page_count, engine=None):
+        """
+        Extract page ranges on the shared process pool, yielding pages in order
         
+        pdfplumber's text extraction is pure Python and CPU-bound, so large
+        documents are sharded into contiguous ranges (several per worker for
+        load balancing) and merged back in page order.
+        """
+        engine = _resolve_pdf_engine(engine)
+        workers = Config.PDF_PARALLEL_WORKERS
+        pool = get_process_pool('pdf-extract', workers)
+        shard_size = max(1, math.ceil(page_count / (workers * 4)))
+        
+        futures = [
+            pool.submit(_extract_pdf_page_range, file_path, start, min(start + shard_size, page_count), engine)
+            for start in range(0, page_count, shard_size)
+        ]
         try:
-            # Try pdfplumber first (better for complex PDFs)
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-                    
-                    # Extract images
-                    if hasattr(page, 'images'):
-                        for img in page.images:
-                            images.append({
-                                'page': page_num + 1,
-                                'bbox': img.get('bbox', None)
-                            })
-        except Exception as e:
-            # Fallback to PyPDF2
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    @staticmethod
+    def _should_extract_in_parallel(page_count):
+        """Only large documents are worth the inter-process overhead"""
+        return (
+            Config.PDF_PARALLEL_WORKERS > 1
+            and page_count >= max(1, Config.PDF_PARALLEL_MIN_PAGES)
+        )
+    
+    @staticmethod
+    def extract_text_from_pdf(file_path, engine=None, progress=None):
+        """Extract text from PDF using pypdf and/or pdfplumber (see iter_pdf_pages)"""
+        engine = _resolve_pdf_engine(engine)
+        page_count = count_pdf_pages(file_path)
+        
+        if page_count and DocumentProcessor._should_extract_in_parallel(page_count):
             try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-            except Exception as pdf_error:
-                raise ValueError(f"Error extracting PDF: {str(pdf_error)}")
+                return DocumentProcessor._collect_pdf_pages(ocr_service.fill_missing_text(
+                    DocumentProcessor.iter_pdf_pages_parallel(file_path, page_count, engine), file_path
+                ), progress, page_count)
+            except BrokenProcessPool as e:
+                print(f"⚠️ Parallel PDF extraction failed, falling back to serial: {e}")
+                discard_pool('pdf-extract')
+        
+        return DocumentProcessor._collect_pdf_pages(ocr_service.fill_missing_text(
+            DocumentProcessor.iter_pdf_pages(file_path, engine=engine), file_path
+        ), progress, page_count)
+    
+    @staticmethod
+    def _collect_pdf_pages(pages, progress=None, expected_pages=0):
+        """
+        Merge per-page results into the extract_text_from_pdf shape
+        
+        'pages' lists the engine used for every page and 'engine_stats'
+        aggregates pages, characters and extraction time per engine.
+        """
+        parts = []
+        images = []
+        ocr_pages = []
+        page_summaries = []
+        engine_stats = {}
+        page_count = 0
+        
+        for page in pages:
+            page_count += 1
+            if page['text']:
+                parts.append(f"--- Page {page['page']} ---\n{page['text']}")
+            if page.get('ocr'):
+                ocr_pages.append(page['page'])
+            images.extend(page['images'])
+            
+            engine = page.get('engine', 'unknown')
+            summary = {'page': page['page'], 'engine': engine, 'chars': len(page['text'])}
+            if page.get('error'):
+                summary['error'] = page['error']
+            page_summaries.append(summary)
+            
+            stats = engine_stats.setdefault(engine, {'pages': 0, 'chars': 0, 'seconds': 0.0})
+            stats['pages'] += 1
+            stats['chars'] += len(page['text'])
+            stats['seconds'] += page.get('seconds', 0.0)
+            
+            if expected_pages:
+                report_progress(
+                    progress, 'extract', page_count * 100 / expected_pages,
+                    pages_done=page_count, page_count=expected_pages
+                )
+        
+        for stats in engine_stats.values():
+            stats['seconds'] = round(stats['seconds'], 4)
+            stats['pages_per_second'] = round(stats['pages'] / stats['seconds'], 1) if stats['seconds'] else None
         
         return {
-            'text': text.strip(),
-            'page_count': len(text.split('--- Page')),
+            'text': '\n'.join(parts).strip(),
+            'page_count': page_count,
             'images': images,
-            'has_images': len(images) > 0
+            'has_images': len(images) > 0,
+            'ocr_used': len(ocr_pages) > 0,
+            'ocr_pages': ocr_pages,
+            'pages': page_summaries,
+            'engine_stats': engine_stats
         }
     
     @staticmethod
     def extract_text_from_docx(file_path):
-        """Extract text from DOCX"""
+        """Extract text, tables and images from DOCX in a single pass"""
         try:
-            # Use docx2txt for simple extraction
-            text = docx2txt.extract(file_path)
-            
-            # Use python-docx for more detailed extraction
-            doc = Document(file_path)
-            
-            # Extract images
-            images = []
-            for rel in doc.part.rels.values():
-                if "image" in rel.target_ref:
-                    images.append({
-                        'type': 'embedded',
-                        'target': rel.target_ref
-                    })
-            
-            # Extract tables
-            tables = []
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text for cell in row.cells]
-                    table_data.append(row_data)
-                tables.append(table_data)
-            
-            return {
-                'text': text.strip(),
-                'paragraph_count': len(doc.paragraphs),
-                'tables': tables,
-                'images': images,
-                'has_images': len(images) > 0,
-                'has_tables': len(tables) > 0
-            }
+            return extract_docx(file_path)
         except Exception as e:
             raise ValueError(f"Error extracting DOCX: {str(e)}")
     
+    @staticmethod
+    def extract_text_from_pptx(file_path):
+        """Extract slide text, speaker notes, tables and images from PPTX"""
+        try:
+            return extract_pptx(file_path)
+        except Exception as e:
+            raise ValueError(f"Error extracting PPTX: {str(e)}")
+    
     @staticmethod
     def extract_text_from_txt(file_path):
-        """Extract text from TXT file"""
+        """Extract text from TXT file (any common encoding)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-            
-            return {
-                'text': text.strip(),
-                'line_count': len(text.split('\n')),
-                'word_count': len(text.split())
-            }
+            return extract_txt(file_path)
         except Exception as e:
             raise ValueError(f"Error reading TXT: {str(e)}")
     
@@ -118,41 +188,77 @@ class DocumentProcessor:
     def extract_text_from_image(file_path):
         """Extract text from image using OCR"""
         try:
-            image = Image.open(file_path)
+            with Image.open(file_path) as image:
+                image_size = image.size
+                image_format = image.format
             
-            if not PYTESSERACT_AVAILABLE:
+            if not ocr_service.available:
                 return {
                     'text': '',
-                    'image_size': image.size,
-                    'image_format': image.format,
+                    'image_size': image_size,
+                    'image_format': image_format,
                     'ocr_used': False,
                     'error': 'pytesseract not available - install it for OCR support'
                 }
             
-            text = pytesseract.image_to_string(image)
+            text = ocr_service.ocr_image_file(file_path)
             
             return {
                 'text': text.strip(),
-                'image_size': image.size,
-                'image_format': image.format,
+                'image_size': image_size,
+                'image_format': image_format,
                 'ocr_used': True
             }
         except Exception as e:
             raise ValueError(f"Error performing OCR: {str(e)}")
     
     @staticmethod
-    def process_document(file_path, file_type):
-        """Main document processing method"""
+    def process_document(file_path, file_type, use_cache=True, pdf_engine=None, progress=None):
+        """
+        Main document processing method
+        
+        Results are served from the content-addressed extraction cache when
+        the same file bytes have already been extracted. progress, if given,
+        receives ('extract', percent, ...) updates (see services.progress).
+        """
         
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
         file_extension = file_type.lower()
+        pdf_engine = _resolve_pdf_engine(pdf_engine)
+        
+        cache_key = None
+        if use_cache and Config.EXTRACTION_CACHE_ENABLED:
+            try:
+                variant = f"pdf-{pdf_engine}" if file_extension == 'pdf' else file_extension
+                cache_key = extraction_cache.make_key(file_path, variant, EXTRACTOR_VERSION)
+                cached = extraction_cache.get(cache_key)
+                if cached is not None:
+                    report_progress(progress, 'extract', 100, cached=True)
+                    return cached
+            except OSError as e:
+                print(f"⚠️ Extraction cache unavailable: {e}")
+                cache_key = None
+        
+        report_progress(progress, 'extract', 0)
+        result = DocumentProcessor._extract(file_path, file_extension, pdf_engine, progress)
+        report_progress(progress, 'extract', 100)
         
+        if cache_key:
+            extraction_cache.put(cache_key, result)
+        
+        return result
+    
+    @staticmethod
+    def _extract(file_path, file_extension, pdf_engine=None, progress=None):
+        """Dispatch to the extractor for a file type"""
         if file_extension == 'pdf':
-            return DocumentProcessor.extract_text_from_pdf(file_path)
+            return DocumentProcessor.extract_text_from_pdf(file_path, pdf_engine, progress)
         elif file_extension in ['docx', 'doc']:
             return DocumentProcessor.extract_text_from_docx(file_path)
+        elif file_extension == 'pptx':
+            return DocumentProcessor.extract_text_from_pptx(file_path)
         elif file_extension == 'txt':
             return DocumentProcessor.extract_text_from_txt(file_path)
         elif file_extension in ['png', 'jpg', 'jpeg', 'gif']:
@@ -160,6 +266,60 @@ class DocumentProcessor:
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
     
+    @staticmethod
+    def iter_document(file_path, file_type, pdf_engine=None):
+        """
+        Incremental variant of process_document for streaming responses
+        
+        Yields 'page' events for PDF pages and PPTX slides as each one is
+        extracted, 'chunk' events for TXT files, a single 'content' event
+        for other file types, then a final 'complete' event. Only running
+        totals are kept, never the whole document text.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        file_extension = file_type.lower()
+        
+        if file_extension == 'pdf':
+            pages = ocr_service.fill_missing_text(
+                DocumentProcessor.iter_pdf_pages(file_path, engine=pdf_engine), file_path
+            )
+        elif file_extension == 'pptx':
+            pages = iter_slides(file_path)
+        elif file_extension == 'txt':
+            reader = TextFileReader(file_path)
+            for index, chunk in enumerate(reader.chunks()):
+                yield {'event': 'chunk', 'index': index, 'text': chunk}
+            yield {'event': 'complete', **reader.stats()}
+            return
+        else:
+            result = DocumentProcessor.process_document(file_path, file_extension, pdf_engine=pdf_engine)
+            yield {'event': 'content', 'content': result}
+            yield {
+                'event': 'complete',
+                'word_count': len(result.get('text', '').split())
+            }
+            return
+        
+        page_count = 0
+        word_count = 0
+        image_count = 0
+        
+        for page in pages:
+            page_count += 1
+            word_count += len(page['text'].split()) + len(page.get('notes', '').split())
+            image_count += len(page['images'])
+            yield {'event': 'page', **page}
+        
+        yield {
+            'event': 'complete',
+            'page_count': page_count,
+            'word_count': word_count,
+            'image_count': image_count,
+            'has_images': image_count > 0
+        }
+    
     @staticmethod
     def get_document_metadata(file_path):
         """Get document metadata"""
@@ -0,0 +1,181 @@
+"""
+DOCX Extraction Engine
+Single streaming pass over the DOCX zip for text, tables and images
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+IMAGE_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+HEADER_PART = re.compile(r'word/header[0-9]*\.xml')
+FOOTER_PART = re.compile(r'word/footer[0-9]*\.xml')
+
+P, T, TAB, TABS, BR, CR = W + 'p', W + 't', W + 'tab', W + 'tabs', W + 'br', W + 'cr'
+BODY, TBL, TR, TC = W + 'body', W + 'tbl', W + 'tr', W + 'tc'
+GRID_SPAN, V_MERGE, VAL = W + 'gridSpan', W + 'vMerge', W + 'val'
+
+
+class _Table:
+    """Row/cell state for a table being parsed"""
+    
+    def __init__(self, body_level):
+        self.body_level = body_level
+        self.rows = []
+        self.row = None
+        self.column = 0
+        self.above = {}  # grid column -> text, for vertically merged cells
+        self.cell = None
+
+
+def _image_relationships(zf):
+    """Image relationships of the main document part"""
+    try:
+        rels_xml = zf.read(DOCUMENT_RELS_PART)
+    except KeyError:
+        return []
+    
+    images = []
+    for rel in ET.fromstring(rels_xml).iter(PKG_REL + 'Relationship'):
+        if rel.get('Type') == IMAGE_REL_TYPE or 'image' in rel.get('Target', ''):
+            images.append({
+                'type': 'embedded',
+                'target': rel.get('Target'),
+                'rel_id': rel.get('Id')
+            })
+    return images
+
+
+def _parse_part(stream, collect_structure):
+    """
+    Walk one WordprocessingML part with iterparse
+    
+    Text follows docx2txt conventions (paragraphs separated by blank lines,
+    tabs and breaks preserved). When collect_structure is set, body-level
+    paragraphs are counted and body-level tables are collected with merged
+    cells repeated across the grid columns they span, matching python-docx.
+    """
+    text_parts = []
+    paragraph_count = 0
+    tables = []
+    
+    stack = []       # Open element tags
+    paragraphs = []  # Text buffers of open paragraphs (innermost last)
+    open_tables = []
+    
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        
+        if event == 'start':
+            parent = stack[-1] if stack else None
+            stack.append(tag)
+            
+            if tag == P:
+                text_parts.append('\n\n')
+                paragraphs.append([])
+                if parent == BODY:
+                    paragraph_count += 1
+            elif tag in (TAB, BR, CR):
+                if tag == TAB and parent == TABS:
+                    continue  # Tab stop definition, not a tab character
+                char = '\t' if tag == TAB else '\n'
+                text_parts.append(char)
+                if paragraphs:
+                    paragraphs[-1].append(char)
+            elif not collect_structure:
+                continue
+            elif tag == TBL:
+                open_tables.append(_Table(body_level=parent == BODY))
+            elif tag == TR and open_tables:
+                table = open_tables[-1]
+                table.row = []
+                table.column = 0
+            elif tag == TC and open_tables:
+                open_tables[-1].cell = {'paragraphs': [], 'span': 1, 'merge': None}
+            elif tag == GRID_SPAN and open_tables and open_tables[-1].cell:
+                open_tables[-1].cell['span'] = int(elem.get(VAL, 1))
+            elif tag == V_MERGE and open_tables and open_tables[-1].cell:
+                open_tables[-1].cell['merge'] = elem.get(VAL, 'continue')
+            continue
+        
+        # 'end' event
+        stack.pop()
+        parent = stack[-1] if stack else None
+        
+        if tag == T:
+            if elem.text:
+                text_parts.append(elem.text)
+                if paragraphs:
+                    paragraphs[-1].append(elem.text)
+        elif tag == P:
+            paragraph_text = ''.join(paragraphs.pop())
+            if parent == TC and open_tables and open_tables[-1].cell is not None:
+                open_tables[-1].cell['paragraphs'].append(paragraph_text)
+        elif tag == TC and open_tables:
+            table = open_tables[-1]
+            cell = table.cell
+            if cell is not None and table.row is not None:
+                if cell['merge'] == 'continue':
+                    cell_text = table.above.get(table.column, '')
+                else:
+                    cell_text = '\n'.join(cell['paragraphs'])
+                for offset in range(cell['span']):
+                    table.above[table.column + offset] = cell_text
+                    table.row.append(cell_text)
+                table.column += cell['span']
+            table.cell = None
+        elif tag == TR and open_tables:
+            table = open_tables[-1]
+            if table.row is not None:
+                table.rows.append(table.row)
+            table.row = None
+        elif tag == TBL and open_tables:
+            table = open_tables.pop()
+            if table.body_level:
+                tables.append(table.rows)
+        
+        # Everything under this element has been consumed
+        elem.clear()
+    
+    return ''.join(text_parts), paragraph_count, tables
+
+
+def extract_docx(file_path):
+    """
+    Extract text, paragraph count, tables and image references in one pass
+    
+    Headers and footers contribute text only, like docx2txt; the document
+    part is streamed once for text, structure and tables together.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        names = zf.namelist()
+        images = _image_relationships(zf)
+        
+        text = ''
+        for name in names:
+            if HEADER_PART.match(name):
+                with zf.open(name) as stream:
+                    text += _parse_part(stream, collect_structure=False)[0]
+        
+        with zf.open(DOCUMENT_PART) as stream:
+            body_text, paragraph_count, tables = _parse_part(stream, collect_structure=True)
+        text += body_text
+        
+        for name in names:
+            if FOOTER_PART.match(name):
+                with zf.open(name) as stream:
+                    text += _parse_part(stream, collect_structure=False)[0]
+    
+    return {
+        'text': text.strip(),
+        'paragraph_count': paragraph_count,
+        'tables': tables,
+        'images': images,
+        'has_images': len(images) > 0,
+        'has_tables': len(tables) > 0
+    }
@@ -0,0 +1,164 @@
+"""
+Extraction Cache Service
+Content-addressed on-disk cache of document extraction results
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from config import Config
+
+
+class ExtractionCache:
+    """
+    Size-bounded LRU cache of process_document results
+    
+    Entries are keyed by the SHA-256 of the file bytes plus the file type
+    and extractor version, so re-uploads of the same file hit the cache and
+    changes to the extraction code invalidate old entries automatically.
+    Recency is tracked with file mtimes, which keeps the LRU order correct
+    across server restarts and multiple worker processes.
+    """
+    
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = OrderedDict()  # key -> size in bytes, least recent first
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def file_digest(file_path, block_size=1024 * 1024):
+        """SHA-256 of a file, read in blocks"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def make_key(self, file_path, file_type, extractor_version):
+        """Cache key for a file as extracted by a given extractor version"""
+        return f"{self.file_digest(file_path)}-{file_type}-v{extractor_version}"
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _load_index(self):
+        """Rebuild the LRU index from the cache directory (oldest first)"""
+        if self._loaded:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                stats = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stats.st_mtime, name[:-len('.json')], stats.st_size))
+        
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._loaded = True
+    
+    def get(self, key):
+        """Return the cached result for key, or None"""
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    result = json.load(file)
+                os.utime(path)  # Mark as most recently used
+            except (OSError, ValueError):
+                self._forget(key)
+                self.misses += 1
+                return None
+            
+            if key not in self._index:
+                # Written by another process since we built the index
+                self._index[key] = os.path.getsize(path)
+                self._total_bytes += self._index[key]
+            self._index.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def put(self, key, result):
+        """Store a result, evicting least recently used entries to stay in budget"""
+        payload = json.dumps(result, default=str).encode('utf-8')
+        if len(payload) > self.max_bytes:
+            return
+        
+        with self._lock:
+            self._load_index()
+            # Write atomically so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(payload)
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            
+            self._forget(key)
+            self._index[key] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+    
+    def _forget(self, key):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+    
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+    
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total_bytes = 0
+    
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._index),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Singleton instance
+extraction_cache = ExtractionCache(Config.EXTRACTION_CACHE_DIR, Config.EXTRACTION_CACHE_MAX_BYTES)
@@ -0,0 +1,158 @@
+"""
+HTTP Client Service
+Shared keep-alive connection pools for outbound requests
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.retry import Retry
+
+from config import Config
+
+
+class ResponseTooLarge(ValueError):
+    """The response body exceeded the configured byte cap"""
+
+
+class _BoundedWaitPool:
+    """Blocking pool that waits at most HTTP_POOL_TIMEOUT for a free connection"""
+    
+    def _get_conn(self, timeout=None):
+        # requests never passes a pool timeout, which would wait forever
+        return super()._get_conn(Config.HTTP_POOL_TIMEOUT if timeout is None else timeout)
+
+
+class _BoundedHTTPConnectionPool(_BoundedWaitPool, HTTPConnectionPool):
+    pass
+
+
+class _BoundedHTTPSConnectionPool(_BoundedWaitPool, HTTPSConnectionPool):
+    pass
+
+
+class BoundedPoolAdapter(HTTPAdapter):
+    """HTTPAdapter whose blocking pools give up on a free connection after HTTP_POOL_TIMEOUT"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _BoundedHTTPConnectionPool,
+            'https': _BoundedHTTPSConnectionPool
+        }
+    
+    def send(self, request, **kwargs):
+        try:
+            return super().send(request, **kwargs)
+        except EmptyPoolError as e:
+            raise requests.ConnectionError(e, request=request)
+
+
+class HTTPClient:
+    """
+    Thread-safe HTTP client built on one shared requests.Session
+    
+    Connections are kept alive and reused per host. Each host gets at most
+    HTTP_POOL_PER_HOST connections; pool_block makes extra threads wait for
+    a free connection instead of opening (and discarding) new ones, which
+    doubles as a per-host concurrency limit. Every request gets separate
+    connect and read timeouts, and a bounded wait for a pooled connection.
+    """
+    
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+    
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            return self._session
+    
+    @staticmethod
+    def _build_session():
+        """
+        Session with one blocking keep-alive pool per host
+        
+        A request that finds all HTTP_POOL_PER_HOST connections to its host
+        busy waits up to HTTP_POOL_TIMEOUT seconds for one to be returned,
+        then raises requests.ConnectionError, so a slow host cannot hold
+        callers' threads indefinitely.
+        """
+        retries = Retry(
+            total=Config.HTTP_RETRIES,
+            connect=Config.HTTP_RETRIES,
+            read=0,  # Never resend a request the server may have acted on
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            raise_on_status=False
+        )
+        adapter = BoundedPoolAdapter(
+            pool_connections=Config.HTTP_POOL_HOSTS,
+            pool_maxsize=Config.HTTP_POOL_PER_HOST,
+            pool_block=True,
+            max_retries=retries
+        )
+        
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = Config.HTTP_USER_AGENT
+        return session
+    
+    @staticmethod
+    def timeout():
+        return (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
+    
+    def get(self, url, **kwargs):
+        """GET with the pooled session and default timeouts (body not capped)"""
+        kwargs.setdefault('timeout', self.timeout())
+        return self.session.get(url, **kwargs)
+    
+    def fetch(self, url, max_bytes=None, headers=None):
+        """
+        GET a page, streaming the body with a hard size cap
+        
+        Raises ResponseTooLarge as soon as the declared or received size
+        passes max_bytes (default HTTP_MAX_RESPONSE_BYTES), without reading
+        the rest. The returned response has its body loaded, so .content
+        and .text work as usual.
+        """
+        max_bytes = max_bytes or Config.HTTP_MAX_RESPONSE_BYTES
+        response = self.session.get(url, headers=headers, timeout=self.timeout(), stream=True)
+        
+        try:
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise ResponseTooLarge(f"Response from {url} is {declared} bytes (limit {max_bytes})")
+            
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body.extend(chunk)
+                if len(body) > max_bytes:
+                    raise ResponseTooLarge(f"Response from {url} exceeded {max_bytes} bytes")
+            
+            response._content = bytes(body)
+        except BaseException:
+            # Drop the connection rather than draining an oversized body
+            response.close()
+            raise
+        
+        # Body fully read: the connection goes back to the pool
+        response.close()
+        return response
+    
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# Singleton instance
+http_client = HTTPClient()
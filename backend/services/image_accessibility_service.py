@@ -6,6 +6,7 @@ Image analysis, ALT text generation, diagram description
 import os
 import numpy as np
 from PIL import Image
+from services.progress import report_progress
 
 # Optional Google Cloud Vision
 try:
@@ -38,11 +39,18 @@ class ImageAccessibilityService:
         except Exception as e:
             print(f"Google Vision API initialization warning: {e}")
     
-    def generate_alt_text(self, image_path):
-        """Generate ALT text for images using Google Cloud Vision"""
+    def generate_alt_text(self, image_path, progress=None):
+        """
+        Generate ALT text for images using Google Cloud Vision
+        
+        progress, if given, receives ('describe', percent, step=...) as each
+        Vision feature is analyzed.
+        """
         try:
             if not self.vision_client:
-                return self._generate_basic_alt_text(image_path)
+                result = self._generate_basic_alt_text(image_path)
+                report_progress(progress, 'describe', 100, step='basic')
+                return result
             
             with open(image_path, 'rb') as image_file:
                 content = image_file.read()
@@ -50,27 +58,33 @@ class ImageAccessibilityService:
             image = vision.Image(content=content)
             
             # Detect labels
+            report_progress(progress, 'describe', 0, step='labels')
             labels_response = self.vision_client.label_detection(image=image)
             labels = [label.description for label in labels_response.label_annotations[:5]]
             
             # Detect objects
+            report_progress(progress, 'describe', 20, step='objects')
             objects_response = self.vision_client.object_localization(image=image)
             objects = [obj.name for obj in objects_response.localized_object_annotations[:5]]
             
             # Detect text
+            report_progress(progress, 'describe', 40, step='text')
             text_response = self.vision_client.text_detection(image=image)
             detected_text = text_response.text_annotations[0].description if text_response.text_annotations else ""
             
             # Detect faces
+            report_progress(progress, 'describe', 60, step='faces')
             faces_response = self.vision_client.face_detection(image=image)
             face_count = len(faces_response.face_annotations)
             
             # Detect landmarks
+            report_progress(progress, 'describe', 80, step='landmarks')
             landmarks_response = self.vision_client.landmark_detection(image=image)
             landmarks = [landmark.description for landmark in landmarks_response.landmark_annotations[:3]]
             
             # Generate comprehensive ALT text
             alt_text = self._compose_alt_text(labels, objects, detected_text, face_count, landmarks)
+            report_progress(progress, 'describe', 100, step='compose')
             
             return {
                 'alt_text': alt_text,
@@ -0,0 +1,76 @@
+"""
+Job Handlers
+Long-running work that can be queued instead of run inside a request
+"""
+
+import os
+
+from config import Config
+from models import db, Upload
+from services.job_queue import job_handler, PermanentJobError
+from services.document_processor import DocumentProcessor
+from services.tts_service import tts_service
+from services.image_accessibility_service import image_accessibility_service
+
+
+@job_handler('document.process')
+def process_document_job(payload, job, progress):
+    """Extract a document; the text is also stored on the linked upload"""
+    file_path = payload.get('file_path')
+    file_type = payload.get('file_type')
+    if not file_path or not file_type:
+        raise PermanentJobError('file_path and file_type are required')
+    
+    result = DocumentProcessor.process_document(
+        file_path, file_type, pdf_engine=payload.get('pdf_engine'), progress=progress
+    )
+    
+    if job.upload_id:
+        upload = Upload.query.get(job.upload_id)
+        if upload:
+            upload.text_content = result.get('text', '')
+            db.session.commit()
+    
+    return {
+        'content': result,
+        'metadata': DocumentProcessor.get_document_metadata(file_path)
+    }
+
+
+@job_handler('tts.generate')
+def generate_speech_job(payload, job, progress):
+    """Synthesize speech for (possibly multi-chunk) text"""
+    text = payload.get('text')
+    if not text:
+        raise PermanentJobError('Text is required')
+    
+    provider, options = tts_service.provider_options(
+        payload.get('provider', 'gtts'),
+        payload.get('language', 'en-US'),
+        payload.get('voice', 'en-US-Neural2-C'),
+        payload.get('speaking_rate', 1.0)
+    )
+    
+    # Keep the file name stable across retries of the same job
+    filename = f"tts_{job.id}.mp3"
+    output_path = os.path.join(Config.GENERATED_DIR, filename)
+    result = tts_service.generate_speech(
+        text, output_path, provider=provider, progress=progress, **options
+    )
+    
+    return {
+        **result,
+        'download_url': f'/api/accessibility/download-audio/{filename}'
+    }
+
+
+@job_handler('image.alt_text')
+def generate_alt_text_job(payload, job, progress):
+    """Describe an image with the Vision API (or the basic fallback)"""
+    image_path = payload.get('image_path')
+    if not image_path:
+        raise PermanentJobError('image_path is required')
+    if not os.path.exists(image_path):
+        raise FileNotFoundError(f"Image not found: {image_path}")
+    
+    return image_accessibility_service.generate_alt_text(image_path, progress=progress)
@@ -0,0 +1,293 @@
+"""
+Job Queue Service
+Durable background jobs stored in the application database
+"""
+
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from config import Config
+from models import db, Job, JobEvent, Upload
+
+# job_type -> callable(payload, job, progress) returning a JSON-serializable result
+JOB_HANDLERS = {}
+
+
+class PermanentJobError(ValueError):
+    """A failure that retrying cannot fix (bad input, missing file)"""
+
+
+NON_RETRYABLE_ERRORS = (PermanentJobError, FileNotFoundError)
+
+
+def job_handler(job_type):
+    """Register a function as the handler for a job type"""
+    def register(fn):
+        JOB_HANDLERS[job_type] = fn
+        return fn
+    return register
+
+
+def _set_upload_status(upload_id, status):
+    """Mirror job status onto the linked upload, if any"""
+    if not upload_id:
+        return
+    upload = Upload.query.get(upload_id)
+    if upload:
+        upload.status = status
+        if status in ('completed', 'error'):
+            upload.processed_at = datetime.utcnow()
+
+
+def _add_event(job_id, event, data=None):
+    """Append a job event; committed together with the caller's changes"""
+    db.session.add(JobEvent(job_id=job_id, event=event, data=data or {}))
+
+
+class JobProgress:
+    """
+    Progress hook for a running job (see services.progress)
+    
+    Each update is stored as a 'progress' JobEvent for the SSE stream.
+    Updates within a stage are throttled to one per JOB_PROGRESS_MIN_INTERVAL
+    seconds; stage changes and 100% are always recorded.
+    """
+    
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self._stage = None
+        self._percent = None
+        self._last_write = 0.0
+    
+    def __call__(self, stage, percent, **detail):
+        now = time.monotonic()
+        if stage == self._stage and (
+            percent == self._percent
+            or (percent < 100 and now - self._last_write < Config.JOB_PROGRESS_MIN_INTERVAL)
+        ):
+            return
+        
+        self._stage = stage
+        self._percent = percent
+        self._last_write = now
+        _add_event(self.job_id, 'progress', {'stage': stage, 'percent': percent, **detail})
+        db.session.commit()
+
+
+class JobQueue:
+    """
+    Database-backed job queue
+    
+    Jobs are claimed with a conditional UPDATE (status still 'pending'), so
+    any number of worker processes can poll the same table without a broker.
+    A claimed job holds a lease that its worker renews with heartbeats;
+    leases that go stale (worker crashed or was killed) are returned to
+    the queue by recover_stale_jobs. Failures are retried with exponential
+    backoff until max_attempts is reached.
+    
+    Lifecycle changes and handler progress are recorded as JobEvent rows,
+    which the SSE endpoint streams to clients in id order.
+    """
+    
+    def enqueue(self, job_type, payload, user_id=None, upload_id=None, max_attempts=None):
+        """Create a pending job and return it"""
+        if job_type not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        
+        job = Job(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            upload_id=upload_id,
+            job_type=job_type,
+            payload=payload,
+            status='pending',
+            attempts=0,
+            max_attempts=max_attempts or Config.JOB_MAX_ATTEMPTS,
+            run_after=datetime.utcnow()
+        )
+        db.session.add(job)
+        _set_upload_status(upload_id, 'pending')
+        db.session.commit()
+        return job
+    
+    def get(self, job_id):
+        return Job.query.get(job_id)
+    
+    def events_after(self, job_id, last_event_id=0):
+        """Events for a job newer than last_event_id, oldest first"""
+        return (
+            JobEvent.query
+            .filter(JobEvent.job_id == job_id, JobEvent.id > last_event_id)
+            .order_by(JobEvent.id)
+            .all()
+        )
+    
+    def claim_next(self, worker_id):
+        """Atomically take the oldest runnable job, or return None"""
+        now = datetime.utcnow()
+        candidates = (
+            db.session.query(Job.id)
+            .filter(Job.status == 'pending', Job.run_after <= now)
+            .order_by(Job.created_at)
+            .limit(Config.JOB_CLAIM_BATCH)
+            .all()
+        )
+        
+        for (job_id,) in candidates:
+            claimed = (
+                Job.query
+                .filter(Job.id == job_id, Job.status == 'pending')
+                .update({
+                    Job.status: 'processing',
+                    Job.locked_by: worker_id,
+                    Job.locked_at: now,
+                    Job.started_at: now,
+                    Job.attempts: Job.attempts + 1
+                }, synchronize_session=False)
+            )
+            db.session.commit()
+            if claimed:
+                job = Job.query.get(job_id)
+                db.session.refresh(job)
+                _set_upload_status(job.upload_id, 'processing')
+                _add_event(job.id, 'started', {'status': job.status, 'attempt': job.attempts})
+                db.session.commit()
+                return job
+        return None
+    
+    def heartbeat(self, job_id, worker_id):
+        """Renew the lease on a running job"""
+        Job.query.filter(
+            Job.id == job_id, Job.locked_by == worker_id, Job.status == 'processing'
+        ).update({Job.locked_at: datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+    
+    def _release(self, job, worker_id, values, locked_at=None):
+        """
+        Apply values to a job only while worker_id still holds its lease
+        
+        Like heartbeat, this is a conditional UPDATE: if the lease expired
+        and the job was requeued or claimed by another worker, nothing is
+        written and False is returned. locked_at, if given, must also still
+        match (so a lease renewed since it was read is left alone).
+        """
+        conditions = [Job.id == job.id, Job.locked_by == worker_id, Job.status == 'processing']
+        if locked_at is not None:
+            conditions.append(Job.locked_at == locked_at)
+        values = dict(values, locked_by=None, locked_at=None)
+        released = Job.query.filter(*conditions).update(
+            {getattr(Job, column): value for column, value in values.items()}, synchronize_session=False
+        )
+        if not released:
+            db.session.rollback()
+        return bool(released)
+    
+    def complete(self, job, worker_id, result):
+        """Record a job's result; dropped if worker_id no longer holds the lease"""
+        if not self._release(job, worker_id, {
+            'status': 'completed',
+            'result': result,
+            'error': None,
+            'finished_at': datetime.utcnow()
+        }):
+            print(f"⚠️ Dropping result of job {job.id}: worker {worker_id} lost its lease")
+            return False
+        _set_upload_status(job.upload_id, 'completed')
+        _add_event(job.id, 'completed', {'status': 'completed'})
+        db.session.commit()
+        return True
+    
+    def fail(self, job, worker_id, error, retryable=True, locked_at=None):
+        """
+        Record a failure, scheduling a retry with exponential backoff if attempts remain
+        
+        Dropped (returns False) if worker_id no longer holds the lease.
+        """
+        if retryable and job.attempts < job.max_attempts:
+            delay = min(
+                Config.JOB_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1)),
+                Config.JOB_RETRY_MAX_SECONDS
+            )
+            values = {'status': 'pending', 'error': error, 'run_after': datetime.utcnow() + timedelta(seconds=delay)}
+            event = ('retry', {'status': 'pending', 'error': error, 'attempt': job.attempts, 'retry_in': delay})
+        else:
+            values = {'status': 'error', 'error': error, 'finished_at': datetime.utcnow()}
+            event = ('error', {'status': 'error', 'error': error})
+        
+        if not self._release(job, worker_id, values, locked_at=locked_at):
+            print(f"⚠️ Dropping failure of job {job.id}: worker {worker_id} lost its lease")
+            return False
+        _set_upload_status(job.upload_id, values['status'])
+        _add_event(job.id, *event)
+        db.session.commit()
+        return True
+    
+    def recover_stale_jobs(self):
+        """
+        Return jobs whose worker stopped heartbeating to the queue
+        
+        A job that already used all its attempts is marked as an error
+        instead, so a job that crashes its worker cannot loop forever.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=Config.JOB_LEASE_SECONDS)
+        stale = Job.query.filter(Job.status == 'processing', Job.locked_at < cutoff).all()
+        
+        recovered = 0
+        for job in stale:
+            recovered += self.fail(
+                job, job.locked_by, f"Worker {job.locked_by} stopped responding", locked_at=job.locked_at
+            )
+        return recovered
+    
+    def run(self, job, worker_id):
+        """Execute a claimed job, renewing its lease while the handler runs"""
+        handler = JOB_HANDLERS.get(job.job_type)
+        if handler is None:
+            self.fail(job, worker_id, f"No handler for job type: {job.job_type}", retryable=False)
+            return
+        
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(current_app._get_current_object(), job.id, worker_id, stop),
+            daemon=True
+        )
+        heartbeat.start()
+        
+        try:
+            result = handler(job.payload or {}, job, JobProgress(job.id))
+            self.complete(job, worker_id, result)
+        except NON_RETRYABLE_ERRORS as e:
+            db.session.rollback()
+            self.fail(job, worker_id, str(e), retryable=False)
+        except Exception as e:
+            db.session.rollback()
+            traceback.print_exc()
+            self.fail(job, worker_id, str(e), retryable=True)
+        finally:
+            stop.set()
+            heartbeat.join()
+    
+    def _heartbeat_loop(self, app, job_id, worker_id, stop):
+        with app.app_context():
+            while not stop.wait(Config.JOB_HEARTBEAT_SECONDS):
+                try:
+                    self.heartbeat(job_id, worker_id)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"⚠️ Job heartbeat failed for {job_id}: {e}")
+            db.session.remove()
+    
+    @staticmethod
+    def make_worker_id(index):
+        return f"{socket.gethostname()}:{index}:{uuid.uuid4().hex[:8]}"
+
+
+# Singleton instance
+job_queue = JobQueue()
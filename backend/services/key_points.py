@@ -0,0 +1,240 @@
+"""
+Key Point Extraction Service
+Extractive summaries from TF-IDF sentence vectors scored against the document centroid
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import func
+
+from config import Config
+from models import SavedContent
+
+# Words of three or more letters; contractions are kept whole, possessive 's is dropped
+TERM_PATTERN = re.compile(r"[a-z]{3,}(?:'(?!s\b)[a-z]+)*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers herself him himself his how however i if in into
+is it its itself just let me more most my myself no nor not now of off on once only or other
+our ours ourselves out over own same she should so some such than that the their theirs them
+themselves then there these they this those through thus to too under until up upon us very
+was we were what when where which while who whom why will with would you your yours yourself
+yourselves one two may might must shall also within without via per etc
+""".split())
+
+# Sentences shorter than this rarely stand alone as a key point
+MIN_KEY_POINT_WORDS = 5
+
+# A candidate this similar (cosine) to an already chosen point is skipped
+MAX_SIMILARITY = 0.6
+
+# Only this many top-scored sentences per requested point are checked for redundancy
+CANDIDATES_PER_POINT = 10
+
+
+def tokenize_terms(text):
+    """Lowercase content terms of text (stopwords dropped)"""
+    return [term for term in TERM_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+class LibraryIDF:
+    """
+    Document frequencies over a user's saved library
+    
+    Terms that appear across many of the user's documents (the course name,
+    recurring jargon) are down-weighted; terms unseen in the library get
+    the highest weight.
+    """
+    
+    def __init__(self, documents, df):
+        self.documents = documents
+        self.df = df
+    
+    def vector(self, vocabulary):
+        """IDF weight for each term of vocabulary (a list, in column order)"""
+        counts = np.fromiter((self.df.get(term, 0) for term in vocabulary), dtype=np.float64, count=len(vocabulary))
+        return np.log((1 + self.documents) / (1 + counts)) + 1
+
+
+class KeyPointExtractor:
+    """
+    Rank sentences by cosine similarity to the document's TF-IDF centroid
+    
+    Sentences become rows of a sparse term matrix kept as coordinate arrays;
+    weighting, normalization and scoring are NumPy bincount reductions, so
+    cost grows linearly with the number of terms in the text.
+    """
+    
+    def extract(self, sentences, num_points=5, word_counts=None, idf=None):
+        """
+        Pick up to num_points sentences and return their indexes with scores
+        
+        word_counts (per sentence) excludes fragments below
+        MIN_KEY_POINT_WORDS; idf, a LibraryIDF, replaces in-document IDF.
+        Returns [(index, score)] in document order.
+        """
+        if not sentences or num_points <= 0:
+            return []
+        
+        rows, cols, weights, vocabulary = self._weighted_matrix(sentences, idf)
+        count = len(sentences)
+        if not vocabulary:
+            return [(index, 0.0) for index in range(min(num_points, count))]
+        
+        centroid = np.bincount(cols, weights, minlength=len(vocabulary)) / count
+        centroid_norm = np.linalg.norm(centroid) or 1.0
+        scores = np.bincount(rows, weights * centroid[cols], minlength=count) / centroid_norm
+        
+        if word_counts is not None:
+            eligible = np.asarray(word_counts) >= MIN_KEY_POINT_WORDS
+            if eligible.any():
+                scores = np.where(eligible, scores, -1.0)
+        
+        ranked = [int(index) for index in np.argsort(-scores, kind='stable') if scores[index] >= 0]
+        candidates = ranked[:num_points * CANDIDATES_PER_POINT]
+        bounds = np.searchsorted(rows, np.arange(count + 1))
+        chosen = []
+        for index in candidates:
+            if len(chosen) >= num_points:
+                break
+            if all(self._similarity(cols, weights, bounds, index, other) < MAX_SIMILARITY for other in chosen):
+                chosen.append(index)
+        
+        # Too few distinct candidates: top up with the best remaining sentences
+        for index in candidates:
+            if len(chosen) >= num_points:
+                break
+            if index not in chosen:
+                chosen.append(index)
+        
+        return [(index, round(float(scores[index]), 4)) for index in sorted(chosen)]
+    
+    @staticmethod
+    def _weighted_matrix(sentences, idf=None):
+        """L2-normalized TF-IDF entries as (rows, cols, weights) sorted by row, plus the vocabulary"""
+        terms = []
+        lengths = []
+        for sentence in sentences:
+            sentence_terms = tokenize_terms(sentence)
+            terms.extend(sentence_terms)
+            lengths.append(len(sentence_terms))
+        
+        vocabulary = {}
+        column = vocabulary.setdefault
+        cols = np.fromiter((column(term, len(vocabulary)) for term in terms), dtype=np.int64, count=len(terms))
+        rows = np.repeat(np.arange(len(sentences), dtype=np.int64), lengths)
+        
+        size = max(1, len(vocabulary))
+        keys, tf = np.unique(rows * size + cols, return_counts=True)
+        rows = keys // size
+        cols = keys % size
+        
+        if idf is not None:
+            idf_vector = idf.vector(list(vocabulary))
+        else:
+            df = np.bincount(cols, minlength=len(vocabulary))
+            idf_vector = np.log((1 + len(sentences)) / (1 + df)) + 1
+        
+        weights = (1 + np.log(tf)) * idf_vector[cols]
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(sentences)))
+        weights = weights / norms[rows]
+        return rows, cols, weights, vocabulary
+    
+    @staticmethod
+    def _similarity(cols, weights, bounds, a, b):
+        """Cosine similarity of two normalized sentence rows"""
+        a_cols = cols[bounds[a]:bounds[a + 1]]
+        b_cols = cols[bounds[b]:bounds[b + 1]]
+        _, a_index, b_index = np.intersect1d(a_cols, b_cols, assume_unique=True, return_indices=True)
+        if not len(a_index):
+            return 0.0
+        return float(np.dot(weights[bounds[a] + a_index], weights[bounds[b] + b_index]))
+
+
+class LibraryIDFStore:
+    """
+    Per-user LibraryIDF, persisted as JSON under KEY_POINTS_IDF_DIR
+    
+    The stored statistics carry a signature of the user's saved content
+    (count and latest update) and are rebuilt when it changes.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+    
+    def _path(self, user_id):
+        safe_id = re.sub(r'[^A-Za-z0-9_\-]', '_', user_id)
+        return os.path.join(self.directory, f"{safe_id}.json")
+    
+    @staticmethod
+    def _signature(user_id):
+        count, latest = (
+            SavedContent.query
+            .with_entities(func.count(SavedContent.id), func.max(SavedContent.updated_at))
+            .filter_by(user_id=user_id)
+            .one()
+        )
+        return count, f"{count}:{latest.isoformat() if latest else ''}"
+    
+    def for_user(self, user_id):
+        """LibraryIDF for user_id, or None if the user has no saved content"""
+        count, signature = self._signature(user_id)
+        if not count:
+            return None
+        
+        path = self._path(user_id)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    stored = json.load(file)
+                if stored.get('signature') == signature:
+                    return LibraryIDF(stored['documents'], stored['df'])
+            except (OSError, ValueError, KeyError):
+                pass
+            
+            library = self._build(user_id)
+            self._save(path, signature, library)
+            return library
+    
+    @staticmethod
+    def _build(user_id):
+        df = Counter()
+        documents = 0
+        texts = (
+            SavedContent.query
+            .with_entities(SavedContent.original_text)
+            .filter_by(user_id=user_id)
+            .yield_per(50)
+        )
+        for (text,) in texts:
+            if text:
+                documents += 1
+                df.update(set(tokenize_terms(text)))
+        return LibraryIDF(documents, dict(df))
+    
+    def _save(self, path, signature, library):
+        os.makedirs(self.directory, exist_ok=True)
+        payload = {'signature': signature, 'documents': library.documents, 'df': library.df}
+        # Write atomically so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(payload, file)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# Singleton instances
+key_point_extractor = KeyPointExtractor()
+library_idf_store = LibraryIDFStore(Config.KEY_POINTS_IDF_DIR)
@@ -0,0 +1,252 @@
+"""
+Math Rendering Service
+Single-pass LaTeX equation scanning, MathML and speech rendering on a
+process pool, and a shared cache of rendered equations
+"""
+
+import re
+import signal
+import threading
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from sympy.parsing.latex import parse_latex
+
+from config import Config
+from services.math_speech import mathml_to_speech
+from services.worker_pools import get_process_pool, discard_pool
+
+try:
+    import latex2mathml.converter
+    LATEX2MATHML_AVAILABLE = True
+except ImportError:
+    LATEX2MATHML_AVAILABLE = False
+    print("Warning: latex2mathml not available. Equations will not be rendered as MathML.")
+
+# One alternation, so each equation is found exactly once, leftmost first.
+# $$ is tried before $ so display math is never re-read as inline math;
+# display math may span lines, inline math may not, and \$ is a literal.
+EQUATION_PATTERN = re.compile(
+    r'(?<!\\)\$\$(?P<dollars>(?s:.+?))\$\$'
+    r'|(?<!\\)\$(?P<dollar>.+?)\$'
+    r'|\\\[(?P<bracket>(?s:.+?))\\\]'
+    r'|\\\((?P<paren>.+?)\\\)'
+)
+DISPLAY_GROUPS = ('dollars', 'bracket')
+
+TIMEOUT_ERROR = 'Timed out rendering equation'
+
+
+def scan_equations(text):
+    """Yield (latex, (start, end), display) for each equation in text, left to right"""
+    for match in EQUATION_PATTERN.finditer(text):
+        group = match.lastgroup
+        yield match.group(group), match.span(), group in DISPLAY_GROUPS
+
+
+class RenderTimeout(BaseException):
+    """Raised by the render alarm; not an Exception, so parser code can't swallow it"""
+
+
+def _raise_timeout(signum, frame):
+    raise RenderTimeout()
+
+
+def render_equation(latex, display=False):
+    """
+    Text, MathML and spoken forms of one equation
+    
+    Returns {'text', 'html', 'mathml', 'spoken'} (html is the MathML, or a
+    plain <math> wrapper when MathML conversion fails), or {'error'} if
+    neither sympy nor latex2mathml can read the LaTeX.
+    """
+    rendering = {}
+    try:
+        rendering['text'] = str(parse_latex(latex))
+    except Exception:
+        pass
+    
+    mathml = None
+    if LATEX2MATHML_AVAILABLE:
+        try:
+            mathml = latex2mathml.converter.convert(latex, display='block' if display else 'inline')
+        except Exception:
+            mathml = None
+    
+    if 'text' not in rendering and mathml is None:
+        return {'error': 'Could not parse equation'}
+    rendering.setdefault('text', latex)
+    
+    spoken = None
+    if mathml is not None:
+        rendering['html'] = mathml
+        rendering['mathml'] = mathml
+        try:
+            spoken = mathml_to_speech(mathml)
+        except Exception:
+            spoken = None
+    else:
+        rendering['html'] = f"<math>{rendering['text']}</math>"
+    rendering['spoken'] = spoken or rendering['text']
+    return rendering
+
+
+def render_with_timeout(latex, display=False, timeout=None):
+    """
+    render_equation bounded by timeout seconds
+    
+    The bound uses SIGALRM, so it only applies on POSIX in a process's main
+    thread (as in a pool worker); elsewhere the render is unbounded.
+    """
+    alarm = bool(timeout) and hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return render_equation(latex, display)
+    except RenderTimeout:
+        return {'error': TIMEOUT_ERROR, 'timed_out': True}
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _init_math_worker():
+    """Load the LaTeX grammar up front so the first equation's timeout isn't spent on it"""
+    render_equation('x')
+
+
+def _render_task(latex, display, timeout):
+    """Render one equation in a worker process"""
+    try:
+        return render_with_timeout(latex, display, timeout)
+    except Exception as e:
+        # Re-raise as a plain ValueError so the parent can always unpickle it
+        raise ValueError(str(e)) from None
+
+
+class MathRenderer:
+    """
+    LaTeX to rendered forms, memoized in a bounded LRU cache
+    
+    parse_latex costs milliseconds per call, and lecture notes repeat the
+    same symbols and formulas many times, so each distinct equation
+    (whitespace-normalized) is rendered once per process and shared by
+    every request. Parse failures are cached too. Cached renderings are
+    shared and must not be modified by callers.
+    """
+    
+    def __init__(self, max_entries):
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()  # normalized LaTeX -> rendering, least recent first
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(latex):
+        return ' '.join(latex.split())
+    
+    def key(self, latex, display=False):
+        """Cache key of an equation: display mode plus whitespace-normalized LaTeX"""
+        return bool(display), self.normalize(latex)
+    
+    def render(self, latex, display=False):
+        """Rendering of one equation (see render_equation)"""
+        return self.render_many([(latex, display)])[0]
+    
+    def render_many(self, equations):
+        """
+        Renderings for a list of (latex, display) pairs, in the same order
+        
+        Each distinct equation is looked up once; misses are rendered on
+        the 'math' process pool (MATH_RENDER_WORKERS), each bounded by
+        MATH_RENDER_TIMEOUT, and cached unless they timed out or failed.
+        """
+        keys = [self.key(latex, display) for latex, display in equations]
+        renderings = {}
+        
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                rendering = self._cache.get(key)
+                if rendering is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    renderings[key] = rendering
+                else:
+                    self.misses += 1
+        
+        missing = [key for key in dict.fromkeys(keys) if key not in renderings]
+        if missing:
+            rendered, transient = self._render_missing(missing)
+            renderings.update(rendered)
+            
+            with self._lock:
+                for key, rendering in rendered.items():
+                    if key in transient:
+                        continue
+                    self._cache[key] = rendering
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                    self.evictions += 1
+        
+        return [renderings[key] for key in keys]
+    
+    def _render_missing(self, keys):
+        """Render keys, returning ({key: rendering}, keys whose result must not be cached)"""
+        timeout = Config.MATH_RENDER_TIMEOUT
+        rendered = {}
+        transient = set()
+        
+        if Config.MATH_RENDER_WORKERS <= 0:
+            for display, latex in keys:
+                rendered[(display, latex)] = render_with_timeout(latex, display, timeout)
+        else:
+            pool = get_process_pool('math', Config.MATH_RENDER_WORKERS, initializer=_init_math_worker)
+            futures = {pool.submit(_render_task, latex, display, timeout): (display, latex) for display, latex in keys}
+            
+            # Workers bound each equation with their own alarm, so the wait
+            # ends; the pool is shared, and is only replaced once broken
+            try:
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        rendered[key] = future.result()
+                    except BrokenProcessPool:
+                        discard_pool('math', pool)
+                        rendered[key] = {'error': 'Math worker process failed'}
+                        transient.add(key)
+                    except Exception as e:
+                        rendered[key] = {'error': str(e)}
+                        transient.add(key)
+            finally:
+                # Only this request's renders that haven't started
+                for future in futures:
+                    future.cancel()
+        
+        transient.update(key for key, rendering in rendered.items() if rendering.get('timed_out'))
+        return rendered, transient
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._cache),
+                'max_entries': self.max_entries
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Singleton instance
+math_renderer = MathRenderer(Config.MATH_CACHE_SIZE)
@@ -0,0 +1,124 @@
+"""
+Math Speech Service
+Spoken English for MathML, so screen readers and TTS can narrate equations
+"""
+
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+
+# Spoken form of common operators; anything else is read by its Unicode name
+OPERATORS = {
+    '+': 'plus',
+    '-': 'minus',
+    '−': 'minus',
+    '±': 'plus or minus',
+    '=': 'equals',
+    '≠': 'is not equal to',
+    '≈': 'is approximately equal to',
+    '<': 'is less than',
+    '>': 'is greater than',
+    '≤': 'is less than or equal to',
+    '≥': 'is greater than or equal to',
+    '×': 'times',
+    '·': 'times',
+    '⋅': 'times',
+    '*': 'times',
+    '/': 'divided by',
+    '÷': 'divided by',
+    '→': 'approaches',
+    '∞': 'infinity',
+    '∈': 'is in',
+    '∑': 'the sum',
+    '∏': 'the product',
+    '∫': 'the integral',
+    '∂': 'partial',
+    '∇': 'nabla',
+    '(': 'open paren',
+    ')': 'close paren',
+    '[': 'open bracket',
+    ']': 'close bracket',
+    '{': 'open brace',
+    '}': 'close brace',
+    '|': 'absolute value bar',
+    ',': ',',
+    '!': 'factorial',
+    '′': 'prime',
+    'lim': 'the limit'
+}
+
+# Large operators whose sub/superscripts are read as "from ... to ..."
+BOUNDED_OPERATORS = {'∑', '∏', '∫', 'lim'}
+
+POWERS = {'2': 'squared', '3': 'cubed'}
+
+ROOTS = {'2': 'square', '3': 'cube'}
+
+# Marks placed over a base by \hat, \bar, \vec, \dot, \tilde and \overline
+ACCENTS = {'^': 'hat', '¯': 'bar', '―': 'bar', '→': 'vector', '˙': 'dot', '~': 'tilde'}
+
+
+def _local(tag):
+    """Tag name without the MathML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _symbol(text):
+    """Spoken form of a single identifier, number or operator"""
+    text = (text or '').strip()
+    if text in OPERATORS:
+        return OPERATORS[text]
+    if len(text) == 1 and not text.isascii():
+        name = unicodedata.name(text, '')
+        for prefix, spoken in (('GREEK SMALL LETTER ', ''), ('GREEK CAPITAL LETTER ', 'capital ')):
+            if name.startswith(prefix):
+                return spoken + name[len(prefix):].lower()
+        if name.startswith('DOUBLE-STRUCK CAPITAL '):
+            return 'double-struck ' + name[len('DOUBLE-STRUCK CAPITAL '):]
+        return name.lower() or text
+    return text
+
+
+def _speak(element):
+    tag = _local(element.tag)
+    children = list(element)
+    
+    if tag in ('mi', 'mn', 'mo'):
+        return _symbol(element.text)
+    if tag == 'mtext':
+        return (element.text or '').strip()
+    if tag == 'mfrac' and len(children) == 2:
+        return f"the fraction {_speak(children[0])} over {_speak(children[1])}, end fraction"
+    if tag == 'msqrt':
+        return f"the square root of {_join(children)}, end root"
+    if tag == 'mroot' and len(children) == 2:
+        index = _speak(children[1])
+        return f"the {ROOTS.get(index, index + 'th')} root of {_speak(children[0])}, end root"
+    if tag == 'mover' and len(children) == 2 and (children[1].text or '').strip() in ACCENTS:
+        return f"{_speak(children[0])} {ACCENTS[children[1].text.strip()]}"
+    if tag in ('msup', 'mover') and len(children) == 2:
+        exponent = _speak(children[1])
+        if exponent in POWERS:
+            return f"{_speak(children[0])} {POWERS[exponent]}"
+        return f"{_speak(children[0])} to the power {exponent}"
+    if tag in ('msub', 'munder') and len(children) == 2:
+        if (children[0].text or '').strip() in BOUNDED_OPERATORS:
+            return f"{_speak(children[0])} as {_speak(children[1])} of"
+        return f"{_speak(children[0])} sub {_speak(children[1])}"
+    if tag in ('msubsup', 'munderover') and len(children) == 3:
+        base, lower, upper = (_speak(child) for child in children)
+        if (children[0].text or '').strip() in BOUNDED_OPERATORS:
+            return f"{base} from {lower} to {upper} of"
+        return f"{base} sub {lower} to the power {upper}"
+    return _join(children)
+
+
+def _join(elements):
+    return ' '.join(part for part in (_speak(element) for element in elements) if part)
+
+
+def mathml_to_speech(mathml):
+    """Spoken English for a MathML string"""
+    spoken = _speak(ET.fromstring(mathml))
+    spoken = re.sub(r'\s+,', ',', spoken)
+    return ' '.join(spoken.split())
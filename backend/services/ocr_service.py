@@ -0,0 +1,247 @@
+"""
+OCR Service
+Page-level OCR on a pool of long-lived Tesseract workers
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from config import Config
+from services.worker_pools import get_process_pool
+
+# tesserocr keeps one Tesseract engine loaded per worker (preferred)
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# pytesseract shells out to the tesseract binary on every call (fallback)
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+# pypdfium2 rasterizes PDF pages (installed with pdfplumber)
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+OCR_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
+if not OCR_AVAILABLE:
+    print("Warning: pytesseract not available. OCR features will be disabled.")
+elif not TESSEROCR_AVAILABLE:
+    print("Warning: tesserocr not available. OCR will start a tesseract process per page (pytesseract).")
+
+# Per-worker state, set up once by _init_ocr_worker
+_engine = None
+_language = 'eng'
+
+# In-process OCR (OCR_WORKERS = 0) sets up the same state on first use
+_local_ready = False
+_local_lock = threading.Lock()
+
+
+def _init_ocr_worker(language):
+    """Process pool initializer: load the Tesseract engine once per worker"""
+    global _engine, _language
+    _language = language
+    if TESSEROCR_AVAILABLE:
+        try:
+            _engine = tesserocr.PyTessBaseAPI(lang=language)
+        except Exception as e:
+            print(f"tesserocr initialization warning: {e}")
+            _engine = None
+
+
+def _ocr_image(image):
+    """OCR a PIL image with the worker's engine"""
+    if _engine is not None:
+        _engine.SetImage(image)
+        return _engine.GetUTF8Text()
+    return pytesseract.image_to_string(image, lang=_language)
+
+
+def _ocr_pdf_pages_task(file_path, page_indexes, resolution):
+    """
+    Process pool task: rasterize and OCR several pages of one PDF
+    
+    The document is opened once for the batch and closed before returning,
+    so no handle outlives the task (a re-uploaded file with the same name
+    is always read fresh, and the upload is never left locked). Returns
+    [(text, error)] in page_indexes order; a failed page doesn't fail the rest.
+    """
+    try:
+        pdf = pdfium.PdfDocument(file_path)
+    except Exception as e:
+        # Re-raise as a plain error; some pdfium exceptions cannot be unpickled by the parent
+        raise ValueError(f"Could not open PDF for OCR: {str(e)}") from None
+    
+    try:
+        results = []
+        for page_index in page_indexes:
+            try:
+                page = pdf[page_index]
+                try:
+                    image = page.render(scale=resolution / 72, grayscale=True).to_pil()
+                finally:
+                    page.close()
+                results.append((_ocr_image(image).strip(), None))
+            except Exception as e:
+                results.append((None, f"OCR failed on page {page_index + 1}: {str(e)}"))
+        return results
+    finally:
+        pdf.close()
+
+
+def _ocr_image_file_task(file_path):
+    """Process pool task: OCR an image file"""
+    from PIL import Image
+    try:
+        with Image.open(file_path) as image:
+            return _ocr_image(image).strip()
+    except Exception as e:
+        raise ValueError(str(e))
+
+
+def _run_local(fn, *args):
+    """Run an OCR task in this process, returning a finished Future"""
+    global _local_ready
+    future = Future()
+    # One engine per process, and Tesseract engines are not thread-safe
+    with _local_lock:
+        if not _local_ready:
+            _init_ocr_worker(Config.OCR_LANGUAGE)
+            _local_ready = True
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+    return future
+
+
+class OCRService:
+    """
+    Runs OCR on a dedicated process pool
+    
+    With tesserocr, each worker keeps its Tesseract engine alive between
+    tasks, so OCR cost scales with the number of scanned pages instead of
+    paying engine start-up per call; the pytesseract fallback still starts
+    a tesseract process per page. PDF pages are sent in batches of consecutive
+    scanned pages (OCR_PAGES_PER_TASK), each opening the document once.
+    
+    With OCR_WORKERS = 0, OCR runs in the calling process on one engine
+    kept for the life of the process. Batch and job workers use this, so
+    they don't each start a pool of their own.
+    """
+    
+    @property
+    def available(self):
+        return OCR_AVAILABLE
+    
+    @property
+    def pdf_available(self):
+        return OCR_AVAILABLE and PDFIUM_AVAILABLE
+    
+    def _submit(self, fn, *args):
+        """Start an OCR task on the pool, or run it in-process when OCR_WORKERS is 0"""
+        if Config.OCR_WORKERS <= 0:
+            return _run_local(fn, *args)
+        pool = get_process_pool(
+            'ocr',
+            Config.OCR_WORKERS,
+            initializer=_init_ocr_worker,
+            initargs=(Config.OCR_LANGUAGE,)
+        )
+        return pool.submit(fn, *args)
+    
+    @staticmethod
+    def page_needs_ocr(page_text):
+        """A page without a usable text layer (scanned or image-only)"""
+        return len((page_text or '').strip()) < Config.OCR_MIN_TEXT_CHARS
+    
+    def ocr_image_file(self, file_path):
+        """OCR an image file on the worker pool"""
+        if not self.available:
+            raise ValueError("OCR not available - install tesserocr or pytesseract")
+        return self._submit(_ocr_image_file_task, file_path).result()
+    
+    def fill_missing_text(self, pages, file_path):
+        """
+        OCR pages without a text layer while preserving page order
+        
+        Takes an iterator of page dicts (as yielded by
+        DocumentProcessor.iter_pdf_pages) and yields the same pages, with
+        text-less pages OCRed in parallel. At most a few pages per worker
+        are held in flight, so streaming callers keep flat memory.
+        """
+        if not self.pdf_available:
+            yield from pages
+            return
+        
+        batch_size = max(1, Config.OCR_PAGES_PER_TASK)
+        max_in_flight = max(1, Config.OCR_WORKERS) * 2 * batch_size
+        pending = deque()  # (page, batch or None, slot in batch), in page order
+        batch = None  # {'indexes': [...], 'future': Future or None}, still being filled
+        
+        def submit():
+            nonlocal batch
+            if batch is not None:
+                batch['future'] = self._submit(
+                    _ocr_pdf_pages_task, file_path, batch['indexes'], Config.OCR_RESOLUTION
+                )
+                batch = None
+        
+        def ready(entry):
+            _, page_batch, _ = entry
+            return page_batch is None or (page_batch['future'] is not None and page_batch['future'].done())
+        
+        def finish(page, page_batch, slot):
+            if page_batch is not None:
+                if page_batch['future'] is None:
+                    submit()
+                try:
+                    text, error = page_batch['future'].result()[slot]
+                except Exception as e:
+                    text, error = None, str(e)
+                if error is None:
+                    page['text'] = text
+                    page['ocr'] = True
+                else:
+                    page['ocr_error'] = error
+            return page
+        
+        try:
+            for page in pages:
+                page_batch = slot = None
+                if self.page_needs_ocr(page['text']):
+                    if batch is None:
+                        batch = {'indexes': [], 'future': None}
+                    page_batch, slot = batch, len(batch['indexes'])
+                    batch['indexes'].append(page['page'] - 1)
+                    if len(batch['indexes']) >= batch_size:
+                        submit()
+                else:
+                    # Batches are runs of consecutive scanned pages
+                    submit()
+                pending.append((page, page_batch, slot))
+                
+                # Release finished pages from the head; block only when the window is full
+                while pending and (ready(pending[0]) or len(pending) > max_in_flight):
+                    yield finish(*pending.popleft())
+            
+            submit()
+            while pending:
+                yield finish(*pending.popleft())
+        finally:
+            for _, page_batch, _ in pending:
+                if page_batch is not None and page_batch['future'] is not None:
+                    page_batch['future'].cancel()
+
+
+# Singleton instance
+ocr_service = OCRService()
@@ -0,0 +1,179 @@
+"""
+Document Outline Service
+Single-pass outline index (headings, lists, code blocks, paragraphs) with
+character offsets for screen-reader navigation and lazy section loading
+"""
+
+import re
+from bisect import bisect_right
+
+HEADING_PATTERN = re.compile(r'(#{1,6})\s+(.+)$')
+BULLET_PATTERN = re.compile(r'[\*\-\+]\s+')
+NUMBERED_PATTERN = re.compile(r'\d+\.\s+')
+CODE_FENCE = '```'
+
+# Bump when the scanner changes so stored outlines are rebuilt
+OUTLINE_VERSION = 1
+
+
+class DocumentOutline:
+    """
+    Offsets of a text's structural elements, built in one pass over its lines
+    
+    headings: {'level', 'title', 'start', 'end'}, where start is the heading
+        line and end closes its section (the next heading of the same or a
+        higher level, or the end of the text)
+    lists: {'start', 'end', 'ordered', 'items'} for each run of list items
+        (indented continuation lines and blank lines between items included)
+    code_blocks: {'start', 'end', 'language'} for each ``` fenced block
+    paragraphs: [start, end] for each run of non-blank lines
+    """
+    
+    def __init__(self, length=0, headings=None, lists=None, code_blocks=None, paragraphs=None):
+        self.length = length
+        self.headings = headings or []
+        self.lists = lists or []
+        self.code_blocks = code_blocks or []
+        self.paragraphs = paragraphs or []
+    
+    @classmethod
+    def scan(cls, text):
+        """Build the outline of text"""
+        text = text or ''
+        outline = cls(len(text))
+        offset = 0
+        paragraph_start = None
+        content_end = 0
+        code = None
+        current_list = None
+        
+        for line in text.split('\n'):
+            end = offset + len(line)
+            stripped = line.strip()
+            indented = line[:1].isspace()
+            
+            # Paragraphs: runs of non-blank lines
+            if not stripped:
+                if paragraph_start is not None:
+                    outline.paragraphs.append([paragraph_start, content_end])
+                    paragraph_start = None
+            else:
+                if paragraph_start is None:
+                    paragraph_start = offset
+                content_end = end
+            
+            if code is not None:
+                # Inside a fenced block only the closing fence matters
+                if stripped.startswith(CODE_FENCE):
+                    code['end'] = end
+                    outline.code_blocks.append(code)
+                    code = None
+                offset = end + 1
+                continue
+            
+            # Lists end at the first non-blank line that is neither an item
+            # of the same kind nor an indented continuation
+            item = None
+            if BULLET_PATTERN.match(line):
+                item = False
+            elif NUMBERED_PATTERN.match(line):
+                item = True
+            
+            if current_list is not None and stripped:
+                if item == current_list['ordered'] or (item is None and indented):
+                    current_list['end'] = end
+                    current_list['items'] += item is not None
+                    offset = end + 1
+                    continue
+                outline.lists.append(current_list)
+                current_list = None
+            
+            if stripped.startswith(CODE_FENCE):
+                if CODE_FENCE in stripped[len(CODE_FENCE):]:
+                    outline.code_blocks.append({'start': offset, 'end': end, 'language': None})
+                else:
+                    code = {'start': offset, 'end': None, 'language': stripped[len(CODE_FENCE):].strip() or None}
+            elif item is not None:
+                current_list = {'start': offset, 'end': end, 'ordered': item, 'items': 1}
+            else:
+                heading = HEADING_PATTERN.match(line)
+                if heading:
+                    outline.headings.append({
+                        'level': len(heading.group(1)),
+                        'title': heading.group(2).strip(),
+                        'start': offset,
+                        'end': None
+                    })
+            
+            offset = end + 1
+        
+        if paragraph_start is not None:
+            outline.paragraphs.append([paragraph_start, content_end])
+        if current_list is not None:
+            outline.lists.append(current_list)
+        if code is not None:
+            # An unclosed fence runs to the end of the text
+            code['end'] = len(text)
+            outline.code_blocks.append(code)
+        
+        outline._close_sections()
+        return outline
+    
+    def _close_sections(self):
+        """Set each heading's section end from the headings that follow it"""
+        open_sections = []
+        for heading in self.headings:
+            while open_sections and open_sections[-1]['level'] >= heading['level']:
+                open_sections.pop()['end'] = heading['start']
+            open_sections.append(heading)
+        for heading in open_sections:
+            heading['end'] = self.length
+    
+    @property
+    def bullet_items(self):
+        return sum(block['items'] for block in self.lists if not block['ordered'])
+    
+    @property
+    def numbered_items(self):
+        return sum(block['items'] for block in self.lists if block['ordered'])
+    
+    def section(self, index):
+        """Heading dict for section index, or None if out of range"""
+        if 0 <= index < len(self.headings):
+            return self.headings[index]
+        return None
+    
+    def section_at(self, offset):
+        """Index of the innermost section containing offset, or None before the first heading"""
+        index = bisect_right([heading['start'] for heading in self.headings], offset) - 1
+        while index >= 0 and self.headings[index]['end'] <= offset:
+            index -= 1
+        return index if index >= 0 else None
+    
+    def to_dict(self):
+        return {
+            'version': OUTLINE_VERSION,
+            'length': self.length,
+            'headings': self.headings,
+            'lists': self.lists,
+            'code_blocks': self.code_blocks,
+            'paragraphs': self.paragraphs
+        }
+    
+    @classmethod
+    def from_dict(cls, data, length=None):
+        """
+        Outline from to_dict() output, or None if it is missing, from an
+        older scanner, or (given length) built for a text of another length
+        """
+        if not data or data.get('version') != OUTLINE_VERSION:
+            return None
+        if length is not None and data.get('length') != length:
+            return None
+        return cls(
+            data['length'],
+            data.get('headings'),
+            data.get('lists'),
+            data.get('code_blocks'),
+            data.get('paragraphs')
+        )
@@ -0,0 +1,212 @@
+"""
+PDF Engine Selection
+Per-page choice between a fast pypdf engine and layout-aware pdfplumber
+"""
+
+import re
+import time
+
+import pdfplumber
+
+# pypdf is the maintained successor of PyPDF2; either provides the fast engine
+try:
+    from pypdf import PdfReader
+except ImportError:
+    from PyPDF2 import PdfReader
+
+from config import Config
+
+FAST = 'fast'
+LAYOUT = 'layout'
+AUTO = 'auto'
+PDF_ENGINES = (FAST, LAYOUT, AUTO)
+
+# Rectangle and line-segment operators; many of them usually mean ruled tables
+_DRAWING_OPS = re.compile(rb'\s(?:re|l)\s')
+
+
+def _release_page(page):
+    """Drop pdfplumber's cached layout objects for a page that has been read"""
+    try:
+        if hasattr(page, 'close'):
+            page.close()
+        else:
+            page.flush_cache()
+    except Exception:
+        pass
+
+
+def count_pdf_pages(file_path):
+    """Read the page count from the PDF page tree without parsing content"""
+    try:
+        with open(file_path, 'rb') as file:
+            return len(PdfReader(file).pages)
+    except Exception:
+        return 0
+
+
+class PDFPageExtractor:
+    """
+    Extracts single pages with the configured engine
+    - fast: pypdf text extraction only
+    - layout: pdfplumber (slower, better for columns and tables)
+    - auto: pypdf for simple pages, pdfplumber for complex ones
+    
+    A page that fails in its engine is retried with the other one, so one
+    bad page never costs the rest of the document. Each page records the
+    engine that produced it ('failed' if neither could).
+    """
+    
+    def __init__(self, file_path, mode=None):
+        mode = mode or Config.PDF_ENGINE
+        if mode not in PDF_ENGINES:
+            raise ValueError(f"Unknown PDF engine: {mode}. Use one of {', '.join(PDF_ENGINES)}")
+        self.file_path = file_path
+        self.mode = mode
+        self._file = None
+        self._reader = None
+        self._plumber = None
+        self._open_errors = {}
+    
+    def __enter__(self):
+        try:
+            self._file = open(self.file_path, 'rb')
+            self._reader = PdfReader(self._file)
+        except Exception as e:
+            self._open_errors[FAST] = str(e)
+            self._reader = None
+        
+        if self.mode != FAST or self._reader is None:
+            try:
+                self._plumber = pdfplumber.open(self.file_path)
+            except Exception as e:
+                self._open_errors[LAYOUT] = str(e)
+        
+        if self._reader is None and self._plumber is None:
+            self.close()
+            raise ValueError(f"Error extracting PDF: {self._open_errors.get(LAYOUT) or self._open_errors.get(FAST)}")
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._reader = None
+    
+    @property
+    def page_count(self):
+        if self._reader is not None:
+            return len(self._reader.pages)
+        return len(self._plumber.pages)
+    
+    def _layout_available(self):
+        if self._plumber is None and LAYOUT not in self._open_errors:
+            try:
+                self._plumber = pdfplumber.open(self.file_path)
+            except Exception as e:
+                self._open_errors[LAYOUT] = str(e)
+        return self._plumber is not None
+    
+    def _is_complex(self, index):
+        """
+        Cheap complexity check from the page dictionary and content stream:
+        embedded images/forms, many fonts, or lots of ruling lines
+        """
+        try:
+            page = self._reader.pages[index]
+            resources = page.get('/Resources') or {}
+            resources = resources.get_object() if hasattr(resources, 'get_object') else resources
+            
+            xobjects = resources.get('/XObject')
+            if xobjects and len(xobjects.get_object()) > 0:
+                return True
+            
+            fonts = resources.get('/Font')
+            if fonts and len(fonts.get_object()) > Config.PDF_AUTO_MAX_SIMPLE_FONTS:
+                return True
+            
+            contents = page.get_contents()
+            if contents is not None:
+                data = contents.get_data()
+                if len(_DRAWING_OPS.findall(data)) > Config.PDF_AUTO_MAX_SIMPLE_DRAWING_OPS:
+                    return True
+            return False
+        except Exception:
+            return True
+    
+    def _choose(self, index):
+        if self.mode == FAST or (self.mode == AUTO and not self._is_complex(index)):
+            return FAST if self._reader is not None else LAYOUT
+        return LAYOUT if self._layout_available() else FAST
+    
+    def _extract_fast(self, index):
+        page = self._reader.pages[index]
+        images = []
+        try:
+            xobjects = page['/Resources'].get_object().get('/XObject')
+            if xobjects:
+                for name, ref in xobjects.get_object().items():
+                    if ref.get_object().get('/Subtype') == '/Image':
+                        images.append({'page': index + 1, 'bbox': None, 'name': str(name)})
+        except Exception:
+            pass
+        return page.extract_text() or '', images
+    
+    def _extract_layout(self, index):
+        page = self._plumber.pages[index]
+        try:
+            page_text = page.extract_text() or ''
+            images = []
+            if hasattr(page, 'images'):
+                for img in page.images:
+                    images.append({
+                        'page': index + 1,
+                        'bbox': img.get('bbox', None)
+                    })
+            return page_text, images
+        finally:
+            _release_page(page)
+    
+    def extract(self, index):
+        """Extract one zero-based page, falling back to the other engine on error"""
+        engine = self._choose(index)
+        attempts = [engine]
+        
+        errors = []
+        for attempt in attempts:
+            started = time.perf_counter()
+            try:
+                if attempt == FAST:
+                    page_text, images = self._extract_fast(index)
+                else:
+                    page_text, images = self._extract_layout(index)
+                return {
+                    'page': index + 1,
+                    'text': page_text,
+                    'images': images,
+                    'engine': attempt,
+                    'seconds': round(time.perf_counter() - started, 4)
+                }
+            except Exception as e:
+                errors.append(f"{attempt}: {str(e)}")
+                # Only a failed primary engine opens the other one (pdfplumber
+                # parses the whole document on open)
+                if attempt == engine:
+                    fallback = LAYOUT if engine == FAST else FAST
+                    if (fallback == FAST and self._reader is not None) or (fallback == LAYOUT and self._layout_available()):
+                        attempts.append(fallback)
+        
+        return {
+            'page': index + 1,
+            'text': '',
+            'images': [],
+            'engine': 'failed',
+            'seconds': 0.0,
+            'error': '; '.join(errors)
+        }
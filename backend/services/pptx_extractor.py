@@ -0,0 +1,264 @@
+"""
+PPTX Extraction Engine
+Streams slides from the PPTX zip for text, notes, tables and images
+"""
+
+import math
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+from services.worker_pools import get_process_pool, discard_pool
+
+A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+REL_TYPE_BASE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+SLIDE_REL_TYPE = REL_TYPE_BASE + 'slide'
+NOTES_REL_TYPE = REL_TYPE_BASE + 'notesSlide'
+IMAGE_REL_TYPE = REL_TYPE_BASE + 'image'
+
+PRESENTATION_PART = 'ppt/presentation.xml'
+TITLE_PLACEHOLDERS = {'title', 'ctrTitle'}
+
+
+def _rels_part(part):
+    """Relationship part name for a package part"""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', name + '.rels')
+
+
+def _read_rels(zf, part):
+    """Map of relationship id -> (type, resolved target part) for a part"""
+    try:
+        root = ET.fromstring(zf.read(_rels_part(part)))
+    except KeyError:
+        return {}
+    
+    rels = {}
+    folder = posixpath.dirname(part)
+    for rel in root.iter(PKG_REL + 'Relationship'):
+        target = rel.get('Target', '')
+        if rel.get('TargetMode') != 'External':
+            target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+
+def slide_parts(zf):
+    """Slide part names in presentation order"""
+    rels = _read_rels(zf, PRESENTATION_PART)
+    root = ET.fromstring(zf.read(PRESENTATION_PART))
+    parts = []
+    for slide_id in root.iter(P + 'sldId'):
+        rel = rels.get(slide_id.get(R + 'id'))
+        if rel and rel[0] == SLIDE_REL_TYPE:
+            parts.append(rel[1])
+    return parts
+
+
+def _parse_shapes(stream, image_rels=None, body_only=False):
+    """
+    One iterparse pass over a slide (or notes) part
+    
+    Returns (title, text paragraphs, tables, image targets). With body_only,
+    only text in body placeholders is kept, which skips the slide image and
+    slide number placeholders of a notes page.
+    """
+    title = None
+    paragraphs = []
+    tables = []
+    images = []
+    
+    shape_placeholder = None  # Placeholder type of the current p:sp, if any
+    in_shape = False
+    paragraph = None
+    table = None
+    table_above = {}  # column -> text, for vertically merged cells
+    row = None
+    row_text = None  # Unmerged cell texts of the current row, for the text output
+    cell = None
+    
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        
+        if event == 'start':
+            if tag == P + 'sp':
+                in_shape = True
+                shape_placeholder = None
+            elif tag == P + 'ph' and in_shape:
+                shape_placeholder = elem.get('type', 'body')
+            elif tag == A + 'p':
+                paragraph = []
+            elif tag == A + 'br' and paragraph is not None:
+                paragraph.append('\n')
+            elif tag == A + 'tbl':
+                table = []
+                table_above = {}
+            elif tag == A + 'tr' and table is not None:
+                row = []
+                row_text = []
+            elif tag == A + 'tc' and row is not None:
+                cell = {
+                    'paragraphs': [],
+                    'h_merge': elem.get('hMerge') in ('1', 'true'),
+                    'v_merge': elem.get('vMerge') in ('1', 'true')
+                }
+            elif tag == A + 'blip' and image_rels is not None:
+                rel = image_rels.get(elem.get(R + 'embed'))
+                if rel and rel[0] == IMAGE_REL_TYPE:
+                    images.append(rel[1])
+            continue
+        
+        if tag == A + 't' and paragraph is not None:
+            paragraph.append(elem.text or '')
+        elif tag == A + 'p' and paragraph is not None:
+            paragraph_text = ''.join(paragraph)
+            paragraph = None
+            if cell is not None:
+                cell['paragraphs'].append(paragraph_text)
+            elif body_only and (not in_shape or shape_placeholder != 'body'):
+                pass
+            elif paragraph_text.strip():
+                if title is None and shape_placeholder in TITLE_PLACEHOLDERS:
+                    title = paragraph_text
+                paragraphs.append(paragraph_text)
+        elif tag == A + 'tc' and cell is not None:
+            # Cells covered by a merge repeat the merged cell's text, keeping rows grid-aligned
+            if cell['h_merge'] and row:
+                cell_text = row[-1]
+            elif cell['v_merge']:
+                cell_text = table_above.get(len(row), '')
+            else:
+                cell_text = '\n'.join(cell['paragraphs'])
+                if cell_text:
+                    row_text.append(cell_text)
+            table_above[len(row)] = cell_text
+            row.append(cell_text)
+            cell = None
+        elif tag == A + 'tr' and row is not None:
+            table.append(row)
+            if row_text:
+                paragraphs.append(' | '.join(row_text))
+            row = None
+        elif tag == A + 'tbl' and table is not None:
+            tables.append(table)
+            table = None
+        elif tag == P + 'sp':
+            in_shape = False
+            shape_placeholder = None
+        
+        elem.clear()
+    
+    return title, paragraphs, tables, images
+
+
+def extract_slide(zf, part, number):
+    """Extract one slide, including its speaker notes"""
+    rels = _read_rels(zf, part)
+    with zf.open(part) as stream:
+        title, paragraphs, tables, images = _parse_shapes(stream, image_rels=rels)
+    
+    notes = ''
+    for rel_type, target in rels.values():
+        if rel_type == NOTES_REL_TYPE and target in zf.NameToInfo:
+            with zf.open(target) as stream:
+                notes = '\n'.join(_parse_shapes(stream, body_only=True)[1])
+            break
+    
+    return {
+        'page': number,
+        'slide': number,
+        'title': title,
+        'text': '\n'.join(paragraphs),
+        'notes': notes,
+        'tables': tables,
+        'images': [{'page': number, 'type': 'embedded', 'target': target} for target in images]
+    }
+
+
+def _extract_slide_batch(file_path, batch):
+    """Process pool task: extract a batch of (part, number) slides"""
+    with zipfile.ZipFile(file_path) as zf:
+        return [extract_slide(zf, part, number) for part, number in batch]
+
+
+def iter_slides(file_path):
+    """Yield slides one at a time in presentation order"""
+    with zipfile.ZipFile(file_path) as zf:
+        for number, part in enumerate(slide_parts(zf), 1):
+            yield extract_slide(zf, part, number)
+
+
+def iter_slides_parallel(file_path, parts):
+    """Extract slide batches on the shared process pool, yielding in order"""
+    workers = Config.PPTX_PARALLEL_WORKERS
+    pool = get_process_pool('pptx-extract', workers)
+    numbered = [(part, number) for number, part in enumerate(parts, 1)]
+    batch_size = max(1, math.ceil(len(numbered) / (workers * 4)))
+    
+    futures = [
+        pool.submit(_extract_slide_batch, file_path, numbered[i:i + batch_size])
+        for i in range(0, len(numbered), batch_size)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def collect_slides(slides):
+    """Merge per-slide results into the same shape as PDF extraction"""
+    parts = []
+    images = []
+    tables = []
+    page_summaries = []
+    slide_count = 0
+    
+    for slide in slides:
+        slide_count += 1
+        section = slide['text']
+        if slide['notes']:
+            section = f"{section}\nSpeaker notes:\n{slide['notes']}".strip()
+        if section:
+            parts.append(f"--- Slide {slide['slide']} ---\n{section}")
+        images.extend(slide['images'])
+        tables.extend(slide['tables'])
+        page_summaries.append({
+            'page': slide['page'],
+            'title': slide['title'],
+            'chars': len(slide['text']),
+            'has_notes': bool(slide['notes'])
+        })
+    
+    return {
+        'text': '\n'.join(parts).strip(),
+        'page_count': slide_count,
+        'slide_count': slide_count,
+        'images': images,
+        'has_images': len(images) > 0,
+        'tables': tables,
+        'has_tables': len(tables) > 0,
+        'pages': page_summaries
+    }
+
+
+def extract_pptx(file_path):
+    """Extract a deck, spreading slides across processes for large decks"""
+    with zipfile.ZipFile(file_path) as zf:
+        parts = slide_parts(zf)
+    
+    if Config.PPTX_PARALLEL_WORKERS > 1 and len(parts) >= max(1, Config.PPTX_PARALLEL_MIN_SLIDES):
+        try:
+            return collect_slides(iter_slides_parallel(file_path, parts))
+        except BrokenProcessPool as e:
+            print(f"⚠️ Parallel PPTX extraction failed, falling back to serial: {e}")
+            discard_pool('pptx-extract')
+    return collect_slides(iter_slides(file_path))
@@ -0,0 +1,20 @@
+"""
+Progress Reporting
+Optional progress hooks for long-running service calls
+"""
+
+
+def report_progress(progress, stage, percent, **detail):
+    """
+    Call a progress hook if one was given
+    
+    Hooks are called as progress(stage, percent, **detail), e.g.
+    progress('extract', 40, pages_done=8, page_count=20). A failing hook
+    is logged and ignored so it can never break the work it observes.
+    """
+    if progress is None:
+        return
+    try:
+        progress(stage, max(0, min(100, int(percent))), **detail)
+    except Exception as e:
+        print(f"⚠️ Progress hook failed: {e}")
@@ -0,0 +1,161 @@
+"""
+Text Analysis Service
+Sentence boundaries, word and syllable counts and document outline built
+once, shared by every accessibility transformation of the same text
+"""
+
+import re
+from functools import lru_cache
+import nltk
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+import pyphen
+from services.outline import DocumentOutline
+
+# Download required NLTK data
+try:
+    nltk.data.find('tokenizers/punkt')
+except LookupError:
+    nltk.download('punkt')
+
+# Words as readability formulas count them: contractions and hyphenated
+# compounds are one word, bare punctuation is none
+WORD_PATTERN = re.compile(r"[^\W_]+(?:['’\-][^\W_]+)*")
+
+# Sentences longer than this are candidates for splitting
+LONG_SENTENCE_WORDS = 20
+
+_hyphenator = pyphen.Pyphen(lang='en_US')
+
+
+def _load_sentence_tokenizer():
+    """Trained English Punkt model, or an untrained splitter if the data is missing"""
+    try:
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+    except Exception:
+        pass
+    
+    try:
+        # Newer NLTK releases ship the model as punkt_tab instead of a pickle
+        from nltk.tokenize.punkt import PunktTokenizer
+        return PunktTokenizer('english')
+    except Exception:
+        print("Warning: Punkt sentence model not available, using untrained splitter")
+        return PunktSentenceTokenizer()
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word):
+    """Syllables in a lowercase word (pyphen hyphenation points, as textstat counts them)"""
+    return max(1, len(_hyphenator.positions(word)) + 1)
+
+
+def flesch_kincaid_grade(words, sentences, syllables):
+    """Flesch-Kincaid grade level from word, sentence and syllable counts"""
+    if not words:
+        return 0.0
+    return 0.39 * words / max(1, sentences) + 11.8 * syllables / words - 15.59
+
+
+def flesch_reading_ease(words, sentences, syllables):
+    """Flesch reading ease score from word, sentence and syllable counts"""
+    if not words:
+        return 0.0
+    return 206.835 - 1.015 * words / max(1, sentences) - 84.6 * syllables / words
+
+
+class AnalyzedDocument:
+    """
+    Linguistic and structural facts about one text
+    
+    Sentence positions are (start, end) character spans into text;
+    headings, lists, code blocks and paragraphs are in outline, a
+    services.outline.DocumentOutline.
+    """
+    
+    def __init__(self, text):
+        self.text = text
+        self.sentence_spans = []
+        self.sentence_word_counts = []
+        self.word_count = 0
+        self.syllable_count = 0
+        self.outline = DocumentOutline()
+    
+    @property
+    def sentences(self):
+        return [self.text[start:end] for start, end in self.sentence_spans]
+    
+    @property
+    def sentence_count(self):
+        return max(1, sum(1 for words in self.sentence_word_counts if words))
+    
+    @property
+    def words_per_sentence(self):
+        return self.word_count / self.sentence_count
+    
+    @property
+    def syllables_per_word(self):
+        return self.syllable_count / self.word_count if self.word_count else 0.0
+    
+    @property
+    def grade_level(self):
+        """Flesch-Kincaid grade level"""
+        return flesch_kincaid_grade(self.word_count, self.sentence_count, self.syllable_count)
+    
+    @property
+    def reading_ease(self):
+        """Flesch reading ease score"""
+        return flesch_reading_ease(self.word_count, self.sentence_count, self.syllable_count)
+    
+    def counts(self):
+        """Raw readability counts, which add up across parts of a text"""
+        return {
+            'words': self.word_count,
+            'sentences': sum(1 for words in self.sentence_word_counts if words),
+            'syllables': self.syllable_count
+        }
+    
+    def metrics(self):
+        """Readability summary suitable for a JSON response"""
+        return {
+            'grade_level': round(self.grade_level, 1),
+            'ease_score': round(self.reading_ease, 1),
+            'sentences': self.sentence_count,
+            'words': self.word_count,
+            'syllables': self.syllable_count
+        }
+
+
+class TextAnalyzer:
+    
+    def __init__(self):
+        self.sentence_tokenizer = _load_sentence_tokenizer()
+    
+    def analyze(self, text):
+        """Build an AnalyzedDocument for text"""
+        doc = AnalyzedDocument(text or '')
+        self._count_words(doc)
+        doc.outline = DocumentOutline.scan(doc.text)
+        return doc
+    
+    def _count_words(self, doc):
+        """Sentence spans plus per-sentence word counts and total syllables"""
+        spans = list(self.sentence_tokenizer.span_tokenize(doc.text))
+        counts = [0] * len(spans)
+        syllables = 0
+        index = 0
+        
+        for match in WORD_PATTERN.finditer(doc.text):
+            while index < len(spans) - 1 and match.start() >= spans[index][1]:
+                index += 1
+            if spans:
+                counts[index] += 1
+            syllables += count_syllables(match.group().lower())
+        
+        doc.sentence_spans = spans
+        doc.sentence_word_counts = counts
+        doc.word_count = sum(counts) if spans else 0
+        doc.syllable_count = syllables if spans else 0
+
+
+# Singleton instance
+text_analyzer = TextAnalyzer()
@@ -0,0 +1,145 @@
+"""
+Transformation Runner
+Runs the adaptations of a full transformation concurrently under one deadline
+"""
+
+import time
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+from services.chunked_ops import (
+    ANALYZED_ADAPTATIONS, adaptation_pool, run_adaptation, split_text, should_chunk, merge_chunks, chunk_task
+)
+from services.text_analysis import text_analyzer
+from services.worker_pools import get_thread_pool, discard_pool
+
+# Key in the response's results for each adaptation name
+RESULT_KEYS = {
+    'simplify': 'simplified',
+    'dyslexia': 'dyslexia_formatted',
+    'key_points': 'key_points',
+    'structure': 'structure',
+    'math': 'math_processed',
+    'tts': 'tts'
+}
+
+# CPU-bound adaptations run on the process pool
+CPU_ADAPTATIONS = ('simplify', 'dyslexia', 'key_points', 'structure', 'math')
+
+
+def _adaptation_task(name, text, options, analysis):
+    """Run one adaptation in a worker process"""
+    try:
+        return run_adaptation(name, text, options, analysis)
+    except Exception as e:
+        # Re-raise as a plain ValueError so the parent can always unpickle it
+        raise ValueError(str(e)) from None
+
+
+class TransformationRunner:
+    """
+    Schedule each requested adaptation as an independent task
+    
+    CPU-bound adaptations go to a shared process pool (ADAPTATION_WORKERS),
+    I/O-bound ones such as TTS to a thread pool (ADAPTATION_IO_WORKERS), so
+    a slow TTS call overlaps the text work instead of being added to it.
+    On long texts, adaptations that support it run as one task per chunk
+    (see services.chunked_ops). Whatever has not finished by the deadline
+    is reported as timed out and the rest is returned.
+    """
+    
+    def _process_pool(self):
+        return adaptation_pool()
+    
+    def _thread_pool(self):
+        return get_thread_pool('adaptation-io', Config.ADAPTATION_IO_WORKERS)
+    
+    @staticmethod
+    def deadline(requested=None):
+        """Per-request deadline in seconds: requested value capped at TRANSFORMATION_DEADLINE"""
+        try:
+            seconds = float(requested) if requested is not None else Config.TRANSFORMATION_DEADLINE
+        except (TypeError, ValueError):
+            seconds = Config.TRANSFORMATION_DEADLINE
+        return max(0.1, min(seconds, Config.TRANSFORMATION_DEADLINE))
+    
+    def run(self, text, adaptations, options=None, io_tasks=None, deadline=None):
+        """
+        Run adaptations on text and return (results, timed_out)
+        
+        options holds per-adaptation settings (simplify_grade). io_tasks
+        maps adaptation names to zero-argument callables run on threads.
+        results is keyed like RESULT_KEYS; a failed adaptation gets
+        {'error': ...} and a timed-out one is left out of results and
+        listed by name in timed_out.
+        """
+        options = options or {}
+        started = time.monotonic()
+        timeout = self.deadline(deadline)
+        futures = {}
+        
+        # Start the I/O tasks first: they are usually the slowest
+        for name, task in (io_tasks or {}).items():
+            if name in adaptations:
+                futures[self._thread_pool().submit(task)] = name
+        
+        requested = [name for name in CPU_ADAPTATIONS if name in adaptations]
+        chunked = [name for name in requested if should_chunk(name, text)]
+        spans = split_text(text) if chunked else []
+        if len(spans) < 2:
+            chunked = []
+        
+        # Chunks are analyzed in the workers; describe_structure only needs
+        # the outline, which it scans itself when there is no analysis
+        analysis = None
+        if ANALYZED_ADAPTATIONS.intersection(requested).difference(chunked, {'structure'}):
+            analysis = text_analyzer.analyze(text)
+        
+        pool = self._process_pool()
+        for name in requested:
+            if name in chunked:
+                for index, (start, end) in enumerate(spans):
+                    futures[pool.submit(chunk_task, name, text[start:end], options)] = (name, index)
+                continue
+            shared = analysis if name in ANALYZED_ADAPTATIONS else None
+            futures[pool.submit(_adaptation_task, name, text, options, shared)] = name
+        
+        remaining = max(0, timeout - (time.monotonic() - started))
+        done, not_done = wait(futures, timeout=remaining)
+        
+        results = {}
+        chunk_results = {name: [None] * len(spans) for name in chunked}
+        for future in done:
+            name = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                discard_pool('adaptations')
+                result = {'error': f'Worker process failed: {e}'}
+            except Exception as e:
+                result = {'error': str(e)}
+            
+            if isinstance(name, tuple):
+                # Chunk tasks return (result, counts); a failed one has no counts
+                name, index = name
+                chunk_results[name][index] = result if isinstance(result, tuple) else (result, None)
+            else:
+                results[RESULT_KEYS.get(name, name)] = result
+        
+        # Queued tasks are cancelled; running ones finish in the background
+        # and their results are discarded
+        for future in not_done:
+            future.cancel()
+        unfinished = {futures[f][0] if isinstance(futures[f], tuple) else futures[f] for f in not_done}
+        timed_out = [name for name in adaptations if name in unfinished]
+        
+        for name in chunked:
+            if name not in unfinished:
+                results[RESULT_KEYS.get(name, name)] = merge_chunks(name, text, spans, chunk_results[name], options)
+        
+        return results, timed_out
+
+
+# Singleton instance
+transformation_runner = TransformationRunner()
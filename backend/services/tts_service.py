@@ -29,6 +29,7 @@ except ImportError:
     print("Warning: pyttsx3 not available. Offline TTS will be disabled.")
 
 from config import Config
+from services.progress import report_progress
 
 class TTSService:
     
@@ -159,8 +160,24 @@ class TTSService:
         except Exception as e:
             raise ValueError(f"pyttsx3 error: {str(e)}")
     
-    def generate_speech(self, text, output_path, provider='google', **kwargs):
-        """Main TTS generation method with fallback"""
+    @staticmethod
+    def provider_options(provider, language='en-US', voice='en-US-Neural2-C', speaking_rate=1.0):
+        """Map generic request options to (provider, provider-specific kwargs)"""
+        if provider == 'google':
+            return 'google', {'language': language, 'voice_name': voice, 'speaking_rate': speaking_rate}
+        elif provider == 'polly':
+            return 'polly', {'voice_id': voice, 'language_code': language}
+        elif provider == 'gtts':
+            return 'gtts', {'language': language.split('-')[0]}  # Extract base language
+        else:
+            return 'gtts', {}
+    
+    def generate_speech(self, text, output_path, provider='google', progress=None, **kwargs):
+        """
+        Main TTS generation method with fallback
+        
+        progress, if given, receives ('synthesize', percent, ...) after each chunk.
+        """
         
         # Chunk large text
         if len(text) > 5000:
@@ -169,6 +186,7 @@ class TTSService:
             chunks = [text]
         
         results = []
+        report_progress(progress, 'synthesize', 0, chunks_done=0, chunk_count=len(chunks))
         
         for i, chunk in enumerate(chunks):
             chunk_path = output_path if len(chunks) == 1 else output_path.replace('.mp3', f'_part{i+1}.mp3')
@@ -194,6 +212,11 @@ class TTSService:
                     results.append(result)
                 except:
                     raise ValueError(f"All TTS providers failed: {str(e)}")
+            
+            report_progress(
+                progress, 'synthesize', (i + 1) * 100 / len(chunks),
+                chunks_done=i + 1, chunk_count=len(chunks)
+            )
         
         return {
             'success': True,
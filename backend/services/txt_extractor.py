@@ -0,0 +1,184 @@
+"""
+TXT Extraction Engine
+Chunked, constant-memory text reading with encoding detection
+"""
+
+import codecs
+import io
+import re
+
+from config import Config
+
+# charset_normalizer ships with requests; used when the sample is neither
+# UTF-8 nor plausible cp1252
+try:
+    from charset_normalizer import from_bytes
+    from charset_normalizer.utils import is_multi_byte_encoding
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+FALLBACK_ENCODING = 'cp1252'
+
+# Control characters (other than whitespace) and cp1252's undefined bytes
+CONTROL_PATTERN = re.compile(r'[\x00-\x08\x0b\x0e-\x1f\x7f\ufffd]')
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7f]')
+
+# Thresholds, as fractions of the decoded sample
+CP1252_MAX_CONTROL = 0.01  # Binary or a different single-byte code page beyond this
+CP1252_MAX_NON_ASCII = 0.3  # Western European text is mostly ASCII; Cyrillic or Greek is not
+UTF16_MIN_NULS = 0.3  # NULs at one byte parity: ASCII-range UTF-16 without a BOM
+UTF16_MAX_OTHER_NULS = 0.05
+
+# charset_normalizer matches trusted without a further check
+CHARSET_MAX_CHAOS = 0.1
+CHARSET_MIN_COHERENCE = 0.1
+
+
+def _decodes(sample, encoding):
+    try:
+        # Incremental decode tolerates a multi-byte character cut off at the end
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _utf16_without_bom(sample):
+    """'utf-16-le' or 'utf-16-be' if NULs fill alternate bytes of sample, else None"""
+    half = len(sample) // 2
+    if half < 2:
+        return None
+    even_nuls = sample[0::2].count(0)
+    odd_nuls = sample[1::2].count(0)
+    for encoding, nuls, other in (('utf-16-le', odd_nuls, even_nuls), ('utf-16-be', even_nuls, odd_nuls)):
+        if nuls >= half * UTF16_MIN_NULS and other <= half * UTF16_MAX_OTHER_NULS and _decodes(sample, encoding):
+            return encoding
+    return None
+
+
+def _plausible_cp1252(sample):
+    """Whether sample reads as Western European text in cp1252"""
+    text = sample.decode('cp1252', errors='replace')
+    if not text:
+        return False
+    return (
+        len(CONTROL_PATTERN.findall(text)) <= len(text) * CP1252_MAX_CONTROL and
+        len(NON_ASCII_PATTERN.findall(text)) <= len(text) * CP1252_MAX_NON_ASCII
+    )
+
+
+def _confident_match(sample):
+    """charset_normalizer's guess for sample, or None unless it is clean and coherent"""
+    if not CHARSET_NORMALIZER_AVAILABLE:
+        return None
+    match = from_bytes(sample).best()
+    if match is None or match.chaos > CHARSET_MAX_CHAOS:
+        return None
+    # Coherence is language-frequency based and reads 0 for CJK text; a
+    # clean multi-byte decode is itself strong evidence
+    if match.coherence < CHARSET_MIN_COHERENCE and not is_multi_byte_encoding(match.encoding):
+        return None
+    return match.encoding
+
+
+def sniff_encoding(sample):
+    """
+    Guess the encoding of a file from its first block of bytes
+    
+    In order: a BOM, UTF-16 without a BOM (NULs in alternate bytes; NULs
+    are valid UTF-8), UTF-8, cp1252 if the sample reads as Western European
+    text, then charset_normalizer when it is confident. Anything else is
+    read as cp1252 with undecodable bytes replaced.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    
+    encoding = _utf16_without_bom(sample)
+    if encoding:
+        return encoding
+    
+    if _decodes(sample, 'utf-8'):
+        return 'utf-8'
+    
+    # Short samples give charset_normalizer too little to go on (it reads
+    # cp1252 French as cp775), so the common case is tried first
+    if _plausible_cp1252(sample):
+        return 'cp1252'
+    
+    return _confident_match(sample) or FALLBACK_ENCODING
+
+
+class TextFileReader:
+    """
+    Reads a text file in fixed-size chunks
+    
+    The encoding is sniffed from the first block; undecodable bytes are
+    replaced rather than failing the upload. Line and word counts are
+    updated as chunks are read (words split across a chunk boundary are
+    counted once), so callers that stream chunks never hold the whole file.
+    """
+    
+    def __init__(self, file_path, chunk_size=None, encoding=None):
+        self.file_path = file_path
+        self.chunk_size = chunk_size or Config.TXT_CHUNK_SIZE
+        if encoding is None:
+            with open(file_path, 'rb') as file:
+                encoding = sniff_encoding(file.read(Config.TXT_SNIFF_BYTES))
+        self.encoding = encoding
+        self.line_count = 0
+        self.word_count = 0
+        self.char_count = 0
+    
+    def chunks(self):
+        """Yield decoded text chunks, updating the running counts"""
+        self.line_count = 1
+        self.word_count = 0
+        self.char_count = 0
+        ends_in_word = False
+        
+        with open(self.file_path, 'rb') as raw:
+            # Universal newlines, matching open(path, 'r')
+            with io.TextIOWrapper(raw, encoding=self.encoding, errors='replace') as file:
+                while True:
+                    chunk = file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    
+                    self.char_count += len(chunk)
+                    self.line_count += chunk.count('\n')
+                    self.word_count += len(chunk.split())
+                    if ends_in_word and not chunk[0].isspace():
+                        self.word_count -= 1  # Same word continues from the last chunk
+                    ends_in_word = not chunk[-1].isspace()
+                    
+                    yield chunk
+    
+    def stats(self):
+        return {
+            'line_count': self.line_count,
+            'word_count': self.word_count,
+            'char_count': self.char_count,
+            'encoding': self.encoding
+        }
+
+
+def extract_txt(file_path):
+    """Read a text file with encoding detection and incremental counts"""
+    reader = TextFileReader(file_path)
+    text = ''.join(reader.chunks())
+    
+    return {
+        'text': text.strip(),
+        **reader.stats()
+    }
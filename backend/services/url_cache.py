@@ -0,0 +1,134 @@
+"""
+URL Cache Service
+Persistent cache of URL extraction results with HTTP revalidation
+"""
+
+import hashlib
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from config import Config
+from services.extraction_cache import ExtractionCache
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """
+    Canonical form of a URL for cache keys
+    
+    Lowercases the scheme and host, drops default ports and the fragment,
+    sorts query parameters and uses '/' for an empty path.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f'[{host}]'  # IPv6
+    
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{host}:{parts.port}'
+    if parts.username:
+        userinfo = parts.username + (f':{parts.password}' if parts.password else '')
+        netloc = f'{userinfo}@{netloc}'
+    
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class URLCache:
+    """
+    Extraction results per URL, revalidated with conditional GETs
+    
+    Entries younger than URL_CACHE_TTL_SECONDS are served without any
+    request. Older entries are revalidated with If-None-Match /
+    If-Modified-Since; a 304 renews the entry so the page is not
+    downloaded or parsed again. Storage is an LRU ExtractionCache, so
+    entries survive restarts and are shared by every worker process.
+    """
+    
+    def __init__(self, cache_dir, max_bytes, ttl_seconds):
+        self.store = ExtractionCache(cache_dir, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self.counts = {'hit': 0, 'revalidated': 0, 'stale': 0, 'miss': 0}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(url):
+        """Stable digest of the normalized URL (same across processes and restarts)"""
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+    
+    def lookup(self, url, include_markdown=False):
+        """Cached entry for url, or None (entries without markdown can't serve markdown requests)"""
+        entry = self.store.get(self.key(url))
+        if entry is None or (include_markdown and not entry.get('has_markdown')):
+            return None
+        return entry
+    
+    def is_fresh(self, entry):
+        return time.time() - entry.get('validated_at', 0) < self.ttl_seconds
+    
+    @staticmethod
+    def conditional_headers(entry):
+        """Validators from a cached entry, as request headers"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    @staticmethod
+    def is_storable(response):
+        return 'no-store' not in response.headers.get('Cache-Control', '').lower()
+    
+    def store_result(self, url, result, response, include_markdown=False):
+        """Cache a successful extraction along with the response validators"""
+        if not self.is_storable(response):
+            return
+        self.store.put(self.key(url), {
+            'url': normalize_url(url),
+            'validated_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'has_markdown': include_markdown,
+            'result': result
+        })
+    
+    def renew(self, url, entry, response):
+        """Record a 304: the cached result is current again"""
+        entry['validated_at'] = time.time()
+        # A 304 may carry updated validators
+        entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+        entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+        self.store.put(self.key(url), entry)
+    
+    def serve(self, entry, status):
+        """The cached result, tagged with how it was served (hit, revalidated, stale)"""
+        self.record(status)
+        return {**entry['result'], 'cache': status}
+    
+    def record(self, status):
+        with self._lock:
+            self.counts[status] += 1
+    
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+        lookups = sum(counts.values())
+        served = counts['hit'] + counts['revalidated'] + counts['stale']
+        return {
+            **counts,
+            'hit_rate': round(served / lookups, 3) if lookups else 0.0,
+            'ttl_seconds': self.ttl_seconds,
+            'storage': self.store.stats()
+        }
+    
+    def clear(self):
+        self.store.clear()
+
+
+# Singleton instance
+url_cache = URLCache(Config.URL_CACHE_DIR, Config.URL_CACHE_MAX_BYTES, Config.URL_CACHE_TTL_SECONDS)
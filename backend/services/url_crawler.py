@@ -0,0 +1,237 @@
+"""
+URL Crawler Service
+Concurrent multi-URL import and same-site crawling
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlsplit, urldefrag
+from urllib.robotparser import RobotFileParser
+
+from config import Config
+from services.http_client import http_client
+from services.url_cache import url_cache, normalize_url
+from services.url_processor import URLProcessor
+from services.worker_pools import get_thread_pool, iter_completed
+
+# Links to files that are not pages are not followed
+SKIPPED_EXTENSIONS = {
+    '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.zip', '.gz',
+    '.mp3', '.mp4', '.avi', '.mov', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx',
+    '.css', '.js', '.json', '.xml'
+}
+
+
+def _host(url):
+    return (urlsplit(url).hostname or '').lower()
+
+
+def _site(url):
+    """Host without a leading www., so example.com and www.example.com are one site"""
+    host = _host(url)
+    return host[4:] if host.startswith('www.') else host
+
+
+class HostThrottle:
+    """
+    Per-host politeness limits shared by every import in this process
+    
+    At most URL_HOST_CONCURRENCY requests run against one host at a time,
+    and request starts to the same host are spaced URL_HOST_DELAY apart.
+    Different hosts never wait on each other.
+    """
+    
+    def __init__(self, concurrency, delay):
+        self.concurrency = max(1, concurrency)
+        self.delay = delay
+        self._hosts = {}  # host -> {'semaphore', 'next_start'}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def slot(self, url):
+        host = _host(url)
+        with self._lock:
+            state = self._hosts.setdefault(host, {
+                'semaphore': threading.BoundedSemaphore(self.concurrency),
+                'next_start': 0.0
+            })
+        
+        with state['semaphore']:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, state['next_start'])
+                state['next_start'] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class URLCrawler:
+    """
+    Fetch many URLs concurrently on a thread pool
+    
+    Extraction is network-bound, so threads overlap the waiting; the
+    HostThrottle keeps any single site from being hammered. Results are
+    yielded as each URL finishes.
+    """
+    
+    def __init__(self):
+        self.throttle = HostThrottle(Config.URL_HOST_CONCURRENCY, Config.URL_HOST_DELAY)
+    
+    def _pool(self):
+        return get_thread_pool('url-fetch', Config.URL_FETCH_WORKERS)
+    
+    @staticmethod
+    def concurrency(max_concurrency=None):
+        """Per-request concurrency: requested value clamped to 1..URL_FETCH_WORKERS"""
+        try:
+            requested = int(max_concurrency or Config.URL_FETCH_WORKERS)
+        except (TypeError, ValueError):
+            requested = Config.URL_FETCH_WORKERS
+        return max(1, min(requested, Config.URL_FETCH_WORKERS))
+    
+    def _extract(self, url, include_markdown, alt_session=None):
+        """
+        Extract one URL, waiting for a politeness slot only if it needs the network
+        
+        With an alt_session (see services.alt_text_remediation), images
+        missing ALT text are described before the result is returned.
+        """
+        result = None
+        if Config.URL_CACHE_ENABLED:
+            entry = url_cache.lookup(url, include_markdown)
+            if entry and url_cache.is_fresh(entry):
+                result = url_cache.serve(entry, 'hit')
+        
+        if result is None:
+            with self.throttle.slot(url):
+                result = URLProcessor.extract_from_url(url, include_markdown=include_markdown)
+        
+        if alt_session is not None and result.get('success') and result.get('images'):
+            result['alt_text_remediation'] = alt_session.remediate(url, result['images'])
+        return result
+    
+    @staticmethod
+    def _failure(url, error):
+        return {'success': False, 'url': url, 'error': error}
+    
+    def iter_urls(self, urls, include_markdown=False, max_concurrency=None, alt_session=None):
+        """
+        Extract a list of URLs, yielding one 'url' event per URL as it finishes
+        
+        Duplicate URLs (after normalization) are fetched once and reported
+        once, under the index of their first occurrence.
+        """
+        unique = []
+        seen = set()
+        for index, url in enumerate(urls):
+            key = normalize_url(url)
+            if key not in seen:
+                seen.add(key)
+                unique.append((index, url))
+        
+        completed = iter_completed(
+            self._pool(),
+            self._extract,
+            [(url, include_markdown, alt_session) for _, url in unique],
+            self.concurrency(max_concurrency)
+        )
+        
+        for position, future in completed:
+            index, url = unique[position]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = self._failure(url, str(e))
+            yield {'event': 'url', 'index': index, **result, 'url': url}
+    
+    def crawl(self, seed_url, max_depth=1, max_pages=20, include_markdown=False, max_concurrency=None,
+              alt_session=None):
+        """
+        Breadth-first crawl of seed_url's site
+        
+        Follows links on the same site (www. ignored) up to max_depth hops
+        from the seed, fetching at most max_pages pages. Pages disallowed by
+        robots.txt and links to non-page files are skipped. Yields one 'url'
+        event per page (with its depth and the page it was found on) as it
+        finishes.
+        """
+        site = _site(seed_url)
+        limit = self.concurrency(max_concurrency)
+        pool = self._pool()
+        robots = {}
+        
+        frontier = deque([(seed_url, 0, None)])
+        seen = {normalize_url(seed_url)}
+        in_flight = {}  # future -> (url, depth, parent)
+        submitted = 0
+        
+        try:
+            while frontier or in_flight:
+                while frontier and len(in_flight) < limit and submitted < max_pages:
+                    url, depth, parent = frontier.popleft()
+                    if not self._allowed_by_robots(url, robots):
+                        continue
+                    in_flight[pool.submit(self._extract, url, include_markdown, alt_session)] = (url, depth, parent)
+                    submitted += 1
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth, parent = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = self._failure(url, str(e))
+                    
+                    if result.get('success') and depth < max_depth:
+                        for link in result.get('links', []):
+                            target = self._follow(url, link.get('href', ''), site)
+                            if target and normalize_url(target) not in seen:
+                                seen.add(normalize_url(target))
+                                frontier.append((target, depth + 1, url))
+                    
+                    yield {'event': 'url', **result, 'url': url, 'depth': depth, 'parent': parent}
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    @staticmethod
+    def _follow(page_url, href, site):
+        """Absolute URL for a link worth crawling, or None"""
+        if not href:
+            return None
+        target, _ = urldefrag(urljoin(page_url, href.strip()))
+        parts = urlsplit(target)
+        if parts.scheme not in ('http', 'https') or _site(target) != site:
+            return None
+        if os.path.splitext(parts.path)[1].lower() in SKIPPED_EXTENSIONS:
+            return None
+        return target
+    
+    def _allowed_by_robots(self, url, robots):
+        """Check robots.txt, fetched once per host per crawl (unreachable = allowed)"""
+        parts = urlsplit(url)
+        origin = f'{parts.scheme}://{parts.netloc}'
+        if origin not in robots:
+            parser = RobotFileParser()
+            try:
+                response = http_client.fetch(f'{origin}/robots.txt', max_bytes=512 * 1024)
+                if response.status_code == 200:
+                    parser.parse(response.text.splitlines())
+                else:
+                    parser.allow_all = True
+            except Exception:
+                parser.allow_all = True
+            robots[origin] = parser
+        return robots[origin].can_fetch(Config.HTTP_USER_AGENT, url)
+
+
+# Singleton instance
+url_crawler = URLCrawler()
@@ -3,20 +3,190 @@ URL Content Processing Service
 Extract content from web URLs
 """
 
-import requests
-from bs4 import BeautifulSoup
+import re
 import html2text
+import lxml.html
 from newspaper import Article
+from config import Config
+from services.http_client import http_client
+from services.url_cache import url_cache
+
+# Elements whose text is not page content
+NON_CONTENT_TAGS = {'script', 'style'}
+
+
+def _response_html(response):
+    """Decode a response the way newspaper's own downloader does"""
+    if response.encoding != 'ISO-8859-1':
+        return response.text
+    # No charset header; let the parser sniff the bytes
+    return response.content
+
+
+def _parse_html(html):
+    """Parse HTML (str or bytes) into an lxml document"""
+    if isinstance(html, str):
+        # lxml rejects str input that carries an XML encoding declaration
+        html = re.sub(r'^\s*<\?.*?\?>', '', html, flags=re.DOTALL)
+    return lxml.html.document_fromstring(html)
+
+
+def _walk(root):
+    """
+    Yield ('start', el) and ('end', el) for every node in document order
+    
+    Unlike etree.iterwalk this includes comments, whose tails hold page text.
+    """
+    yield 'start', root
+    stack = [(root, iter(root))]
+    while stack:
+        el, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            yield 'end', el
+        else:
+            yield 'start', child
+            stack.append((child, iter(child)))
+
+
+def _scan_page(root):
+    """
+    Collect title, images, links and text in one walk over the DOM
+    
+    Text is gathered the way BeautifulSoup's get_text('\\n', strip=True)
+    does, skipping script and style contents.
+    """
+    title = None
+    images = []
+    links = []
+    text_parts = []
+    open_links = []  # Text buffers of <a> elements being walked
+    skip_depth = 0
+    
+    def add_text(value):
+        value = value.strip() if value else ''
+        if value:
+            text_parts.append(value)
+            for buffer in open_links:
+                buffer.append(value)
+    
+    for action, el in _walk(root):
+        tag = el.tag if isinstance(el.tag, str) else None  # None for comments
+        
+        if action == 'start':
+            if tag == 'img':
+                src = el.get('src', '')
+                alt = el.get('alt', '')
+                if src:
+                    images.append({
+                        'src': src,
+                        'alt': alt,
+                        'has_alt': bool(alt)
+                    })
+            elif tag == 'a':
+                open_links.append([])
+            elif tag == 'title' and title is None:
+                title = el.text
+            
+            if tag in NON_CONTENT_TAGS:
+                skip_depth += 1
+            elif tag and not skip_depth:
+                add_text(el.text)
+        else:
+            if tag in NON_CONTENT_TAGS:
+                skip_depth -= 1
+            elif tag == 'a':
+                href = el.get('href', '')
+                link_text = ''.join(open_links.pop())
+                if href:
+                    links.append({
+                        'href': href,
+                        'text': link_text
+                    })
+            
+            if not skip_depth and el is not root:
+                add_text(el.tail)
+    
+    return {
+        'title': title,
+        'images': images,
+        'links': links,
+        'text': '\n'.join(text_parts)
+    }
+
+
+def _to_markdown(html):
+    """Convert raw HTML to markdown"""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.ignore_images = False
+    return h.handle(html)
+
 
 class URLProcessor:
     
     @staticmethod
-    def extract_from_url(url):
-        """Extract content from URL"""
+    def fetch(url, headers=None):
+        """Download a page once (pooled, size-capped); the response is shared by every parser"""
+        return http_client.fetch(url, headers=headers)
+    
+    @staticmethod
+    def extract_from_url(url, include_markdown=False, use_cache=True):
+        """
+        Extract content from URL
+        
+        Results are cached per normalized URL (see services.url_cache): a
+        fresh entry is returned without a request, and an expired one is
+        revalidated with a conditional GET, reusing it on 304. The result's
+        'cache' field is hit, revalidated, stale (fetch failed, old entry
+        served) or miss.
+        """
+        use_cache = use_cache and Config.URL_CACHE_ENABLED
+        entry = url_cache.lookup(url, include_markdown) if use_cache else None
+        if entry and url_cache.is_fresh(entry):
+            return url_cache.serve(entry, 'hit')
+        
+        try:
+            response = URLProcessor.fetch(url, url_cache.conditional_headers(entry) if entry else None)
+        except Exception as e:
+            if entry:
+                return url_cache.serve(entry, 'stale')
+            return {
+                'success': False,
+                'url': url,
+                'error': str(e)
+            }
+        
+        if entry and response.status_code == 304:
+            url_cache.renew(url, entry, response)
+            return url_cache.serve(entry, 'revalidated')
+        
+        result = URLProcessor._extract_response(url, response, include_markdown)
+        if use_cache:
+            url_cache.record('miss')
+            if result.get('success') and response.ok:
+                url_cache.store_result(url, result, response, include_markdown)
+        return {**result, 'cache': 'miss'} if use_cache else result
+    
+    @staticmethod
+    def _extract_response(url, response, include_markdown=False):
+        """
+        Extract content from a fetched page
+        
+        The page is parsed once: newspaper3k reads the downloaded HTML, and
+        images and links come from a single walk over its untouched DOM
+        copy. Markdown is only produced when requested.
+        """
         try:
+            if not response.ok:
+                raise ValueError(f"HTTP {response.status_code} fetching {url}")
+            
             # Try newspaper3k first (best for articles)
             article = Article(url)
-            article.download()
+            article.download(input_html=_response_html(response))
             article.parse()
             
             # Extract metadata
@@ -26,40 +196,13 @@ class URLProcessor:
             publish_date = article.publish_date
             top_image = article.top_image
             
-            # Get HTML for additional parsing
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # newspaper keeps a pristine copy of its parse; reuse it rather than parsing again
+            root = article.clean_doc if article.clean_doc is not None else _parse_html(article.html)
+            page = _scan_page(root)
+            images = page['images']
+            links = page['links']
             
-            # Extract images
-            images = []
-            for img in soup.find_all('img'):
-                src = img.get('src', '')
-                alt = img.get('alt', '')
-                if src:
-                    images.append({
-                        'src': src,
-                        'alt': alt,
-                        'has_alt': bool(alt)
-                    })
-            
-            # Extract links
-            links = []
-            for link in soup.find_all('a'):
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
-                if href:
-                    links.append({
-                        'href': href,
-                        'text': text
-                    })
-            
-            # Convert HTML to markdown
-            h = html2text.HTML2Text()
-            h.ignore_links = False
-            h.ignore_images = False
-            markdown_content = h.handle(response.text)
-            
-            return {
+            result = {
                 'success': True,
                 'url': url,
                 'title': title,
@@ -71,44 +214,38 @@ class URLProcessor:
                 'image_count': len(images),
                 'links': links[:50],  # Limit links
                 'link_count': len(links),
-                'markdown': markdown_content,
                 'word_count': len(text.split()),
                 'accessibility_issues': URLProcessor._check_url_accessibility(images, links)
             }
+            if include_markdown:
+                result['markdown'] = _to_markdown(article.html)
+            return result
         except Exception as e:
-            # Fallback to basic scraping
-            return URLProcessor._basic_url_extraction(url, str(e))
+            # Fallback to basic scraping of the same response
+            return URLProcessor._basic_url_extraction(url, str(e), response, include_markdown)
     
     @staticmethod
-    def _basic_url_extraction(url, error=None):
-        """Fallback URL extraction using BeautifulSoup"""
+    def _basic_url_extraction(url, error=None, response=None, include_markdown=False):
+        """Fallback URL extraction from the raw DOM"""
         try:
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title = soup.title.string if soup.title else 'Untitled'
+            if response is None:
+                response = URLProcessor.fetch(url)
             
-            # Extract main text
-            for script in soup(['script', 'style']):
-                script.decompose()
+            page = _scan_page(_parse_html(response.content))
+            text = page['text']
             
-            text = soup.get_text(separator='\n', strip=True)
-            
-            # Convert to markdown
-            h = html2text.HTML2Text()
-            markdown_content = h.handle(response.text)
-            
-            return {
+            result = {
                 'success': True,
                 'url': url,
-                'title': title,
+                'title': page['title'] or 'Untitled',
                 'text': text,
-                'markdown': markdown_content,
                 'word_count': len(text.split()),
                 'extraction_method': 'basic',
                 'error': error
             }
+            if include_markdown:
+                result['markdown'] = _to_markdown(response.text)
+            return result
         except Exception as e:
             return {
                 'success': False,
@@ -0,0 +1,168 @@
+"""
+Vocabulary Simplification Engine
+Single-pass replacement of complex words from a plain-language lexicon
+"""
+
+import os
+import re
+
+from config import Config
+
+# Used when the lexicon file is missing
+DEFAULT_LEXICON = {
+    'utilize': 'use',
+    'commence': 'start',
+    'terminate': 'end',
+    'demonstrate': 'show',
+    'facilitate': 'help',
+    'implement': 'do',
+    'nevertheless': 'but',
+    'furthermore': 'also',
+    'consequently': 'so',
+    'additionally': 'also',
+    'subsequently': 'then',
+    'approximately': 'about',
+    'manufacture': 'make',
+    'purchase': 'buy',
+    'comprehend': 'understand',
+    'attain': 'reach',
+    'obtain': 'get',
+    'assist': 'help'
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def load_lexicon(path):
+    """
+    Read a tab-separated lexicon of "complex<TAB>simple" lines
+    
+    Blank lines and lines starting with # are ignored. Keys are
+    lowercased with whitespace collapsed; later entries win.
+    """
+    lexicon = {}
+    with open(path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split('\t')
+            if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+                print(f"⚠️ Skipping malformed lexicon line {line_number} in {path}")
+                continue
+            lexicon[_normalize(parts[0])] = parts[1].strip()
+    return lexicon
+
+
+def _normalize(phrase):
+    return _WHITESPACE.sub(' ', phrase.strip().lower())
+
+
+def _trie_regex(words):
+    """
+    Compile words into one regex whose alternation follows a character trie
+    
+    Shared prefixes are matched once, so the engine only explores branches
+    that fit the text, and longer entries are preferred over their prefixes
+    ("obtained" over "obtain"). Spaces in phrases match any whitespace.
+    Matches must not touch other word characters on either side.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def pattern(node):
+        branches = []
+        single_chars = []
+        for char in sorted(key for key in node if key):
+            rest = pattern(node[char])
+            if char == ' ':
+                branches.append(r'\s+' + rest)
+            elif rest:
+                branches.append(re.escape(char) + rest)
+            else:
+                single_chars.append(re.escape(char))
+        
+        if len(single_chars) == 1:
+            branches.append(single_chars[0])
+        elif single_chars:
+            branches.append('[' + ''.join(single_chars) + ']')
+        
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # The word may end here; grouping keeps the ? on the whole branch
+            body = (body if len(branches) > 1 else f'(?:{body})') + '?'
+        return body
+    
+    # Lookarounds rather than \b so entries may start or end with punctuation
+    return re.compile(r'(?<!\w)' + pattern(trie) + r'(?!\w)', re.IGNORECASE)
+
+
+def match_case(source, replacement):
+    """Give replacement the casing of source (UPPER, Capitalized or lower)"""
+    if source.isupper() and len(source) > 1:
+        return replacement.upper()
+    if source[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+class VocabularyEngine:
+    """
+    Replace complex words and phrases in one scan of the text
+    
+    The whole lexicon is compiled into a single trie-shaped regex, so
+    throughput stays flat as the lexicon grows instead of adding one full
+    scan of the text per entry.
+    """
+    
+    def __init__(self, lexicon):
+        self.lexicon = {_normalize(key): value for key, value in lexicon.items()}
+        self._pattern = _trie_regex(self.lexicon) if self.lexicon else None
+    
+    @classmethod
+    def from_file(cls, path):
+        """Load a lexicon file, falling back to the built-in word list"""
+        if path and os.path.exists(path):
+            try:
+                return cls(load_lexicon(path))
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️ Could not load simplification lexicon {path}: {e}")
+        else:
+            print(f"Warning: Simplification lexicon not found at {path}. Using built-in word list.")
+        return cls(DEFAULT_LEXICON)
+    
+    def _replace(self, match):
+        source = match.group(0)
+        replacement = self.lexicon.get(source.lower())
+        if replacement is None:
+            # Phrase matched across newlines or repeated spaces
+            replacement = self.lexicon[_normalize(source)]
+        return match_case(source, replacement)
+    
+    def simplify(self, text):
+        """Return text with every lexicon entry replaced"""
+        if self._pattern is None or not text:
+            return text
+        return self._pattern.sub(self._replace, text)
+    
+    def find(self, text):
+        """List (start, end, original, replacement) for every match, without replacing"""
+        if self._pattern is None or not text:
+            return []
+        return [
+            (m.start(), m.end(), m.group(0), self._replace(m))
+            for m in self._pattern.finditer(text)
+        ]
+    
+    def __len__(self):
+        return len(self.lexicon)
+
+
+# Singleton instance, compiled once at startup
+vocabulary_engine = VocabularyEngine.from_file(Config.SIMPLIFICATION_LEXICON_PATH)
@@ -0,0 +1,107 @@
+"""
+Worker Pool Service
+Shared, lazily created process and thread pools
+"""
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import Config
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_process_pool(name, max_workers, initializer=None, initargs=()):
+    """
+    Get (or create) a named process pool
+    
+    Pools are long-lived and shared by every request in this process, so
+    worker start-up cost is paid once rather than per call.
+    """
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None or getattr(pool, '_broken', False):
+            context = multiprocessing.get_context(Config.WORKER_START_METHOD)
+            pool = ProcessPoolExecutor(
+                max_workers=max(1, max_workers),
+                mp_context=context,
+                initializer=initializer,
+                initargs=initargs
+            )
+            _pools[name] = pool
+        return pool
+
+
+def get_thread_pool(name, max_workers):
+    """Get (or create) a named thread pool"""
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = ThreadPoolExecutor(
+                max_workers=max(1, max_workers),
+                thread_name_prefix=name
+            )
+            _pools[name] = pool
+        return pool
+
+
+def iter_completed(pool, fn, arg_tuples, limit):
+    """
+    Run fn(*args) on a pool for each args tuple, at most limit at a time
+    
+    Yields (index, future) in completion order. Later tasks are only
+    submitted as earlier ones finish, so one caller cannot flood a shared
+    pool; closing the generator early cancels anything not yet started.
+    """
+    tasks = enumerate(arg_tuples)
+    in_flight = {}
+    
+    def submit_next():
+        for index, args in tasks:
+            in_flight[pool.submit(fn, *args)] = index
+            return True
+        return False
+    
+    try:
+        while len(in_flight) < max(1, limit) and submit_next():
+            pass
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                submit_next()
+                yield index, future
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def discard_pool(name, pool=None):
+    """
+    Shut down a pool so the next get_* call builds a fresh one
+    
+    Given pool, only discards it if it is still the one registered under
+    name, so a caller holding a broken pool can't discard its replacement.
+    """
+    with _lock:
+        if pool is not None and _pools.get(name) is not pool:
+            return
+        pool = _pools.pop(name, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools():
+    """Shut down every pool (registered to run at interpreter exit)"""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
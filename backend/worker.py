@@ -0,0 +1,100 @@
+"""
+Accessibility Learning Hub - Job Worker
+Runs queued background jobs from the database (no external broker needed)
+
+Usage:
+    python worker.py [--workers 2]
+"""
+
+import argparse
+import multiprocessing
+import signal
+import time
+
+from config import Config
+
+
+def run_worker(index, stop_event):
+    """Worker process: poll the jobs table and run whatever it claims"""
+    # The supervisor handles Ctrl+C and tells workers to stop after their current job
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    
+    # Each worker runs one job at a time; OCR in-process rather than
+    # starting an OCR pool per worker (JOB_WORKERS x OCR_WORKERS engines)
+    Config.OCR_WORKERS = 0
+    
+    from app import create_app
+    from models import db
+    from services.job_queue import job_queue
+    import services.job_handlers  # noqa: F401 - registers the handlers
+    
+    app = create_app()
+    worker_id = job_queue.make_worker_id(index)
+    last_recovery = None
+    
+    with app.app_context():
+        print(f"👷 Worker {worker_id} started")
+        while not stop_event.is_set():
+            try:
+                # Crash recovery: requeue jobs whose worker stopped heartbeating
+                now = time.monotonic()
+                if last_recovery is None or now - last_recovery > Config.JOB_LEASE_SECONDS / 2:
+                    recovered = job_queue.recover_stale_jobs()
+                    if recovered:
+                        print(f"♻️  Recovered {recovered} stale job(s)")
+                    last_recovery = now
+                
+                job = job_queue.claim_next(worker_id)
+                if job is None:
+                    stop_event.wait(Config.JOB_POLL_INTERVAL)
+                    continue
+                
+                print(f"▶️  {worker_id} running {job.job_type} {job.id} (attempt {job.attempts})")
+                job_queue.run(job, worker_id)
+                print(f"⏹  {job.id} -> {job.status}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"⚠️ Worker {worker_id} error: {e}")
+                stop_event.wait(Config.JOB_POLL_INTERVAL)
+            finally:
+                db.session.remove()
+        print(f"👋 Worker {worker_id} stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run background job workers')
+    parser.add_argument('--workers', type=int, default=Config.JOB_WORKERS)
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context(Config.WORKER_START_METHOD)
+    stop_event = context.Event()
+    
+    def start(index):
+        process = context.Process(target=run_worker, args=(index, stop_event), name=f'job-worker-{index}')
+        process.start()
+        return process
+    
+    def request_stop(signum, frame):
+        print("🛑 Stopping workers after their current jobs...")
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    workers = [start(index) for index in range(max(1, args.workers))]
+    
+    # Supervise: replace workers that die; their jobs are recovered via lease expiry
+    while not stop_event.is_set():
+        for index, process in enumerate(workers):
+            if not process.is_alive() and not stop_event.is_set():
+                print(f"⚠️ Worker {index} exited with code {process.exitcode}, restarting")
+                workers[index] = start(index)
+        stop_event.wait(2.0)
+    
+    for process in workers:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()